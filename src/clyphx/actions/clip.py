@@ -29,8 +29,12 @@
 from ..core.live import Clip, Conversions
 from .clip_env_capture import XClipEnvCapture
 from .clip_notes import NotesMixin
+from ..core.notes import ClipNotesCache
+from ..core.envelopes import (RESOLUTION, parse_shape, generate, compact, insert_steps,
+                              get_envelope, sample, transform)
+from ..core.groove import GRIDS
 from ..consts import (CLIP_GRID_STATES, R_QNTZ_STATES,
-                      WARP_MODES, ENV_TYPES,
+                      WARP_MODES,
                       KEYWORDS, ONOFF, switch)
 
 log = logging.getLogger(__name__)
@@ -45,6 +49,11 @@ def __init__(self, parent):
         # type: (Any) -> None
         super().__init__(parent)
         self._env_capture = XClipEnvCapture()
+        self._notes_cache = ClipNotesCache(parent.subscriptions)
+
+    def disconnect(self):
+        self._notes_cache.clear()
+        super().disconnect()
 
     def dispatch_actions(self, cmd):
         # type: (_DispatchCommand) -> None
@@ -62,8 +71,7 @@ def dispatch_actions(self, cmd):
                         func(self, action[0], scmd.track, scmd.xclip,
                              clip_args.replace(clip_args.split()[0], ''))
                     elif clip_args and clip_args.split()[0].startswith('NOTES'):
-                        # args = [a.strip() for a in cmd.args.split() if a.strip()]
-                        self.dispatch_clip_note_action(action[0], scmd.args)
+                        self.dispatch_clip_note_action(action[0], clip_args.split())
                     elif cmd.action_name.startswith('CLIP'):
                         self.set_clip_on_off(action[0], scmd.track, scmd.xclip, scmd.args)
 
@@ -100,13 +108,11 @@ def get_clip_to_operate_on(self, scmd):
                 clip = scmd.track.clip_slots[slot_idx].clip
         return clip, args
 
-    @staticmethod
-    def get_clip_by_name(track, name):
+    def get_clip_by_name(self, track, name):
         # TODO: remove uppers
-        name = name.upper()
-        for slot in track.clip_slots:
-            if slot.has_clip and slot.clip.name.upper() == name:
-                return slot.clip
+        index = self._parent.get_clip_index(track).slot_by_name(name.upper())
+        if index != -1:
+            return track.clip_slots[index].clip
 
     @staticmethod
     def _parse_split_name(action_name, args):
@@ -192,18 +198,11 @@ def do_note_pitch_adjustment(self, clip, factor):
         '''Adjust note pitch. This isn't a note action, it's called via
         Clip Semi.
         '''
-        edited_notes = []
-        note_data = self.get_notes_to_operate_on(clip)
-        if note_data['notes_to_edit']:
-            for n in note_data['notes_to_edit']:
-                new_pitch = n[0] + factor
-                if 0 <= new_pitch < 128:
-                    edited_notes.append((new_pitch, n[1], n[2], n[3], n[4]))
-                else:
-                    edited_notes = []
-                    return
-            if edited_notes:
-                self.write_all_notes(clip, edited_notes, note_data['other_notes'])
+        pos_range = (clip.loop_start, clip.loop_end)
+        notes = self.read_notes(clip, pos_range=pos_range)
+        indices = notes.select(pos_range=pos_range)
+        if len(indices) and notes.transpose(indices, factor):
+            self.write_notes(clip, notes)
 
     def adjust_gain(self, clip, track, xclip, args):
         # type: (Clip, None, None, Text) -> None
@@ -367,9 +366,9 @@ def insert_envelope(self, clip, track, xclip, args):
             env_type_index = last_arg_index
             env_type = None
             for i in range(len(arg_array)):
-                if arg_array[i] in ENV_TYPES:
+                env_type = parse_shape(arg_array[i])
+                if env_type:
                     env_type_index = i
-                    env_type = arg_array[i]
                     break
             if env_type:
                 env_param_spec = ''
@@ -378,8 +377,10 @@ def insert_envelope(self, clip, track, xclip, args):
                 param = self._get_envelope_parameter(track, env_param_spec)
                 if param and not param.is_quantized:
                     env_range = (param.min, param.max)
-                    # calculate range if specified in args
+                    resolution = RESOLUTION
+                    # calculate resolution and range if specified in args
                     if env_type_index != last_arg_index:
+                        resolution = GRIDS.get(arg_array[env_type_index + 1], resolution)
                         try:
                             min_factor = int(arg_array[-2])
                             max_factor = int(arg_array[-1])
@@ -392,44 +393,99 @@ def insert_envelope(self, clip, track, xclip, args):
                     clip.view.show_envelope()
                     clip.view.select_envelope_parameter(param)
                     clip.clear_envelope(param)
-                    self._perform_envelope_insertion(clip, param, env_type, env_range)
+                    self._perform_envelope_insertion(clip, param, env_type, env_range,
+                                                     resolution)
 
-    def _perform_envelope_insertion(self, clip, param, env_type, env_range):
-        # type: (Clip, DeviceParameter, Text, Tuple[Any, Any]) -> None
+    def _perform_envelope_insertion(self, clip, param, env_type, env_range,
+                                    resolution=RESOLUTION):
+        # type: (Clip, DeviceParameter, Tuple[Text, Optional[int]], Tuple[Any, Any], float) -> None
         '''Performs the actual insertion of the envelope into the clip.'''
+        env = get_envelope(clip, param)
+        if env:
+            shape, arg = env_type
+            steps = generate(shape, clip.loop_start, clip.loop_end, env_range,
+                             resolution, arg)
+            insert_steps(env, *compact(*steps))
+
+    def copy_envelope(self, clip, track, xclip, args):
+        # type: (Clip, Track, None, Text) -> None
+        '''Copies the envelope of a parameter onto another parameter
+        and/or clip, sampled at the given grid (1/16 by default) and
+        optionally inverted (INV), reversed (REV), scaled (SCALEx) or
+        time-stretched (STRETCHx), being x a percentage. E.g.:
+
+            ENVCOPY DEV1 P1 > "Bass" PAN INV SCALE50 1/32
+
+        Without a target, the envelope is transformed in place.
+        '''
+        source, _, target = args.strip().partition('>')
+        words = (target or source).split()
+        options = dict()  # type: Dict[Text, Any]
+        resolution = RESOLUTION
+        try:
+            while words:
+                word = words[-1]
+                if word == 'INV':
+                    options['invert'] = True
+                elif word == 'REV':
+                    options['reverse'] = True
+                elif word.startswith('SCALE'):
+                    options['scale'] = float(word[5:]) / 100.0
+                elif word.startswith('STRETCH'):
+                    options['stretch'] = float(word[7:]) / 100.0
+                elif word in GRIDS:
+                    resolution = GRIDS[word]
+                else:
+                    break
+                words.pop()
+        except ValueError as e:
+            log.error("Failed to parse envelope options '%s': %r", args, e)
+            return
+        if target:
+            target = ' '.join(words)
+        else:
+            source = ' '.join(words)
+
+        target_clip, target_track = clip, track
+        if target.startswith('"') and '"' in target[1:]:
+            name, _, target = target[1:].partition('"')
+            target_clip = self.get_clip_in_song(name)
+            if target_clip is None:
+                log.error("Clip '%s' not found", name)
+                return
+            target_track = target_clip.canonical_parent.canonical_parent
+        param = self._get_envelope_parameter(track, source.strip())
+        target_param = self._get_envelope_parameter(target_track,
+                                                    target.strip() or source.strip())
+        if not (param and target_param):
+            return
+
+        # sampled on each copy, as Live doesn't notify envelope edits
         env = clip.automation_envelope(param)
+        if env is None:
+            return
+        times, values = sample(env, clip.loop_start, clip.loop_end, resolution)
+        times, values = transform(times, values,
+                                  target_clip.loop_start, target_clip.loop_end,
+                                  (target_param.min, target_param.max),
+                                  (param.min, param.max), **options)
+        target_clip.clear_envelope(target_param)
+        env = get_envelope(target_clip, target_param)
         if env:
-            median = ((clip.loop_end - clip.loop_start) / 2.0) + clip.loop_start
-            num_beats = int(clip.loop_end - clip.loop_start) + 1
-            start_beat = int(clip.loop_start)
-            if env_type == 'IRAMP':
-                env.insert_step(clip.loop_start, 0.0, env_range[0])
-                env.insert_step(clip.loop_end, 0.0, env_range[1])
-            elif env_type == 'DRAMP':
-                env.insert_step(clip.loop_start, 0.0, env_range[1])
-                env.insert_step(clip.loop_end, 0.0, env_range[0])
-            elif env_type == 'IPYR':
-                env.insert_step(clip.loop_start, 0.0, env_range[0])
-                env.insert_step(median, 0.0, env_range[1])
-                env.insert_step(clip.loop_end, 0.0, env_range[0])
-            elif env_type == 'DPYR':
-                env.insert_step(clip.loop_start, 0.0, env_range[1])
-                env.insert_step(median, 0.0, env_range[0])
-                env.insert_step(clip.loop_end, 0.0, env_range[1])
-            elif env_type == 'SAW':
-                for b in range(num_beats):
-                    beat = float(b + start_beat)
-                    env.insert_step(beat, 0.0, env_range[1])
-                    if beat < clip.loop_end:
-                        env.insert_step(beat + 0.5, 0.0, env_range[0])
-            elif env_type == 'SQR':
-                for b in range(num_beats):
-                    beat = float(b + start_beat)
-                    if beat < clip.loop_end:
-                        if b % 2 == 0:
-                            env.insert_step(beat, 1.0, env_range[1])
-                        else:
-                            env.insert_step(beat, 1.0, env_range[0])
+            insert_steps(env, *compact(times, [0.0] * len(times), values))
+
+    def get_clip_in_song(self, name, midi=False):
+        # type: (Text, bool) -> Optional[Clip]
+        '''Returns the first clip with the (upper-cased) name, in tracks
+        with MIDI input only if `midi`.
+        '''
+        for track in self.song().tracks:
+            if midi and not track.has_midi_input:
+                continue
+            index = self._parent.get_clip_index(track).slot_by_name(name)
+            if index != -1:
+                return track.clip_slots[index].clip
+        return None
 
     def clear_envelope(self, clip, track, xclip, args):
         # type: (Clip, None, None, Text) -> None
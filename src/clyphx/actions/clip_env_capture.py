@@ -15,13 +15,15 @@
 # along with ClyphX.  If not, see <https://www.gnu.org/licenses/>.
 
 from __future__ import absolute_import, unicode_literals
-from builtins import super, range
+from builtins import super, list
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from typing import Any, Optional, Text, Tuple
-    from ..core.live import Clip, Device, DeviceParameter, RackDevice, Track
+    from ..core.live import Clip, DeviceParameter, Track
 
+from itertools import chain
+from ..core.devices import walk_devices
 from ..core.xcomponent import ControlSurfaceComponent
 
 
@@ -58,30 +60,9 @@ def _capture_device_settings(self, clip, track, args):
         if dev_range:
             start, end = dev_range[0:2]
             end = min(end, len(track.devices))
-            for i in range(start, end):
-                current_device = track.devices[i]  # type: RackDevice
-                for p in current_device.parameters:
+            for node in walk_devices(list(track.devices)[start:end]):
+                for p in chain(node.mixer, node.parameters):
                     self._insert_envelope(clip, p)
-                if current_device.can_have_chains:
-                    self._capture_nested_devices(clip, current_device)
-
-    def _capture_nested_devices(self, clip, rack):
-        # type: (Clip, RackDevice) -> None
-        if rack.chains:
-            for chain in rack.chains:
-                for device in chain.devices:
-                    for p in device.parameters:
-                        self._insert_envelope(clip, p)
-                    if not rack.class_name.startswith('Midi'):
-                        self._insert_envelope(clip, chain.mixer_device.volume)
-                        self._insert_envelope(clip, chain.mixer_device.panning)
-                        self._insert_envelope(clip, chain.mixer_device.chain_activator)
-                        sends = chain.mixer_device.sends
-                        if sends:
-                            for s in sends:
-                                self._insert_envelope(clip, s)
-                    if device.can_have_chains and device.chains:
-                        self._capture_nested_devices(clip, device)
 
     @staticmethod
     def _insert_envelope(clip, param):
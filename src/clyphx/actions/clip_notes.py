@@ -15,26 +15,70 @@
 # along with ClyphX.  If not, see <https://www.gnu.org/licenses/>.
 
 from __future__ import absolute_import, unicode_literals
-from builtins import object, dict, range, tuple
-from typing import NamedTuple, List, Text, Tuple
+from builtins import object, dict
+from typing import TYPE_CHECKING, NamedTuple, Any, List, Text, Tuple, Sequence
 import logging
-import random
 
-from ..core.live import Clip, get_random_int
-from ..core.models import Pitch, pitch_range #, Note
+if TYPE_CHECKING:
+    from typing import Dict, Optional
+    from ..core.legacy import _DispatchCommand
+
+from ..consts import LIVE_VERSION
+from ..core.live import Clip
+from ..core.models import Pitch, pitch_range
+from ..core.groove import GRIDS, swing_groove, extract_groove
+from ..core.notes import (NoteBuffer, ClipNotesCache, SelectionNotesIO,
+                          ExtendedNotesIO, MIN_LENGTH)
 
 log = logging.getLogger(__name__)
 
-Note = Tuple[int, float, float, int, bool]
+#: Parsed note ranges by the text after NOTES, as [first, last).
+_note_ranges = dict()  # type: Dict[Text, Tuple[int, int]]
+
+#: Notes reader and writer for the running Live version.
+NOTES_IO = ExtendedNotesIO if LIVE_VERSION >= (11, 0, 0) else SelectionNotesIO
 
 
-CmdData = NamedTuple('CmdData', [('clip',          Clip),
-                                 ('notes_to_edit', List[Note]),
-                                 ('other_notes',   List[Note]),
-                                 ('args',          List[Text])])
+CmdData = NamedTuple('CmdData', [('clip',    Clip),
+                                 ('notes',   NoteBuffer),
+                                 ('indices', Sequence[int]),
+                                 ('args',    List[Text])])
 
 
 class NotesMixin(object):
+    #: Notes read during a batch by clip, and whether they were edited.
+    _notes_batch = None  # type: Optional[Dict[Clip, List[Any]]]
+
+    _notes_cache = None  # type: Optional[ClipNotesCache]
+
+    @staticmethod
+    def is_notes_command(cmd):
+        # type: (_DispatchCommand) -> bool
+        '''Whether the command is a note action (NOTES or SEMI of MIDI
+        clips).
+        '''
+        if not cmd.action_name.startswith('CLIP'):
+            return False
+        args = cmd.args.split(None, 1)
+        return bool(args) and (args[0].startswith('NOTES') or args[0] == 'SEMI')
+
+    def begin_notes_batch(self):
+        # type: () -> None
+        '''Starts batching note actions: each clip notes are read once
+        and only written on `end_notes_batch`. Does nothing if a batch
+        is already in progress.
+        '''
+        if self._notes_batch is None:
+            self._notes_batch = dict()
+
+    def end_notes_batch(self):
+        # type: () -> None
+        '''Writes the notes edited during the batch.'''
+        batch, self._notes_batch = self._notes_batch, None
+        if batch:
+            for clip, (notes, edited) in batch.items():
+                if edited:
+                    self.write_notes(clip, notes)
 
     def dispatch_clip_note_action(self, clip, args):
         # type: (Clip, List[Text]) -> None
@@ -45,7 +89,7 @@ def dispatch_clip_note_action(self, clip, args):
             return
 
         data = self.get_notes_to_edit(clip, args)
-        if data.notes_to_edit:
+        if len(data.indices):
             # TODO: pop arg
             action = data.args[0] if data.args else None
             try:
@@ -53,15 +97,43 @@ def dispatch_clip_note_action(self, clip, args):
             except KeyError:
                 log.error("Note action not found in %s", data.args)
             else:
-                edited = func(self, data)
-                if edited:
-                    self.write_notes(data, edited)
+                if func(self, data):
+                    self.write_notes(clip, data.notes)
+
+    def read_notes(self, clip, note_range=(0, 128), pos_range=None):
+        # type: (Clip, Tuple[int, int], Optional[Tuple[float, float]]) -> NoteBuffer
+        '''Returns the notes of the clip within the pitch and position
+        (the loop by default) ranges, and maybe others.
+
+        Notes read before are reused while the clip notes don't change
+        and they include the ranges. During a batch, the notes already
+        read are returned if they include the ranges and no edit moved
+        any of them out of the region read, as the notes they may meet
+        there weren't read. Otherwise, they're written if edited and
+        read again.
+        '''
+        pos_range = pos_range or (clip.loop_start, clip.loop_end)
+        batch = self._notes_batch
+        if batch is not None and clip in batch:
+            notes, edited = batch.pop(clip)
+            if notes.covers(note_range, pos_range) and (not edited or notes.in_region()):
+                batch[clip] = [notes, edited]
+                return notes
+            if edited:
+                NOTES_IO.write(clip, notes)
+        cache = self._notes_cache
+        notes = cache.get(clip, note_range, pos_range) if cache is not None else None
+        if notes is None:
+            notes = NOTES_IO.read(clip, note_range, pos_range)
+            if cache is not None:
+                cache.add(clip, notes)
+        if batch is not None:
+            batch[clip] = [notes, False]
+        return notes
 
     def get_notes_to_edit(self, clip, args):
         # type: (Clip, List[Text]) -> CmdData
         '''Get notes within loop braces to operate on.'''
-        notes_to_edit = []
-        other_notes = []
         note_range = (0, 128)
         pos_range = None
 
@@ -73,21 +145,21 @@ def get_notes_to_edit(self, clip, args):
                 args.pop(0)
         pos_range = pos_range or (clip.loop_start, clip.loop_end)
 
-        clip.select_all_notes()
-        all_notes = clip.get_selected_notes()
-        clip.deselect_all_notes()
-
-        for n in all_notes:
-            if note_range[0] <= n[0] < note_range[1] and pos_range[0] <= n[1] < pos_range[1]:
-                notes_to_edit.append(n)
-            else:
-                other_notes.append(n)
-        return CmdData(clip, notes_to_edit, other_notes, args)
+        start, end = pos_range
+        if start == end:
+            # notes sounding at the position, starting up to it
+            notes = self.read_notes(clip, note_range,
+                                    (min(clip.loop_start, 0.0), start + MIN_LENGTH))
+            return CmdData(clip, notes, notes.sounding(start, note_range), args)
+        notes = self.read_notes(clip, note_range, pos_range)
+        return CmdData(clip, notes, notes.select(note_range, pos_range), args)
 
     @staticmethod
     def get_pos_range(clip, string):
         # type: (Clip, Text) -> Tuple[float, float]
-        '''Get note position or range to operate on.'''
+        '''Get note position or range to operate on. A single position
+        (as `(x, x)`) selects the notes sounding at it.
+        '''
         pos_range = None
         user_range = string.split('-')
         try:
@@ -107,217 +179,208 @@ def get_pos_range(clip, string):
     def get_note_range(self, string):
         # type: (Text) -> Tuple[int, int]
         '''Get note lane or range to operate on.'''
-        # TODO: check limit range in 128
-        note_range = (0, 128)
         string = string.replace('NOTES', '')
-        if len(string) > 1:
+        try:
+            return _note_ranges[string]
+        except KeyError:
+            pass
+        note_range = (0, 128)
+        if string:
             try:
-                note_range = pitch_range(string)
-            except Exception:
+                first, last = pitch_range(string)
+            except ValueError:
                 try:
-                    start_note = Pitch.first_note(string)
-                    note_range = (start_note, start_note + 1)
-                    string = string.replace(str(start_note), '').strip()
-
-                    end_note = Pitch.first_note(string[1:])
-                    if end_note > start_note_num:
-                        note_range = (start_note_num, end_note + 1)
+                    first = last = Pitch.first_note(string)
                 except ValueError:
-                    pass
+                    first = last = None
+            if first is not None:
+                note_range = (int(first), int(max(first, last)) + 1)
+        _note_ranges[string] = note_range
         return note_range
 
-    @staticmethod
-    def write_notes(data, edited):
-        # type: (CmdData, List[Note]) -> None
-        edited.extend(data.other_notes)
-        data.clip.select_all_notes()
-        data.clip.replace_selected_notes(tuple(edited))
-        data.clip.deselect_all_notes()
+    def write_notes(self, clip, notes):
+        # type: (Clip, NoteBuffer) -> None
+        '''Writes the notes read from the clip, or defers it to the end
+        of the batch if any.
+        '''
+        if self._notes_cache is not None:
+            self._notes_cache.discard(clip)
+        if self._notes_batch is not None:
+            self._notes_batch[clip] = [notes, True]
+        else:
+            NOTES_IO.write(clip, notes)
 
 
 # region NOTE ACTIONS
     def set_notes_on_off(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Toggles or turns note mute on/off.'''
-        if not data.args:
-            edited = [(n[0], n[1], n[2], n[3], not n[4]) for n in data.notes_to_edit]
-        else:
-            mute = data.args[0] == 'ON'
-            edited = [(n[0], n[1], n[2], n[3], mute) for n in data.notes_to_edit]
-        return edited
+        mute = data.args[0] == 'ON' if data.args else None
+        data.notes.set_mute(data.indices, mute)
+        return True
 
     def do_note_gate_adjustment(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Adjust note gate.'''
-        edited = []
         factor = self.get_adjustment_factor(data.args[1], True)
-        loop_end = data.clip.loop_end
-        for n in data.notes_to_edit:
-            new_gate = n[2] + (factor * 0.03125)
-            if n[1] + new_gate > loop_end or new_gate < 0.03125:
-                edited = []
-                return
-            else:
-                edited.append((n[0], n[1], new_gate, n[3], n[4]))
-        return edited
+        return data.notes.gate(data.indices, factor * MIN_LENGTH, data.clip.loop_end)
 
     def do_note_nudge_adjustment(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Adjust note position.'''
-        edited = []
         factor = self.get_adjustment_factor(data.args[1], True)
-        for n in data.notes_to_edit:
-            new_pos = n[1] + (factor * 0.03125)
-            if n[2] + new_pos > data.clip.loop_end or new_pos < 0.0:
-                edited = []
-                return
-            else:
-                edited.append((n[0], new_pos, n[2], n[3], n[4]))
-        return edited
+        return data.notes.nudge(data.indices, factor * MIN_LENGTH, data.clip.loop_end)
 
     def do_pitch_scramble(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Scrambles the pitches in the clip, but maintains rhythm.'''
-        pitches = [n[0] for n in data.notes_to_edit]
-        random.shuffle(pitches)
-        notes = [tuple(n[1:5]) for n in data.notes_to_edit]
-        return [(pitches[i],) + n for i, n in enumerate(notes)]
+        data.notes.shuffle(data.indices, 'pitch')
+        return True
 
     def do_position_scramble(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Scrambles the position of notes in the clip, but maintains
         pitches.
         '''
-        positions = [n[1] for n in data.notes_to_edit]
-        random.shuffle(positions)
-        return [(n[0], positions[i], n[2], n[3], n[4])
-                for i, n in enumerate(data.notes_to_edit)]
+        data.notes.shuffle(data.indices, 'start')
+        return True
 
     def do_note_reverse(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Reverse the position of notes.'''
-        end, start = data.clip.loop_end, data.clip.loop_start
-        reverse = lambda n: abs(end - (n[1] + n[2]) + start)
-        return [(n[0], reverse(n), n[2], n[3], n[4]) for n in data.notes_to_edit]
+        data.notes.reverse(data.indices, data.clip.loop_start, data.clip.loop_end)
+        return True
+
+    def do_note_semi_adjustment(self, data):
+        # type: (CmdData) -> bool
+        '''Transposes or adjusts the pitch of notes.'''
+        arg = data.args[1]
+        if arg.startswith(('<', '>')):
+            factor = self.get_adjustment_factor(arg)
+        else:
+            factor = int(arg)
+        return data.notes.transpose(data.indices, factor)
 
     def do_note_invert(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         ''' Inverts the pitch of notes.'''
-        return [(127 - n[0], n[1], n[2], n[3], n[4]) for n in data.notes_to_edit]
+        data.notes.invert(data.indices)
+        return True
 
     def do_note_compress(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Compresses the position and duration of notes by half.'''
-        return [(n[0], n[1] / 2, n[2] / 2, n[3], n[4]) for n in data.notes_to_edit]
+        data.notes.scale(data.indices, 0.5)
+        return True
 
     def do_note_expand(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Expands the position and duration of notes by 2.'''
-        return [(n[0], n[1] * 2, n[2] * 2, n[3], n[4]) for n in data.notes_to_edit]
+        data.notes.scale(data.indices, 2)
+        return True
 
     def do_note_split(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Split notes into 2 equal parts.
         '''
-        edited = []
-
-        for n in data.notes_to_edit:
-            if n[2] / 2 < 0.03125:
-                return
-            else:
-                edited.append(n)
-                edited.append((n[0], n[1] + (n[2] / 2), n[2] / 2, n[3], n[4]))
-
-        return edited
+        return data.notes.split(data.indices)
 
     def do_note_combine(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Combine each consecutive set of 2 notes.
         '''
-        edited = []
-        current_note = []
-        check_next_instance = False
-
-        for n in data.notes_to_edit:
-            edited.append(n)
-            if current_note and check_next_instance:
-                if current_note[0] == n[0] and current_note[1] + current_note[2] == n[1]:
-                    edited[edited.index(current_note)] = [
-                        current_note[0],
-                        current_note[1],
-                        current_note[2] + n[2],
-                        current_note[3],
-                        current_note[4],
-                    ]
-                    edited.remove(n)
-                    current_note = []
-                    check_next_instance = False
-                else:
-                    current_note = n
+        data.notes.combine(data.indices)
+        return True
+
+    def do_note_legato(self, data):
+        # type: (CmdData) -> bool
+        '''Extends notes up to the next note start (or loop end).'''
+        data.notes.legato(data.indices, data.clip.loop_end)
+        return True
+
+    def do_note_dedupe(self, data):
+        # type: (CmdData) -> bool
+        '''Deletes duplicated notes (same pitch and position).'''
+        data.notes.dedupe(data.indices)
+        return True
+
+    def do_note_quantize(self, data):
+        # type: (CmdData) -> bool
+        '''Quantizes notes to a grid, at the (optional) given strength
+        and with the (optional) percentage of swing.
+        '''
+        args = data.args[1:]  # data.args[0] == 'QNTZ'
+        grid = GRIDS[args[0]]
+        strength = float(args[1]) / 100.0 if len(args) > 1 else 1.0
+        swing = float(args[2]) / 100.0 if len(args) > 2 else 0.0
+        data.notes.quantize(data.indices, swing_groove(grid, swing), strength)
+        return True
+
+    def do_note_groove(self, data):
+        # type: (CmdData) -> bool
+        '''Quantizes notes to the groove of another MIDI clip, found by
+        name, with an (optional) grid (1/16 by default) and strength (as
+        a percentage prefixed by S), e.g. `GRV BEAT 2 1/8 S50`.
+        '''
+        args = data.args[1:]  # data.args[0] == 'GRV'
+        strength = 1.0
+        grid = GRIDS['1/16']
+        while len(args) > 1:
+            if args[-1] in GRIDS:
+                grid = GRIDS[args.pop()]
+            elif args[-1].startswith('S') and args[-1][1:].replace('.', '', 1).isdigit():
+                strength = float(args.pop()[1:]) / 100.0
             else:
-                current_note = n
-                check_next_instance = True
-
-        return edited
+                break
+        source = self.get_clip_in_song(' '.join(args), midi=True)
+        if source is None:
+            log.error("Groove clip '%s' not found", ' '.join(args))
+            return False
+        notes = self.read_notes(source)
+        groove = extract_groove(notes, notes.select(), grid)
+        data.notes.quantize(data.indices, groove, strength)
+        return True
+
+    def do_note_humanize(self, data):
+        # type: (CmdData) -> bool
+        '''Randomizes note timing (as a percentage of a 1/16) and
+        velocity, by the (optional) given amounts and seed.
+        '''
+        args = data.args[1:]  # data.args[0] == 'HUM'
+        timing = float(args[0]) / 100.0 * GRIDS['1/16'] if args else 0.025
+        velocity = float(args[1]) if len(args) > 1 else 10.0
+        seed = int(args[2]) if len(args) > 2 else None
+        data.notes.humanize(data.indices, timing, velocity, seed)
+        return True
 
     def do_note_velo_adjustment(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Adjust/set/randomize note velocity.'''
-        edited = []
         arg = data.args[1]  # data.args[0] == 'VELO'
 
         if arg == 'RND':
-            for n in data.notes_to_edit:
-                # FIXME: get_random_int
-                edited.append((n[0], n[1], n[2], get_random_int(64, 64), n[4]))
-
-        elif arg.starswith(('<', '>')):
-            for n in data.notes_to_edit:
-                factor = self.get_adjustment_factor(arg)
-                new_velo = n[3] + factor
-                if 0 <= new_velo < 128:
-                    edited.append((n[0], n[1], n[2], new_velo, n[4]))
-                else:
-                    edited = []
-                    return
-
+            data.notes.randomize_velocity(data.indices, 64, 127)
         elif arg in ('<<', '>>'):
             return self.do_note_crescendo(data)
-
+        elif arg.startswith(('<', '>')):
+            factor = self.get_adjustment_factor(arg)
+            return data.notes.offset_velocity(data.indices, factor)
         else:
-            for n in data.notes_to_edit:
-                try:
-                    edited.append((n[0], n[1], n[2], float(arg), n[4]))
-                except Exception:
-                    pass
-
-        return edited
+            try:
+                data.notes.set_velocity(data.indices, float(arg))
+            except ValueError:
+                return False
+        return True
 
     def do_note_crescendo(self, data):
-        # type: (CmdData) -> List[Note]
+        # type: (CmdData) -> bool
         '''Applies crescendo/decrescendo to notes.'''
-        edited = []
-        last_pos = -1
-        pos_index = 0
-        new_pos = -1
-        new_index = 0
-
-        reverse = data.args[1] == '<<'
-        sorted_notes = sorted(data.notes_to_edit, key=lambda n: n[1], reverse=reverse)
-        for n in sorted_notes:
-            if n[1] != last_pos:
-                last_pos = n[1]
-                pos_index += 1
-        for n in sorted_notes:
-            if n[1] != new_pos:
-                new_pos = n[1]
-                new_index += 1
-            edited.append((n[0], n[1], n[2], ((128 / pos_index) * new_index) - 1, n[4]))
-        return edited
+        data.notes.ramp_velocity(data.indices, descending=data.args[1] == '<<')
+        return True
 
     def do_note_delete(self, data):
-        # type: (CmdData) -> None
+        # type: (CmdData) -> bool
         '''Delete notes.'''
-        # XXX: write here, edited would be evaluated to False
-        self.write_notes(data, [])
+        data.notes.delete(data.indices)
+        return True
 # endregion
@@ -136,6 +136,7 @@
     ENVINS   = XClipActions.insert_envelope,
     ENVCLR   = XClipActions.clear_envelope,
     ENVCAP   = XClipActions.capture_to_envelope,
+    ENVCOPY  = XClipActions.copy_envelope,
     ENVSHOW  = XClipActions.show_envelope,
     ENVHIDE  = XClipActions.hide_envelopes,
     QNTZ     = XClipActions.quantize,
@@ -158,6 +159,7 @@
 NOTES_ACTIONS = dict((
     ('REV',   NotesMixin.do_note_reverse),
     ('INV',   NotesMixin.do_note_invert),
+    ('SEMI',  NotesMixin.do_note_semi_adjustment),
     ('COMP',  NotesMixin.do_note_compress),
     ('EXP',   NotesMixin.do_note_expand),
     ('GATE',  NotesMixin.do_note_gate_adjustment),
@@ -166,6 +168,11 @@
     ('SCRP',  NotesMixin.do_position_scramble),
     ('CMB',   NotesMixin.do_note_combine),
     ('SPLIT', NotesMixin.do_note_split),
+    ('LEG',   NotesMixin.do_note_legato),
+    ('DEDUP', NotesMixin.do_note_dedupe),
+    ('QNTZ',  NotesMixin.do_note_quantize),
+    ('GRV',   NotesMixin.do_note_groove),
+    ('HUM',   NotesMixin.do_note_humanize),
     ('DEL',   NotesMixin.do_note_delete),
     ('VELO',  NotesMixin.do_note_velo_adjustment),
     ('ON',    NotesMixin.set_notes_on_off),
@@ -524,15 +524,13 @@ def __init__(self, parent, controls, override):
         self._controls = controls
         self._override = override
         self._last_beat = -1
-        self.song().add_current_song_time_listener(self.on_time_changed)
-        self.song().add_is_playing_listener(self.on_time_changed)
+        self.subscribe(self.song(), 'current_song_time', self.on_time_changed)
+        self.subscribe(self.song(), 'is_playing', self.on_time_changed)
 
     def disconnect(self):
         if self._controls:
             self.clear()
         self._controls = None
-        self.song().remove_current_song_time_listener(self.on_time_changed)
-        self.song().remove_is_playing_listener(self.on_time_changed)
         self._override = None
         super().disconnect()
 
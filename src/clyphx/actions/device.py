@@ -24,11 +24,11 @@
     from ..core.live import Device, DeviceParameter, Track
     from ..core.legacy import _DispatchCommand, _SingleDispatch
 
-from _Generic.Devices import get_parameter_by_name
 from ..core.exceptions import InvalidAction, InvalidParam
+from ..core.banks import BANK_SLOTS, PARAM_SLOTS
 from ..core.xcomponent import XComponent
 from ..core.live import Clip, get_random_int
-from ..consts import switch, DEVICE_BANKS
+from ..consts import switch
 from .device_looper import LooperMixin
 
 log = logging.getLogger(__name__)
@@ -177,23 +177,18 @@ def _rnr_params(device, func):
     def set_device_on_off(self, device, value=None):
         # type: (Device, Optional[Text]) -> None
         '''Toggles or turns device on/off.'''
-        for param in device.parameters:
-            if str(param.name).startswith('Device On') and param.is_enabled:
-                switch(param, 'value', value)
-                # TODO: break?
+        param = self._parent.get_parameter_index(device).by_original_name('Device On')
+        if param and param.is_enabled:
+            switch(param, 'value', value)
 
-    @staticmethod
-    def get_chain_selector(device):
+    def get_chain_selector(self, device):
         # type: (Device) -> Optional[DeviceParameter]
         '''Get rack chain selector param.'''
         if device.class_name.endswith('GroupDevice'):
-            for param in device.parameters:
-                if str(param.original_name) == 'Chain Selector':
-                    return param
+            return self._parent.get_parameter_index(device).by_original_name('Chain Selector')
         return None
 
-    @staticmethod
-    def get_bank_param(device, param, bank='B0'):
+    def get_bank_param(self, device, param, bank='B0'):
         # type: (Device, str, Optional[str]) -> DeviceParameter
         '''Get bank/parameter for Live's devices.
 
@@ -204,15 +199,12 @@ def get_bank_param(device, param, bank='B0'):
                 bank index (1-8), e.g. 'B2'. Otherwise returns a BoB
                 (best-of-bank) param.
         '''
-        try:
-            _param = int(param[1]) - 1
-            _bank  = int(bank[1])
-            name   = DEVICE_BANKS[device.class_name][_bank][_param]
-            # TODO: join with dev_doc
-            return get_parameter_by_name(device, name)
-        except Exception as e:
-            log.error('Failed to get banked param (%s/%s): %r',
-                      bank if _bank else 'BoB', param, e)
+        _bank = BANK_SLOTS.get(bank)
+        _param = PARAM_SLOTS.get(param)
+        if device is None or _bank is None or _param is None:
+            log.error('Failed to get banked param (%s/%s) of %r', bank, param, device)
+            return None
+        return self._parent.get_parameter_index(device).bank_param(_bank, _param)
 
 
 # region CHAIN ACTIONS
@@ -235,7 +227,6 @@ def dispatch_chain_action(self, device, args):
             log.error("Failed to parse chain action args '%s': %r", args, e)
             return
 
-        chain = device.view.selected_chain
         if chain:
             try:
                 func = CHAIN_ACTIONS[action]
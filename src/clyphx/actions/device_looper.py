@@ -30,18 +30,14 @@ def get_looper(self, track):
         # type: (Track) -> None
         '''Get first looper device on track and its params.'''
         self._looper_data = dict()
-        for d in track.devices:
-            if d.class_name == 'Looper':
-                self._looper_data['Looper'] = d
-                for p in d.parameters:
-                    if p.name in ('Device On', 'Reverse', 'State'):
-                        self._looper_data[p.name] = p
-                break
-            elif (not self._looper_data and
-                    self._parent._can_have_nested_devices and
-                    d.can_have_chains and d.chains):
-                for c in d.chains:
-                    self.get_looper(c)
+        looper = self._parent.get_device_index(track).looper
+        if looper:
+            self._looper_data['Looper'] = looper
+            index = self._parent.get_parameter_index(looper)
+            for name in ('Device On', 'Reverse', 'State'):
+                param = index.by_name(name)
+                if param:
+                    self._looper_data[name] = param
 
     def get_param(self, name):
         if not (self._looper_data and self._looper_data['Looper']):
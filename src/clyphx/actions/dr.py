@@ -53,10 +53,9 @@ def dispatch_dr_action(self, track, action, *args):
             return
 
         # get dr to operate on
-        for device in track.devices:
-            if device.can_have_drum_pads:
-                method(device, *args)
-                break
+        device = self._parent.get_device_index(track).drum_rack
+        if device:
+            method(device, *args)
 
     def scroll_selector(self, dr, factor):
         # type: (Device, Text) -> None
@@ -26,7 +26,7 @@
         Any, Optional, Text,
         Iterable, Sequence, Tuple, List,
     )
-    from ..core.live import Device, Scene, Track
+    from ..core.live import Device, Track
     from ..core.legacy import _SingleDispatch
 
 from ..core.xcomponent import XComponent
@@ -55,22 +55,15 @@ def __init__(self, parent):
         self._tempo_ramp_active = False
         self._tempo_ramp_settings = list()  # type: Sequence[Any]
         self._last_beat = -1
-        self.song().add_current_song_time_listener(self.on_time_changed)
-        self.song().add_is_playing_listener(self.on_time_changed)
+        self.subscribe(self.song(), 'current_song_time', self.on_time_changed)
+        self.subscribe(self.song(), 'is_playing', self.on_time_changed)
         if self.song().clip_trigger_quantization != 0:
             self._last_gqntz = int(self.song().clip_trigger_quantization)
         if self.song().midi_recording_quantization != 0:
             self._last_rqntz = int(self.song().midi_recording_quantization)
-        self._last_scene_index = self.sel_scene
-        self._scenes_to_monitor = list()  # type: List[Scene]
-        self.setup_scene_listeners()
 
     def disconnect(self):
-        self.remove_scene_listeners()
-        self.song().remove_current_song_time_listener(self.on_time_changed)
-        self.song().remove_is_playing_listener(self.on_time_changed)
-        for attr in ('_tempo_ramp_settings', '_scenes_to_monitor'):
-            setattr(self, attr, None)
+        self._tempo_ramp_settings = None
         super().disconnect()
 
     def dispatch_action(self, cmd):
@@ -2,17 +2,27 @@
 from builtins import object
 from typing import TYPE_CHECKING
 import logging
-from ..core.live import get_random_int
+from functools import partial
+from ..core.live import Clip, get_random_int
 
 if TYPE_CHECKING:
     from typing import Optional, Text, Tuple
-    from ..core.live import Clip
 
 log = logging.getLogger(__name__)
 
 
 class SceneMixin(object):
 
+    @property
+    def _last_scene_index(self):
+        # type: () -> int
+        return self._parent.scene_index.triggered
+
+    @_last_scene_index.setter
+    def _last_scene_index(self, index):
+        # type: (int) -> None
+        self._parent.scene_index.triggered = index
+
     def create_scene(self, track, xclip, value=None):
         # type: (None, Clip, Optional[Text]) -> None
         '''Creates scene at end of scene list or at the specified index.
@@ -105,10 +115,22 @@ def set_scene(self, track, xclip, args):
                     elif scene < 0 and abs(scene) >= len(self.song().scenes):
                         scene = -(abs(scene) - len(self.song().scenes))
         self._last_scene_index = scene
-        for t in self.song().tracks:
-            if not (t.is_foldable or (t.clip_slots[scene].has_clip
-                    and t.clip_slots[scene].clip == xclip)):
-                t.clip_slots[scene].fire()
+        self._fire_scene_slots(scene, xclip)
+
+    def _fire_scene_slots(self, scene, xclip):
+        # type: (int, Clip) -> None
+        '''Fires the clip slots of the scene in tracks that aren't
+        groups, except the one of the X-Clip. Unlike launching the scene
+        from Live, it doesn't apply the scene tempo or time signature.
+        '''
+        xslot = None
+        if isinstance(xclip, Clip):
+            slot = xclip.canonical_parent.canonical_parent.clip_slots[scene]
+            if slot.has_clip and slot.clip == xclip:
+                xslot = slot
+        for slot in self._parent.scene_index.fireable_slots(scene):
+            if slot != xslot:
+                slot.fire()
 
     def get_scene_to_operate_on(self, xclip, args):
         # type: (Clip, Text) -> int
@@ -121,14 +143,9 @@ def get_scene_to_operate_on(self, xclip, args):
             scene_name = args[args.index('"')+1:]
             if '"' in scene_name:
                 scene_name = scene_name[0:scene_name.index('"')]
-                for i, sc in enumerate(self.song().scenes):
-                    if scene_name == sc.name.upper():
-                        scene = i
-                        break
-                # for i in range(len(self.song().scenes)):
-                #     if scene_name == self.song().scenes[i].name.upper():
-                #         scene = i
-                #         break
+                index = self._parent.scene_index.by_name(scene_name)
+                if index != -1:
+                    scene = index
         elif args and args != 'SEL':
             try:
                 if 0 <= int(args) < len(self.song().scenes) + 1:
@@ -136,33 +153,3 @@ def get_scene_to_operate_on(self, xclip, args):
             except Exception:
                 pass
         return scene
-
-# region LISTENERS
-    def on_scene_triggered(self, index):
-        self._last_scene_index = index
-
-    def on_scene_list_changed(self):
-        self.setup_scene_listeners()
-
-    def setup_scene_listeners(self):
-        '''Setup listeners for all scenes in set and check that last
-        index is in current scene range.
-        '''
-        self.remove_scene_listeners()
-        scenes = self.song().scenes
-        if not 0 < self._last_scene_index < len(scenes):
-            self._last_scene_index = self.sel_scene
-        for i, scene in enumerate(scenes):
-            self._scenes_to_monitor.append(scene)
-            listener = lambda index=i: self.on_scene_triggered(index)
-            if not scene.is_triggered_has_listener(listener):
-                scene.add_is_triggered_listener(listener)
-
-    def remove_scene_listeners(self):
-        for i, scene in enumerate(self._scenes_to_monitor):
-            if scene:
-                listener = lambda index=i: self.on_scene_triggered(index)
-                if scene.is_triggered_has_listener(listener):
-                    scene.remove_is_triggered_listener(listener)
-        self._scenes_to_monitor = []
-# endregion
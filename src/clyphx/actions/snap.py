@@ -15,22 +15,27 @@
 # along with ClyphX.  If not, see <https://www.gnu.org/licenses/>.
 
 from __future__ import absolute_import, unicode_literals
-from builtins import super, dict, range
+from builtins import super, dict, range, zip, list
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from typing import (
         Any, Union, Optional, Text,
-        Iterable, List, Tuple, Mapping, Dict,
+        Iterable, List, Tuple, Mapping, Dict, Sequence, Set,
     )
-    from ..core.live import Device, RackDevice, Track, DeviceParameter
+    from ..core.live import Device, Track, DeviceParameter
     from ..core.legacy import _DispatchCommand
 
 from functools import partial
 from itertools import chain
 from Live import Clip
-import pickle
+import logging
+from ..core.devices import walk_devices, ParameterLimitExceeded
 from ..core.xcomponent import XComponent
+from .snap_data import SEPARATOR, SnapshotData, dumps, is_snapshot
+from .snap_smoothing import CURVES, ParameterSmoother
+
+log = logging.getLogger(__name__)
 
 
 # SNAP DATA ARRAY
@@ -58,6 +63,9 @@
 CHAIN_MUTE = 2
 CHAIN_SEND_START = 3
 
+#: Max number of decoded snapshots kept.
+SNAPSHOT_CACHE_SIZE = 32
+
 
 class XSnapActions(XComponent):
     '''Snapshot-related actions.
@@ -68,13 +76,19 @@ def __init__(self, parent):
         # type: (Any) -> None
         super().__init__(parent)
         self.current_tracks = dict()  # type: Dict[Text, Any]
-        self._parameters_to_smooth = dict()  # type: Dict[Text, Any]
-        self._rack_parameters_to_smooth = dict()  # type: Dict[Text, Any]
+        self._parameters_to_smooth = ParameterSmoother()
+        self._rack_morph_position = None  # type: Optional[float]
+        # A/B morphing between two stored snapshots
+        self._morph = None  # type: Optional[ParameterSmoother]
+        self._morph_position = None  # type: Optional[float]
+        self._morph_cache = dict()  # type: Dict[Tuple[Text, Text], Tuple[Any, ...]]
+        self._morph_capture = None  # type: Optional[Dict[DeviceParameter, float]]
+        self._snapshots = dict()  # type: Dict[Text, SnapshotData]
         self._smoothing_active = False
         self._synced_smoothing_active = False
         self._rack_smoothing_active = False
         self._smoothing_speed = 7
-        self._smoothing_count = 0
+        self._smoothing_curve = 'LIN'
         self._last_beat = -1
         self._control_rack = None
         self._snap_id = None
@@ -83,26 +97,34 @@ def __init__(self, parent):
         self._parameter_limit = 500
         self._register_timer_callback(self._on_timer)
         self._has_timer = True
-        self.song().add_current_song_time_listener(self._on_time_changed)
-        self.song().add_is_playing_listener(self._on_time_changed)
+        self.subscribe(self.song(), 'current_song_time', self._on_time_changed)
+        self.subscribe(self.song(), 'is_playing', self._on_time_changed)
 
     def disconnect(self):
         if self._has_timer:
             self._unregister_timer_callback(self._on_timer)
         self._remove_control_rack()
         self._remove_track_listeners()
-        self.song().remove_current_song_time_listener(self._on_time_changed)
-        self.song().remove_is_playing_listener(self._on_time_changed)
         self.current_tracks = dict()
-        self._parameters_to_smooth = dict()
-        self._rack_parameters_to_smooth = dict()
+        self._parameters_to_smooth.clear()
+        self._rack_morph_position = None
+        self.clear_morphs()
+        self._snapshots = dict()
         self._control_rack = None
         self._snap_id = None
         super().disconnect()
 
     def dispatch_actions(self, cmd, force=False):
         # type: (_DispatchCommand, bool) -> None
-        '''Stores snapshot of track params.'''
+        '''Stores snapshot of track params, recalls part of a stored
+        snapshot or morphs between two stored snapshots.
+        '''
+        if cmd.args.startswith('MORPH'):
+            self.morph_snapshots(cmd.xclip, cmd.args.split()[1:])
+            return
+        if cmd.args.startswith('RECALL'):
+            self.recall_partial_snapshot(cmd.xclip, cmd.args.split()[1:])
+            return
         if not isinstance(cmd.xclip, Clip) and not force:
             return
         self.store_track_snapshot(cmd.tracks, cmd.xclip, cmd.ident, cmd.args)
@@ -123,11 +145,17 @@ def store_track_snapshot(self, track_list, xclip, ident, args):
                         self._current_track_data[PLAY_SETTINGS] = track.playing_slot_index
                         param_count += 1
                     if (not args or 'DEV' in args) and track.devices:
-                        param_count += self._store_device_settings(track, args)
+                        try:
+                            param_count += self._store_device_settings(
+                                track, args, self._parameter_limit - param_count
+                            )
+                        except ParameterLimitExceeded:
+                            param_count = self._parameter_limit + 1
+                            break
                     snap_data[track.name] = self._current_track_data
             if snap_data:
                 if param_count <= self._parameter_limit:
-                    xclip.name = '{} || {}'.format(ident, pickle.dumps(snap_data))
+                    xclip.name = '{}{}{}'.format(ident, SEPARATOR, dumps(snap_data))
                 else:
                     current_name = xclip.name
                     xclip.name = 'Too many parameters to store!'
@@ -155,10 +183,14 @@ def _store_mix_settings(self, track, args):
             param_count += 3
         return param_count
 
-    def _store_device_settings(self, track, args):
-        # type: (Track, Text) -> int
+    def _store_device_settings(self, track, args, param_budget=None):
+        # type: (Track, Text, Optional[int]) -> int
         '''Stores device related settings and returns the number of
         parameters that were stored.
+
+        Devices are keyed by their path in the track, using the same
+        notation as nested device actions (e.g. '2' or '2.1.3'). Chains
+        are keyed by their rack path and index (e.g. '2.1').
         '''
         param_count = 0
         try:
@@ -166,81 +198,109 @@ def _store_device_settings(self, track, args):
         except ValueError:
             pass
         else:
-            track_devices = dict()
-            for dev_index in range(start, end):
-                if dev_index < len(track.devices):
-                    current_device = track.devices[dev_index]
-                    if current_device.name not in track_devices:
-                        track_devices[current_device.name] = dict(
-                            params=[p.value for p in current_device.parameters],
-                        )
-                        param_count += len(current_device.parameters)
-                        if (self._include_nested_devices and
-                            self._parent._can_have_nested_devices and
-                            current_device.can_have_chains
-                        ):
-                            param_count += self._get_nested_devices(
-                                current_device, track_devices[current_device.name], 0
-                            )
+            track_devices = dict()  # type: Dict[Text, Dict[Text, Any]]
+            for node in walk_devices(list(track.devices)[start:end],
+                                     first=start + 1,
+                                     max_depth=None if self._is_nested else 0,
+                                     param_budget=param_budget):
+                if node.mixer:
+                    track_devices[node.path] = dict(
+                        mixer=[p.value for p in node.mixer],
+                    )
+                    param_count += len(node.mixer)
+                elif node.parameters:
+                    track_devices[node.path] = dict(
+                        class_name=node.obj.class_name,
+                        params=[p.value for p in node.parameters],
+                    )
+                    param_count += len(node.parameters)
             if track_devices:
                 self._current_track_data[DEVICE_SETTINGS] = track_devices
 
         return param_count
 
-    def _get_nested_devices(self, rack, nested_devs, parameter_count):
-        '''Creates recursive dict of nested devices and returns count of
-        parameters.
-        '''
-        if rack.chains:
-            nested_devs['chains'] = dict()
-            for ci, c in enumerate(rack.chains):
-                nested_devs['chains'][ci] = dict(devices=dict())
-                for di, d in enumerate(c.devices):
-                    nested_devs['chains'][ci]['devices'][di] = dict(
-                        params=[p.value for p in d.parameters]
-                    )
-                    parameter_count += len(d.parameters)
-                    if not rack.class_name.startswith('Midi'):
-                        mix_settings = [c.mixer_device.volume.value,
-                                        c.mixer_device.panning.value,
-                                        c.mixer_device.chain_activator.value]
-                        parameter_count += 3
-                        sends = c.mixer_device.sends
-                        if sends:
-                            for s in sends:
-                                mix_settings.append(s.value)
-                            parameter_count += len(sends)
-                        nested_devs['chains'][ci]['mixer'] = mix_settings
-                    if d.can_have_chains and d.chains:
-                        self._get_nested_devices(
-                            d, nested_devs['chains'][ci]['devices'][di], parameter_count
-                        )
-        return parameter_count
+    @property
+    def _is_nested(self):
+        # type: () -> bool
+        '''Whether nested devices are included in snapshots.'''
+        return bool(self._include_nested_devices and
+                    self._parent._can_have_nested_devices)
 
     def recall_track_snapshot(self, name, xclip, disable_smooth=False):
         # type: (None, Clip, bool) -> None
         '''Recalls snapshot of track params.'''
-        self._snap_id = xclip.name[xclip.name.index('['):xclip.name.index(']')+1].strip().upper()
-        #FIXME
-        snap_data = pickle.loads(str(xclip.name)[len(self._snap_id) + 4:])
-        self._parameters_to_smooth = dict()
-        self._rack_parameters_to_smooth = dict()
-        is_synced = False if disable_smooth else self._init_smoothing(xclip)
+        self._recall_snapshot(xclip.name, xclip, disable_smooth=disable_smooth)
+
+    def recall_partial_snapshot(self, xtrigger, args):
+        # type: (Any, List[Text]) -> None
+        '''Recalls some categories of a stored snapshot, e.g.:
 
-        for track, param_data in snap_data.items():
-            pos = param_data[PLAY_SETTINGS]
-            if track in self.current_tracks:
-                track = self.current_tracks[track]
-                self._recall_mix_settings(track, param_data)
-                if (pos is not None and not track.is_foldable
-                        and track is not self.song().master_track):
-                    if pos < 0:
-                        track.stop_all_clips()
-                    elif (track.clip_slots[pos].has_clip
-                            and track.clip_slots[pos].clip != xclip):
-                        track.clip_slots[pos].fire()
-                if pos:
-                    self._recall_device_settings(track, param_data)
+            SNAP RECALL VERSE MIX DEV2
+
+        Categories can be MIX, PLAY, DEV (all devices) or DEVn (n-th
+        device). All of them are recalled if none is given.
+        '''
+        if not args:
+            log.error('SNAP RECALL needs a snapshot ident')
+            return
+        clip = self._find_snapshot_clip(args[0])
+        if not clip:
+            log.error('Snapshot not found: %s', args[0])
+            return
+        mix = play = not args[1:]
+        devices = None if not args[1:] else set()  # type: Optional[Set[Text]]
+        for arg in args[1:]:
+            if arg == 'MIX':
+                mix = True
+            elif arg == 'PLAY':
+                play = True
+            elif arg == 'DEV':
+                devices = None
+            elif arg.startswith('DEV') and arg[3:].isdigit() and devices is not None:
+                devices.add(str(int(arg[3:])))
+            else:
+                log.error('Invalid SNAP RECALL category: %s', arg)
+        self._recall_snapshot(clip.name, xtrigger, mix, play, devices,
+                              disable_smooth=not isinstance(xtrigger, Clip))
+
+    def _recall_snapshot(self, name, xclip, mix=True, play=True, devices=None,
+                         disable_smooth=False):
+        # type: (Text, Any, bool, bool, Optional[Set[Text]], bool) -> None
+        '''Recalls the categories of the snapshot stored in `name`: mixer
+        settings, playing clips and the settings of the given top-level
+        devices (all of them if None).
+        '''
+        self._snap_id = name[name.index('['):name.index(']')+1].strip().upper()
+        snapshot = self._load_snapshot(name)
+        self._parameters_to_smooth.clear()
+        self._rack_morph_position = None
+        self._morph = None
+        self._morph_position = None
+        is_synced = False if disable_smooth else self._init_smoothing(xclip)
+        self._parameters_to_smooth.steps = self._smoothing_speed
+        self._parameters_to_smooth.curve = self._smoothing_curve
+        # quantized params switch halfway when morphing with the rack
+        self._parameters_to_smooth.threshold = 0.5 if self._is_rack_morph else 0.0
+
+        for track_name in snapshot.tracks:
+            if track_name not in self.current_tracks:
+                continue
+            track = self.current_tracks[track_name]
+            if mix:
+                self._recall_mix_settings(track, snapshot.mix(track_name),
+                                          snapshot.mix_ext(track_name))
+            pos = snapshot.play(track_name) if play else None
+            if (pos is not None and not track.is_foldable
+                    and track is not self.song().master_track):
+                if pos < 0:
+                    track.stop_all_clips()
+                elif (track.clip_slots[pos].has_clip
+                        and track.clip_slots[pos].clip != xclip):
+                    track.clip_slots[pos].fire()
+            if devices is None or devices:
+                settings = snapshot.devices(track_name, devices)
+                if settings:
+                    self._recall_device_settings(track, settings, devices)
 
         if self._is_control_track and self._parameters_to_smooth:
             if (not self._control_rack or
@@ -251,10 +311,9 @@ def recall_track_snapshot(self, name, xclip, disable_smooth=False):
             else:
                 self._parent.schedule_message(1, self._refresh_control_rack)
 
-    def _recall_mix_settings(self, track, param_data):
-        # type: (Track, Mapping[int, Any]) -> None
+    def _recall_mix_settings(self, track, std, ext):
+        # type: (Track, Optional[Sequence[float]], Optional[Sequence[int]]) -> None
         '''Recalls mixer related settings.'''
-        std = param_data[MIX_STD_SETTINGS]
         if std:
             pan_value = std[MIX_PAN]
             if (track.mixer_device.volume.is_enabled and std[MIX_VOL] != -1):
@@ -272,26 +331,61 @@ def _recall_mix_settings(self, track, param_data):
                         self._get_parameter_data_to_smooth(
                             sends[i], std[MIX_SEND_START + i])
 
-        if param_data[1] and track is not self.song().master_track:
-            ext = param_data[MIX_EXT_SETTINGS]
+        if (ext and self._morph_capture is None
+                and track is not self.song().master_track):
             track.mute = ext[MIX_MUTE]
             track.solo = ext[MIX_SOLO]
             track.mixer_device.crossfade_assign = ext[MIX_CF]
 
-    def _recall_device_settings(self, track, param_data):
-        # type: (Track, Mapping[int, Any]) -> None
+    def _recall_device_settings(self, track, settings, devices=None):
+        # type: (Track, Mapping[Text, Any], Optional[Set[Text]]) -> None
         '''Recalls device related settings.'''
-        settings = param_data[DEVICE_SETTINGS]
-        for device in track.devices:
-            if device.name in settings:
-                self._recall_device_snap(device, settings[device.name]['params'])
-                if (self._include_nested_devices
-                        and self._parent._can_have_nested_devices
-                        and device.can_have_chains
-                        and 'chains' in settings[device.name]):
-                    self._recall_nested_device_snap(
-                        device, settings[device.name]['chains'])
-                del settings[device.name]
+        if any('params' in v and 'class_name' not in v for v in settings.values()):
+            settings = self._upgrade_device_settings(track, settings)
+            if devices is not None:
+                settings = dict((k, v) for k, v in settings.items()
+                                if k.split('.')[0] in devices)
+        index = self._get_device_index(track)
+        for path, data in settings.items():
+            obj = index.get(path)
+            if obj is None:
+                continue
+            if 'mixer' in data:
+                self._recall_chain_mixer(obj, data['mixer'])
+            elif data['class_name'] in (None, obj.class_name):
+                self._recall_device_snap(obj, data['params'])
+
+    def _get_device_index(self, track):
+        # type: (Track) -> Dict[Text, Any]
+        '''Returns the devices and chains of the track by path.'''
+        return dict((node.path, node.obj) for node in walk_devices(
+            track.devices, max_depth=None if self._is_nested else 0
+        ))
+
+    @staticmethod
+    def _upgrade_device_settings(track, settings):
+        # type: (Track, Mapping[Text, Any]) -> Dict[Text, Dict[Text, Any]]
+        '''Converts device settings keyed by device name, as stored by
+        previous versions, to settings keyed by path. The first device
+        with each name is used.
+        '''
+        upgraded = dict()  # type: Dict[Text, Dict[Text, Any]]
+        stack = []  # type: List[Tuple[Text, Mapping[Text, Any]]]
+        names = set()
+        for i, device in enumerate(track.devices, 1):
+            if device.name in settings and device.name not in names:
+                names.add(device.name)
+                stack.append((str(i), settings[device.name]))
+        while stack:
+            path, data = stack.pop()
+            upgraded[path] = dict(class_name=None, params=data['params'])
+            for ci, chain_data in data.get('chains', dict()).items():
+                chain_path = '{}.{}'.format(path, ci + 1)
+                if 'mixer' in chain_data:
+                    upgraded[chain_path] = dict(mixer=chain_data['mixer'])
+                stack.extend(('{}.{}'.format(chain_path, di + 1), d)
+                             for di, d in chain_data['devices'].items())
+        return upgraded
 
     def _recall_device_snap(self, device, stored_params):
         # type: (Device, Any) -> None
@@ -301,87 +395,51 @@ def _recall_device_snap(self, device, stored_params):
                 if param.is_enabled:
                     self._get_parameter_data_to_smooth(param, stored_params[i])
 
-    def _recall_nested_device_snap(self, rack, stored_params):
-        # type: (RackDevice, Mapping) -> None
-        '''Recalls the settings and mixer settings of nested devices.'''
-        if rack.chains and stored_params:
-            num_chains = len(rack.chains)
-            for chain_key in stored_params.keys():
-                if chain_key < num_chains:
-                    chain = rack.chains[chain_key]
-                    chain_devices = chain.devices
-                    num_chain_devices = len(chain_devices)
-                    stored_chain = stored_params[chain_key]
-                    stored_devices = stored_chain['devices']
-                    for device_key in stored_devices.keys():
-                        if device_key < num_chain_devices:
-                            self._recall_device_snap(
-                                chain_devices[device_key],
-                                stored_devices[device_key]['params'],
-                            )
-                            if (chain_devices[device_key].can_have_chains and
-                                    'chains' in stored_devices[device_key]):
-                                self._recall_nested_device_snap(
-                                    chain_devices[device_key],
-                                    stored_devices[device_key]['chains'],
-                                )
-                    if not rack.class_name.startswith('Midi') and 'mixer' in stored_chain:
-                        if chain.mixer_device.volume.is_enabled:
-                            self._get_parameter_data_to_smooth(
-                                chain.mixer_device.volume,
-                                stored_chain['mixer'][CHAIN_VOL],
-                            )
-                        if chain.mixer_device.panning.is_enabled:
-                            self._get_parameter_data_to_smooth(
-                                chain.mixer_device.panning,
-                                stored_chain['mixer'][CHAIN_PAN],
-                            )
-                        if chain.mixer_device.chain_activator.is_enabled:
-                            self._get_parameter_data_to_smooth(
-                                chain.mixer_device.chain_activator,
-                                stored_chain['mixer'][CHAIN_MUTE],
-                            )
-                        sends = chain.mixer_device.sends
-                        if sends:
-                            num_sends = len(sends)
-                            for i in range(len(stored_chain['mixer']) - CHAIN_SEND_START):
-                                if i < num_sends and sends[i].is_enabled:
-                                    self._get_parameter_data_to_smooth(
-                                        sends[i],
-                                        stored_chain['mixer'][CHAIN_SEND_START + i],
-                                    )
+    def _recall_chain_mixer(self, rack_chain, stored_mixer):
+        # type: (Any, Sequence[float]) -> None
+        '''Recalls the mixer settings of a rack chain.'''
+        mixer = rack_chain.mixer_device
+        for param, value in zip((mixer.volume, mixer.panning, mixer.chain_activator),
+                                stored_mixer):
+            if param.is_enabled:
+                self._get_parameter_data_to_smooth(param, value)
+        for param, value in zip(mixer.sends, stored_mixer[CHAIN_SEND_START:]):
+            if param.is_enabled:
+                self._get_parameter_data_to_smooth(param, value)
 
     def _init_smoothing(self, xclip):
         # type: (Clip) -> bool
         '''Initializes smoothing and returns whether or not smoothing is
         synced to tempo or not.
         '''
-        self._smoothing_count = 0
         self._smoothing_active = False
         self._rack_smoothing_active = False
         self._synced_smoothing_active = False
         is_synced = False
         track_name = xclip.canonical_parent.canonical_parent.name.upper()
         self._is_control_track = track_name.startswith('CLYPHX SNAP')
+        self._smoothing_curve = 'LIN'
         if self._is_control_track:
             self._setup_control_rack(xclip.canonical_parent.canonical_parent)
             self._smoothing_speed = 8
             new_speed = 8
+            speed = None
             if 'SP:' in self._snap_id:
-                speed = self._snap_id[self._snap_id.index(':')+1:self._snap_id.index(']')].strip()
+                speed = self._snap_id[self._snap_id.index(':')+1:self._snap_id.index(']')]
+            elif '[' in track_name and ']' in track_name:
+                speed = track_name[track_name.index('[')+1:track_name.index(']')]
+            if speed:
+                # curve keywords can follow the speed, e.g. [8S EXP]
+                tokens = speed.split()
+                for token in tokens:
+                    if token in CURVES:
+                        self._smoothing_curve = token
+                speed = ''.join(t for t in tokens if t not in CURVES)
                 is_synced = 'S' in speed
                 try:
                     new_speed = int(speed.replace('S', ''))
                 except Exception:
                     new_speed = 8
-            else:
-                if '[' and ']' in track_name:
-                    speed = track_name[track_name.index('[')+1:track_name.index(']')].strip()
-                    is_synced = 'S' in speed
-                    try:
-                        new_speed = int(speed.replace('S', ''))
-                    except Exception:
-                        new_speed = 8
             if is_synced:
                 new_speed *= self.song().signature_numerator
             if 0 <= new_speed < 501:
@@ -399,6 +457,16 @@ def _setup_control_rack(self, track):
                 self._control_rack = dev
                 break
 
+    @property
+    def _is_rack_morph(self):
+        # type: () -> bool
+        '''Whether the snapshot is morphed with the control rack macro
+        instead of being smoothed over time.
+        '''
+        return bool(self._is_control_track and
+                    self._control_rack and
+                    self._control_rack.parameters[0].value == 1.0)
+
     def _refresh_control_rack(self):
         '''Refreshes rack name and macro value on snap triggered. If
         triggered when rack off, clear snap id from rack name.
@@ -408,44 +476,33 @@ def _refresh_control_rack(self):
                 self._control_rack.name = 'ClyphX Snap {}'.format(self._snap_id)
                 self._control_rack.parameters[1].value = 0.0
                 self._rack_smoothing_active = True
-                if not self._control_rack.parameters[1].value_has_listener(
-                        self._control_rack_macro_changed):
-                    self._control_rack.parameters[1].add_value_listener(
-                        self._control_rack_macro_changed)
+                self.subscribe(self._control_rack.parameters[1], 'value',
+                               self._control_rack_macro_changed, 'control_rack')
             else:
                 self._control_rack.name = 'ClyphX Snap'
 
     def _control_rack_macro_changed(self):
-        '''Returns param values to set based on macro value and build
-        dict.
+        '''Stores the morph position set by the macro, to be applied on
+        the next timer tick.
         '''
         if (self._rack_smoothing_active and
-                self._parameters_to_smooth and
                 self._control_rack.parameters[0].value == 1.0):
-            self._rack_parameters_to_smooth = dict()
-            macro_value = self._control_rack.parameters[1].value
-            new_dict = dict()
-            for p, v in self._parameters_to_smooth.items():
-                param_value = v[2] + (macro_value * v[0])
-                if p.is_quantized:
-                    if macro_value < 63 and p.value != v[2]:
-                        param_value = v[2]
-                    elif macro_value > 63 and p.value != v[1]:
-                        param_value = v[1]
-                    else:
-                        param_value = None
-                if param_value is not None:
-                    new_dict[p] = param_value
-            self._rack_parameters_to_smooth = new_dict
+            position = self._control_rack.parameters[1].value / 127.0
+            if self._morph is not None:
+                self._morph_position = position
+            elif self._parameters_to_smooth:
+                self._rack_morph_position = position
 
     def _on_timer(self):
         '''Smoothes parameter value changes via timer.'''
         if self._smoothing_active and self._parameters_to_smooth:
             self._apply_timed_smoothing()
-        if self._rack_smoothing_active and self._rack_parameters_to_smooth:
-            for p, v in self._rack_parameters_to_smooth.items():
-                p.value = v
-                del self._rack_parameters_to_smooth[p]
+        if self._rack_smoothing_active and self._rack_morph_position is not None:
+            self._parameters_to_smooth.apply(self._rack_morph_position)
+            self._rack_morph_position = None
+        if self._morph is not None and self._morph_position is not None:
+            self._morph.apply(self._morph_position)
+            self._morph_position = None
 
     def _on_time_changed(self):
         '''Smoothes parameter value changes synced to playback.'''
@@ -460,42 +517,154 @@ def _on_time_changed(self):
     def _apply_timed_smoothing(self, arg=None):
         # type: (None) -> None
         '''Applies smoothing for either timer or sync.'''
-        self._smoothing_count += 1
-        for p, v in self._parameters_to_smooth.items():
-            param_value = v[2] + (self._smoothing_count * v[0])
-            if p.is_quantized:
-                p.value = v[1]
-                del self._parameters_to_smooth[p]
-            elif param_value == v[1] or self._smoothing_count >= self._smoothing_speed:
-                del self._parameters_to_smooth[p]
-                p.value = v[1]
-            else:
-                p.value = param_value
+        if not self._parameters_to_smooth.step():
+            self._smoothing_active = False
+            self._synced_smoothing_active = False
 
     def _get_parameter_data_to_smooth(self, parameter, new_value):
         # type: (DeviceParameter, float) -> None
-        '''Returns parameter data to smooth and return list of smoothing
-        value, target value and current value.
+        '''Adds the parameter to the smoother if its value needs to be
+        smoothed, otherwise sets it straight away.
         '''
-        factor = self._smoothing_speed
-        if (self._is_control_track and
-                self._control_rack and
-                self._control_rack.parameters[0].value == 1.0):
-            factor = 127
-        if factor and self._is_control_track:
+        if self._morph_capture is not None:
+            self._morph_capture[parameter] = new_value
+            return
+        morph = self._is_rack_morph
+        if (morph or self._smoothing_speed) and self._is_control_track:
             difference = new_value - parameter.value
-            if difference and (factor == 127 or (factor != 127 and abs(difference) > 0.01)):
-                if parameter.is_quantized:
-                    factor = 1
-                param_data = [(new_value - parameter.value) / factor, new_value, parameter.value]
-                if difference < 0.0:
-                    param_data = [((parameter.value - new_value) / factor) * -1, new_value, parameter.value]
-                self._parameters_to_smooth[parameter] = param_data
+            if difference and (morph or abs(difference) > 0.01):
+                self._parameters_to_smooth.add(parameter, new_value)
             else:
                 parameter.value = new_value
         else:
             parameter.value = new_value
 
+    def morph_snapshots(self, xtrigger, args):
+        # type: (Any, List[Text]) -> None
+        '''Blends between two stored snapshots, e.g.:
+
+            SNAP MORPH VERSE CHORUS 64
+
+        The position (0-127) is taken from the last argument or from the
+        value of the X-Control that triggered the action. If none of
+        them are given and the action is triggered from the control
+        track, the macro of the control rack drives the blend.
+        '''
+        if len(args) < 2:
+            log.error('SNAP MORPH needs two snapshot idents: %r', args)
+            return
+        morph = self._get_morph(args[0], args[1])
+        if morph is None:
+            return
+        if self._morph is not morph:
+            self._smoothing_active = False
+            self._synced_smoothing_active = False
+            self._parameters_to_smooth.clear()
+            self._rack_morph_position = None
+            morph.invalidate()
+            self._morph = morph
+
+        value = args[2] if len(args) > 2 else getattr(xtrigger, 'value', None)
+        if value is not None:
+            try:
+                self._morph_position = min(127, max(0, int(value))) / 127.0
+            except ValueError:
+                log.error('Invalid SNAP MORPH position: %r', value)
+        elif isinstance(xtrigger, Clip):
+            track = xtrigger.canonical_parent.canonical_parent
+            self._is_control_track = track.name.upper().startswith('CLYPHX SNAP')
+            if self._is_control_track:
+                self._setup_control_rack(track)
+                self._snap_id = '[{} > {}]'.format(args[0], args[1])
+                self._parent.schedule_message(1, self._refresh_control_rack)
+
+    def _get_morph(self, ident_a, ident_b):
+        # type: (Text, Text) -> Optional[ParameterSmoother]
+        '''Returns the smoother that blends between the two snapshots.
+        Snapshots are decoded once and cached while their X-Clips keep
+        the same name.
+        '''
+        key = (ident_a, ident_b)
+        if key in self._morph_cache:
+            clip_a, name_a, clip_b, name_b, morph = self._morph_cache[key]
+            try:
+                if clip_a.name == name_a and clip_b.name == name_b:
+                    return morph
+            except Exception:
+                pass
+            del self._morph_cache[key]
+
+        clip_a = self._find_snapshot_clip(ident_a)
+        clip_b = self._find_snapshot_clip(ident_b)
+        if not (clip_a and clip_b):
+            log.error('Snapshots not found: %s, %s', ident_a, ident_b)
+            return None
+
+        start = self._collect_snapshot_values(self._load_snapshot(clip_a.name))
+        target = self._collect_snapshot_values(self._load_snapshot(clip_b.name))
+        # quantized params switch halfway
+        morph = ParameterSmoother(threshold=0.5)
+        for param, value in target.items():
+            if param in start:
+                morph.add(param, value, start[param])
+        self._morph_cache[key] = (clip_a, clip_a.name, clip_b, clip_b.name, morph)
+        return morph
+
+    def clear_morphs(self):
+        # type: () -> None
+        '''Drops the morphs, as they hold the parameters of the devices
+        found when created.
+        '''
+        # the morph in use always comes from the cache
+        self._morph = None
+        self._morph_position = None
+        self._morph_cache = dict()
+
+    def _find_snapshot_clip(self, ident):
+        # type: (Text) -> Optional[Clip]
+        '''Returns the X-Clip that stores the snapshot with the given
+        ident (speed settings excluded).
+        '''
+        for track in self.song().tracks:
+            for slot in track.clip_slots:
+                if slot.has_clip:
+                    name = slot.clip.name
+                    if is_snapshot(name):
+                        snap_id = name[1:name.index(']')].strip().upper()
+                        if snap_id == ident or snap_id.split(' ')[0] == ident:
+                            return slot.clip
+        return None
+
+    def _collect_snapshot_values(self, snapshot):
+        # type: (SnapshotData) -> Dict[DeviceParameter, float]
+        '''Returns the values of the parameters stored in the snapshot
+        that exist in the current set.
+        '''
+        values = dict()  # type: Dict[DeviceParameter, float]
+        self._morph_capture = values
+        try:
+            for name in snapshot.tracks:
+                if name in self.current_tracks:
+                    track = self.current_tracks[name]
+                    self._recall_mix_settings(track, snapshot.mix(name), None)
+                    settings = snapshot.devices(name)
+                    if settings:
+                        self._recall_device_settings(track, settings)
+        finally:
+            self._morph_capture = None
+        return values
+
+    def _load_snapshot(self, name):
+        # type: (Text) -> SnapshotData
+        '''Returns the snapshot stored in an X-Clip name. Snapshots are
+        cached by name, so they are only decoded once.
+        '''
+        if name not in self._snapshots:
+            if len(self._snapshots) >= SNAPSHOT_CACHE_SIZE:
+                self._snapshots.clear()
+            self._snapshots[name] = SnapshotData(name)
+        return self._snapshots[name]
+
     @staticmethod
     def _get_snap_device_range(args, track):
         # type: (Text, Track) -> Tuple[int, int]
@@ -529,12 +698,12 @@ def _get_snap_device_range(args, track):
     def setup_tracks(self):
         '''Stores dictionary of tracks by name.'''
         self.current_tracks = dict()
+        self.clear_morphs()
         self._remove_track_listeners()
         for track in chain(self.song().tracks,
                            self.song().return_tracks,
                            (self.song().master_track,)):
-            if not track.name_has_listener(self.setup_tracks):
-                track.add_name_listener(self.setup_tracks)
+            self.subscribe(track, 'name', self.setup_tracks, 'tracks')
             name = track.name.upper()
             if track.name not in self.current_tracks and not name.startswith('CLYPHX SNAP'):
                 self.current_tracks[track.name] = track
@@ -550,18 +719,9 @@ def _remove_control_rack(self):
         '''Removes control rack listeners.'''
         if self._control_rack:
             self._control_rack.name = 'ClyphX Snap'
-            if self._control_rack.parameters[1].value_has_listener(
-                self._control_rack_macro_changed
-            ):
-                self._control_rack.parameters[1].remove_value_listener(
-                    self._control_rack_macro_changed
-                )
+        self.unsubscribe('control_rack')
         self._control_rack = None
 
     def _remove_track_listeners(self):
         '''Removes track name listeners.'''
-        for track in chain(self.song().tracks,
-                           self.song().return_tracks,
-                           (self.song().master_track,)):
-            if track.name_has_listener(self.setup_tracks):
-                track.remove_name_listener(self.setup_tracks)
+        self.unsubscribe('tracks')
@@ -0,0 +1,161 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, list
+from typing import TYPE_CHECKING
+import json
+import pickle
+
+if TYPE_CHECKING:
+    from typing import Any, Container, Dict, List, Optional, Text
+
+#: Snapshot format marker. Snapshots without it are pickled by
+#: previous versions.
+FORMAT = '2'
+
+# Categories in the offsets table
+MIX = 'MIX'
+MIX_EXT = 'EXT'
+PLAY = 'PLAY'
+DEV = 'DEV'
+
+SEPARATOR = ' || '
+
+
+def is_snapshot(name):
+    # type: (Text) -> bool
+    '''Whether the X-Clip name stores a snapshot, in the current format
+    or pickled by previous versions.
+    '''
+    return name.startswith('[') and (SEPARATOR + FORMAT + ';' in name
+                                     or SEPARATOR + '(' in name)
+
+
+def dumps(snap_data):
+    # type: (Dict[Text, List[Any]]) -> Text
+    '''Returns the snapshot encoded as text.
+
+    Each category of each track (and each top-level device) is encoded
+    as an independent JSON slice of the body, so it can be decoded on
+    its own. The body is preceded by the table of offsets of the slices
+    and its length:
+
+        2;<table length>;{"track": {"MIX": [0, 14], "DEV": {"1": ...}}}...
+    '''
+    table = dict()  # type: Dict[Text, Dict[Text, Any]]
+    chunks = []  # type: List[Text]
+    pos = [0]
+
+    def add(value):
+        # type: (Any) -> List[int]
+        chunk = json.dumps(value, separators=(',', ':'))
+        chunks.append(chunk)
+        start = pos[0]
+        pos[0] += len(chunk)
+        return [start, pos[0]]
+
+    for track, (std, ext, play, devices) in snap_data.items():
+        offsets = dict()  # type: Dict[Text, Any]
+        if std:
+            offsets[MIX] = add(std)
+        if ext:
+            offsets[MIX_EXT] = add(ext)
+        if play is not None:
+            offsets[PLAY] = add(play)
+        if devices:
+            by_device = dict()  # type: Dict[Text, Dict[Text, Any]]
+            for path, settings in devices.items():
+                by_device.setdefault(path.split('.')[0], dict())[path] = settings
+            offsets[DEV] = dict((k, add(v)) for k, v in by_device.items())
+        table[track] = offsets
+
+    table_json = json.dumps(table, separators=(',', ':'))
+    return '{};{};{}{}'.format(FORMAT, len(table_json), table_json, ''.join(chunks))
+
+
+class SnapshotData(object):
+    '''Snapshot stored in an X-Clip name, decoded on demand.
+
+    Only the offsets table is decoded on creation. Slices are decoded
+    the first time they are requested and kept, so repeated recalls
+    don't decode anything. The returned values must not be modified.
+    '''
+    __slots__ = ('_table', '_body', '_slices', '_legacy')
+
+    def __init__(self, name):
+        # type: (Text) -> None
+        text = name[name.index(SEPARATOR) + len(SEPARATOR):]
+        self._slices = dict()  # type: Dict[Any, Any]
+        if text.startswith(FORMAT + ';'):
+            size, _, text = text[len(FORMAT) + 1:].partition(';')
+            size = int(size)
+            self._table = json.loads(text[:size])
+            self._body = text[size:]
+            self._legacy = None
+        else:
+            # {track: [mix std, mix ext, play, {device name: settings}]}
+            self._table = None
+            self._body = None
+            self._legacy = pickle.loads(text.encode('latin-1'))
+
+    @property
+    def tracks(self):
+        # type: () -> List[Text]
+        return list(self._legacy if self._legacy is not None else self._table)
+
+    def _get(self, track, category, index=0):
+        # type: (Text, Text, int) -> Any
+        if self._legacy is not None:
+            return self._legacy[track][index] or None
+        offsets = self._table[track].get(category)
+        if offsets is None:
+            return None
+        key = (track, category)
+        if key not in self._slices:
+            start, end = offsets
+            self._slices[key] = json.loads(self._body[start:end])
+        return self._slices[key]
+
+    def mix(self, track):
+        # type: (Text) -> Optional[List[float]]
+        '''Volume, panning and sends.'''
+        return self._get(track, MIX, 0)
+
+    def mix_ext(self, track):
+        # type: (Text) -> Optional[List[int]]
+        '''Mute, solo and crossfade assign.'''
+        return self._get(track, MIX_EXT, 1)
+
+    def play(self, track):
+        # type: (Text) -> Optional[int]
+        '''Playing slot index.'''
+        if self._legacy is not None:
+            return self._legacy[track][2]
+        return self._get(track, PLAY)
+
+    def devices(self, track, indices=None):
+        # type: (Text, Optional[Container[Text]]) -> Dict[Text, Any]
+        '''Device settings by path, only for the top-level devices in
+        `indices` (1-based, as text) if given.
+
+        Snapshots stored by previous versions return all the settings
+        keyed by device name.
+        '''
+        if self._legacy is not None:
+            return self._legacy[track][3] or dict()
+        offsets = self._table[track].get(DEV)
+        if not offsets:
+            return dict()
+        settings = dict()  # type: Dict[Text, Any]
+        for index, (start, end) in offsets.items():
+            if indices is not None and index not in indices:
+                continue
+            key = (track, DEV, index)
+            if key not in self._slices:
+                self._slices[key] = json.loads(self._body[start:end])
+            settings.update(self._slices[key])
+        return settings
@@ -0,0 +1,198 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, range, zip
+from typing import TYPE_CHECKING
+from array import array
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Text
+    from ..core.live import DeviceParameter
+
+#: Number of steps in which a parameter range is divided to decide if a
+#: new value is worth writing (14-bit, as high resolution MIDI).
+RESOLUTION = 16383.0
+
+
+def linear(t):
+    # type: (float) -> float
+    return t
+
+
+def exponential(t, k=4.0):
+    # type: (float, float) -> float
+    '''Slow start, fast end.'''
+    return (math.exp(k * t) - 1.0) / (math.exp(k) - 1.0)
+
+
+def s_curve(t):
+    # type: (float) -> float
+    '''Slow start and end (smoothstep).'''
+    return t * t * (3.0 - 2.0 * t)
+
+
+#: Easing curves by the keyword used in snapshot ids and track names.
+CURVES = dict(
+    LIN  = linear,
+    EXP  = exponential,
+    SCRV = s_curve,
+)  # type: Dict[Text, Callable[[float], float]]
+
+
+class ParameterSmoother(object):
+    '''Interpolates a batch of parameters from their start values to
+    their target values.
+
+    Values are kept in parallel buffers (``array('d')``, or NumPy
+    arrays if available) so every tick computes all the interpolated
+    values at once. A parameter is only written if its value changed
+    after being quantized to ``RESOLUTION`` steps.
+
+    Quantized parameters can't be interpolated, so they switch from
+    the start to the target value once the position exceeds
+    ``threshold``.
+    '''
+    __slots__ = (
+        'steps', 'count', 'curve', 'threshold',
+        '_params', '_start', '_target', '_min', '_scale', '_levels',
+        '_stepped', '_vectors',
+    )
+
+    def __init__(self, steps=8, curve='LIN', threshold=0.0):
+        # type: (int, Text, float) -> None
+        self.steps = steps
+        self.curve = curve
+        self.threshold = threshold
+        self.clear()
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._params) + len(self._stepped)
+
+    def __bool__(self):
+        # type: () -> bool
+        return bool(self._params or self._stepped)
+
+    __nonzero__ = __bool__
+
+    def clear(self):
+        '''Removes all the parameters and resets the step count.'''
+        self.count = 0
+        self._params = []  # type: List[DeviceParameter]
+        self._start = array(str('d'))
+        self._target = array(str('d'))
+        self._min = array(str('d'))
+        self._scale = array(str('d'))
+        self._levels = array(str('l'))
+        # [param, start, target, current]
+        self._stepped = []  # type: List[List[Any]]
+        self._vectors = None  # type: Optional[Any]
+
+    def invalidate(self):
+        '''Forgets the last written values, so the next call to `apply`
+        writes every parameter.
+        '''
+        self._levels = array(str('l'), [-1] * len(self._params))
+        for entry in self._stepped:
+            entry[3] = None
+        self._vectors = None
+
+    def add(self, param, target, start=None):
+        # type: (DeviceParameter, float, Optional[float]) -> None
+        '''Adds a parameter to smooth from `start` (its current value
+        by default) to `target`.
+        '''
+        start = param.value if start is None else start
+        if param.is_quantized:
+            self._stepped.append([param, start, target, start])
+            return
+        span = param.max - param.min
+        scale = RESOLUTION / span if span else 0.0
+        self._params.append(param)
+        self._start.append(start)
+        self._target.append(target)
+        self._min.append(param.min)
+        self._scale.append(scale)
+        self._levels.append(int((start - param.min) * scale + 0.5))
+        self._vectors = None
+
+    def step(self):
+        # type: () -> bool
+        '''Advances one step and writes the interpolated values.
+        Returns whether there are steps left.
+        '''
+        self.count += 1
+        if self.count >= self.steps:
+            self.apply(1.0)
+            self.clear()
+            return False
+        self.apply(float(self.count) / self.steps)
+        return True
+
+    def apply(self, position):
+        # type: (float) -> None
+        '''Writes the values at the given position of the path (0.0 is
+        the start and 1.0 the target).
+        '''
+        position = max(0.0, min(1.0, position))
+        for entry in self._stepped:
+            value = entry[2] if position > self.threshold else entry[1]
+            if value != entry[3]:
+                entry[3] = value
+                entry[0].value = value
+
+        if not self._params:
+            return
+        if position == 1.0:
+            factor = 1.0
+        else:
+            factor = CURVES.get(self.curve, linear)(position)
+        if np is not None:
+            self._apply_vectorized(factor, position == 1.0)
+        else:
+            self._apply_buffered(factor, position == 1.0)
+
+    def _apply_buffered(self, factor, at_target):
+        # type: (float, bool) -> None
+        params = self._params
+        levels = self._levels
+        for i, (start, target, lo, scale) in enumerate(
+            zip(self._start, self._target, self._min, self._scale)
+        ):
+            value = target if at_target else start + (target - start) * factor
+            level = int((value - lo) * scale + 0.5)
+            if level != levels[i]:
+                levels[i] = level
+                params[i].value = value
+
+    def _apply_vectorized(self, factor, at_target):
+        # type: (float, bool) -> None
+        if self._vectors is None:
+            self._vectors = (
+                np.array(self._start, dtype=float),
+                np.array(self._target, dtype=float),
+                np.array(self._min, dtype=float),
+                np.array(self._scale, dtype=float),
+                np.array(self._levels, dtype=np.int64),
+            )
+        start, target, lo, scale, levels = self._vectors
+        values = target if at_target else start + (target - start) * factor
+        new_levels = np.floor((values - lo) * scale + 0.5).astype(np.int64)
+        changed = np.flatnonzero(new_levels != levels)
+        levels[changed] = new_levels[changed]
+        params = self._params
+        for i in changed.tolist():
+            params[i].value = float(values[i])
+
+
+__all__ = ['CURVES', 'ParameterSmoother']
@@ -15,7 +15,6 @@
 # along with ClyphX.  If not, see <https://www.gnu.org/licenses/>.
 
 from __future__ import absolute_import, unicode_literals
-from builtins import range
 from typing import TYPE_CHECKING
 import logging
 
@@ -27,7 +26,8 @@
 from ..consts import switch
 from ..consts import GQ_STATES, MON_STATES, XFADE_STATES
 from ..core.xcomponent import XComponent
-from ..core.live import Clip, get_random_int
+from ..core.live import Clip
+from ..core.clips import random_index
 
 log = logging.getLogger(__name__)
 
@@ -175,13 +175,14 @@ def set_selection(self, track, xclip, args):
         '''Sets track/slot selection.'''
         self.sel_track = track
         if track in self.song().tracks:
+            scenes = self._parent.scene_index.scenes
             if args:
                 try:
-                    self.song().view.selected_scene = list(self.song().scenes)[int(args) - 1]
+                    self.song().view.selected_scene = scenes[int(args) - 1]
                 except Exception:
                     pass
             elif track.playing_slot_index >= 0:
-                self.song().view.selected_scene = list(self.song().scenes)[track.playing_slot_index]
+                self.song().view.selected_scene = scenes[track.playing_slot_index]
 
     def set_jump(self, track, xclip, args):
         # type: (Track, None, Text) -> None
@@ -287,10 +288,7 @@ def _get_slot_index_to_play(self, track, xclip, args, allow_empty_slots=False):
                         new_max = num_scenes
                     if 0 <= new_min and new_max < num_scenes + 1 and new_min < new_max - 1:
                         rnd_range = [new_min, new_max]
-            slot_to_play = get_random_int(0, rnd_range[1] - rnd_range[0]) + rnd_range[0]
-            if slot_to_play == play_slot:
-                while slot_to_play == play_slot:
-                    slot_to_play = get_random_int(0, rnd_range[1] - rnd_range[0]) + rnd_range[0]
+            slot_to_play = random_index(rnd_range[0], rnd_range[1], play_slot)
         # don't allow adjustment unless more than 1 scene
         elif args.startswith(('<', '>')) and len(self.song().scenes) > 1:
             if track.is_foldable:
@@ -299,12 +297,8 @@ def _get_slot_index_to_play(self, track, xclip, args, allow_empty_slots=False):
             if factor < len(self.song().scenes):
                 # only launch slots that contain clips
                 if abs(factor) == 1:
-                    for _ in range(len(self.song().scenes)):
-                        play_slot += factor
-                        if play_slot >= len(self.song().scenes):
-                            play_slot = 0
-                        if track.clip_slots[play_slot].has_clip and track.clip_slots[play_slot].clip != xclip:
-                            break
+                    index = self._parent.get_clip_index(track)
+                    play_slot = index.next_occupied(play_slot, factor, xclip)
                 else:
                     play_slot += factor
                     if play_slot >= len(self.song().scenes):
@@ -314,11 +308,7 @@ def _get_slot_index_to_play(self, track, xclip, args, allow_empty_slots=False):
                 slot_to_play = play_slot
         elif args.startswith('"') and args.endswith('"'):
             clip_name = args.strip('"')
-            for i in range(len(track.clip_slots)):
-                slot = track.clip_slots[i]
-                if slot.has_clip and slot.clip.name.upper() == clip_name:
-                    slot_to_play = i
-                    break
+            slot_to_play = self._parent.get_clip_index(track).slot_by_name(clip_name)
         else:
             try:
                 if 0 <= int(args) < len(self.song().scenes) + 1:
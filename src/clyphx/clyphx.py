@@ -25,6 +25,10 @@
 from .core.legacy import _DispatchCommand, _SingleDispatch
 from .core.utils import repr_tracklist, set_user_profile
 from .core.live import Live, Track, Clip, get_random_int
+from .core.devices import ParameterIndexes
+from .core.clips import ClipIndexes
+from .core.scenes import SceneIndex
+from .core.subscriptions import Subscriptions
 from .core.parse import IdSpecParser, ObjParser
 from .core.xcomponent import XComponent
 from .consts import LIVE_VERSION, SCRIPT_INFO
@@ -52,12 +56,15 @@
     XSnapActions,
     XCsActions,
 )
+from .actions.snap_data import is_snapshot
 
 if TYPE_CHECKING:
     from typing import (Any, Text, Union, Optional, Dict,
                         Iterable, Sequence, List, Tuple)
     from .core.live import (Clip, Device, DeviceParameter,
                             Track, MidiRemoteScript)
+    from .core.devices import DeviceIndex, ParameterIndex
+    from .core.clips import ClipIndex
     from .triggers import XTrigger
 
 log = logging.getLogger(__name__)
@@ -81,8 +88,12 @@ def __init__(self, c_instance):
         self._user_settings = get_user_settings()
         self.parse_id = IdSpecParser()
         self.parse_obj = ObjParser()
+        self.subscriptions = Subscriptions()
+        self.parameter_indexes = ParameterIndexes(self.subscriptions)
+        self.clip_indexes = ClipIndexes(self.subscriptions)
+        self.scene_index = SceneIndex(self.song(), self.subscriptions)
         with self.component_guard():
-            self.macrobat = Macrobat(self)
+            self.macrobat = Macrobat(self, self._user_settings.macrobat_settings)
             self._extra_prefs = ExtraPrefs(self, self._user_settings.prefs)
             self.cs_linker = CsLinker()
             self.track_actions = XTrackActions(self)
@@ -115,15 +126,21 @@ def __init__(self, c_instance):
         #     f.write(get_device_params(format='md', tables=True))  # type: ignore
 
     def disconnect(self):
+        self.parameter_indexes.clear()
+        self.clip_indexes.clear()
+        self.scene_index.disconnect()
         for attr in (
             '_PushApcCombiner', 'macrobat', '_extra_prefs', 'cs_linker',
             'track_actions', 'snap_actions', 'global_actions',
             'device_actions', 'dr_actions', 'clip_actions', 'cs_actions',
             'user_actions', 'control_component', '_user_variables',
             '_play_seq_clips', '_loop_seq_clips', 'current_tracks',
+            'parameter_indexes', 'clip_indexes', 'scene_index',
         ):
             setattr(self, attr, None)
         super().disconnect()
+        # components remove their listeners on disconnect
+        self.subscriptions.clear()
 
     @property
     def _is_debugging(self):
@@ -241,6 +258,12 @@ def handle_action_list_trigger(self, track, xtrigger):
         if xtrigger == None:  # TODO: use case?
             return
 
+        # snapshots are recalled directly, their data is not an action list
+        if isinstance(xtrigger, Clip) and is_snapshot(xtrigger.name.strip()):
+            if xtrigger.is_playing:
+                self.snap_actions.recall_track_snapshot(None, xtrigger)
+            return
+
         try:
             self.run_statement(track, xtrigger)
         except Exception as e:
@@ -280,14 +303,7 @@ def run_statement(self, track, xtrigger):
         if spec.seq == 'PSEQ':
             return self.handle_play_seq_action_list(actions, xtrigger, spec.id)
 
-        for action in actions:
-            # TODO: split in singledispatch per track?
-            command = _DispatchCommand(action['track'],
-                                       xtrigger,
-                                       spec.id,
-                                       action['action'],
-                                       action['args'])
-            self.handle_dispatch_command(command)
+        self.dispatch_action_list(actions, xtrigger, spec.id)
 
     def _handle_action_list_trigger(self, track, xtrigger):
         # type: (Track, XTrigger) -> None
@@ -301,7 +317,7 @@ def _handle_action_list_trigger(self, track, xtrigger):
 
         # snap action, so pass directly to snap component
         # TODO: xtrigger.is_triggered?
-        if ' || (' in name and isinstance(xtrigger, Clip) and xtrigger.is_playing:
+        if is_snapshot(name) and isinstance(xtrigger, Clip) and xtrigger.is_playing:
             # self.snap_actions.recall_track_snapshot(name, xtrigger)
             self.snap_actions.recall_track_snapshot(None, xtrigger)
 
@@ -353,14 +369,31 @@ def _handle_action_list_trigger(self, track, xtrigger):
                     self._loop_seq_clips[xtrigger.name] = [ident, formatted_action_list]
                     self.handle_loop_seq_action_list(xtrigger, 0)
                 else:
-                    # TODO: split in singledispatch per track?
-                    for action in formatted_action_list:
-                        command = _DispatchCommand(action['track'],
-                                                    xtrigger,
-                                                    ident,
-                                                    action['action'],
-                                                    action['args'])
-                        self.handle_dispatch_command(command)
+                    self.dispatch_action_list(formatted_action_list, xtrigger, ident)
+
+    def dispatch_action_list(self, actions, xtrigger, ident):
+        # type: (List[Dict[Text, Any]], XTrigger, Text) -> None
+        '''Dispatches each action of a formatted action list.
+
+        Consecutive note actions are batched, so the notes of each clip
+        are read and written only once for all of them.
+        '''
+        clip_actions = self.clip_actions
+        try:
+            for action in actions:
+                # TODO: split in singledispatch per track?
+                command = _DispatchCommand(action['track'],
+                                           xtrigger,
+                                           ident,
+                                           action['action'],
+                                           action['args'])
+                if clip_actions.is_notes_command(command):
+                    clip_actions.begin_notes_batch()
+                else:
+                    clip_actions.end_notes_batch()
+                self.handle_dispatch_command(command)
+        finally:
+            clip_actions.end_notes_batch()
 
     def _format_action_list(self, track, alist):
         # (Text) -> List[Dict[Text, Any]]
@@ -514,6 +547,22 @@ def get_track_index_by_name(name, tracks):
                 name = name.replace('"', '', 1)
         return name
 
+    def get_device_index(self, track):
+        # type: (Track) -> DeviceIndex
+        '''Returns the index of the track devices by name and path.'''
+        return self.macrobat.get_device_index(track)
+
+    def get_parameter_index(self, device):
+        # type: (Device) -> ParameterIndex
+        '''Returns the index of the device parameters by name and bank.
+        '''
+        return self.parameter_indexes.get(device)
+
+    def get_clip_index(self, track):
+        # type: (Track) -> ClipIndex
+        '''Returns the index of the track clips by slot and name.'''
+        return self.clip_indexes.get(track)
+
     def get_device_to_operate_on(self, track, action_name, args):
         # type: (Track, Text, Text) -> Tuple[Optional[Device], Text]
         '''Get device to operate on and action to perform with args.
@@ -527,30 +576,16 @@ def get_device_to_operate_on(self, track, action_name, args):
                 device_args = args[args.index('"')+1:].strip()
             if '"' in dev_name:
                 dev_name = dev_name[0:dev_name.index('"')]
-            for dev in track.devices:
-                if dev.name.upper() == dev_name:
-                    device = dev
-                    break
+            device = self.get_device_index(track).by_name(dev_name)
         elif action_name == 'DEV':
             device = track.view.selected_device
-            if device != None:
-                if track.devices:
-                    device = track.devices[0]
+            if device is None and track.devices:
+                device = track.devices[0]
         else:
-            try:
-                dev_num = action_name.replace('DEV', '')
-                if '.' in dev_num and self._can_have_nested_devices:
-                    dev_split = dev_num.split('.')
-                    top_level = track.devices[int(dev_split[0]) - 1]
-                    if top_level and top_level.can_have_chains:
-                        device = top_level.chains[int(dev_split[1]) - 1].devices[0]
-                        if len(dev_split) > 2:
-                            device = top_level.chains[int(dev_split[1]) - 1].devices[int(dev_split[2]) - 1]
-                else:
-                    device = track.devices[int(dev_num) - 1]
-            except Exception as e:
-                raise Exception(e)
-                # pass
+            dev_num = action_name.replace('DEV', '')
+            if not self._can_have_nested_devices:
+                dev_num = dev_num.split('.')[0]
+            device = self.get_device_index(track).by_path(dev_num)
         log.debug('get_device_to_operate_on returning device=%s and device args=%s',
                   device.name if device else 'None', device_args)
         return (device, device_args)
@@ -631,10 +666,31 @@ def setup_tracks(self):
             self.macrobat.setup_tracks(r)
         self.snap_actions.setup_tracks()
 
+    def on_track_devices_changed(self, track):
+        # type: (Track) -> None
+        '''Called when the devices, chains or device names of the track
+        change, to drop the data kept about devices that may have been
+        deleted or replaced.
+        '''
+        # devices can't be traced back to their tracks, so the indexes
+        # of all of them are dropped and built again on demand
+        self.parameter_indexes.clear()
+        self.snap_actions.clear_morphs()
+
     def _on_track_list_changed(self):
+        self.clip_indexes.clear()
+        self.scene_index.update_tracks()
         super()._on_track_list_changed()
         self.setup_tracks()
 
+    def _on_scene_list_changed(self):
+        self.scene_index.update_scenes()
+        super()._on_scene_list_changed()
+
+    def _on_selected_scene_changed(self):
+        self.scene_index.update_selected()
+        super()._on_selected_scene_changed()
+
     def connect_script_instances(self, instantiated_scripts):
         '''Pass connect scripts call to control component.'''
         self.control_component.connect_script_instances(instantiated_scripts)
@@ -19,8 +19,6 @@
 # from fraction import Fraction
 import logging
 
-from _Generic.Devices import DEVICE_DICT, DEVICE_BOB_DICT
-
 from . import __version__
 from .core.live import (GridQuantization,
                         MixerDevice,
@@ -65,16 +63,6 @@ def switch(obj, attr, value, fallback=unset):
 
 NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
 
-ENV_TYPES = (
-    'IRAMP',    # Linear increasing ramp
-    'DRAMP',    # Linear decreasing ramp
-    'IPYR',     # Linear increase until midpoint and then linear decrease
-    'DPYR',     # Linear decrease until midpoint and then linear increase
-    'SAW',      # Saw wave synced to 1/4 notes
-    'SQR',      # Square wave synced to 1/4 notes
-    # 'TRI',      # Triangle wave synced to 1/4 notes
-)
-
 MIDI_STATUS = dict(
     NOTE  = 144,
     CC    = 176,
@@ -315,9 +303,4 @@ def switch(obj, attr, value, fallback=unset):
     Vinyl                  = 'Vinyl Distortion',
 )
 
-# BoB is B0, device banks have the index of its label 'B1' = 1, ...
-DEVICE_BANKS = dict()
-for device, banks in DEVICE_DICT.items():
-    DEVICE_BANKS[device] = DEVICE_BOB_DICT[device] + banks
-
 # endregion
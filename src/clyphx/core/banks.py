@@ -0,0 +1,114 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, list, range
+from typing import TYPE_CHECKING, NamedTuple, List, Text
+import logging
+import json
+import os
+
+from ..consts import LIVE_VERSION, DEV_NAME_TRANSLATION
+from .utils import get_user_clyphx_path
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+#: Increase when the cached data layout changes.
+CACHE_FORMAT = 1
+
+# BoB is B0, device banks have the index of its label 'B1' = 1, ...
+BANK_SLOTS = dict(('B{}'.format(i), i) for i in range(17))
+PARAM_SLOTS = dict(('P{}'.format(i), i - 1) for i in range(1, 9))
+
+
+DeviceBanks = NamedTuple('DeviceBanks', [('name',       Text),
+                                         ('bank_names', List[Text]),
+                                         ('banks',      List[List[Text]])])
+
+
+class BankTable(object):
+    '''Parameter banks of Live devices, as defined for Instant Mapping.
+
+    `banks` includes the best-of-bank as bank 0, and `bank_names` has a
+    name for each bank after it (empty if the bank has no name).
+    '''
+    def __init__(self, devices):
+        # type: (Dict[Text, DeviceBanks]) -> None
+        self.devices = devices
+        self._params = dict()  # type: Dict[Tuple[Text, int, int], Text]
+        for class_name, device in devices.items():
+            for b, bank in enumerate(device.banks):
+                for p, param in enumerate(bank):
+                    self._params[(class_name, b, p)] = param
+
+    def param_name(self, class_name, bank, index):
+        # type: (Text, int, int) -> Optional[Text]
+        '''Returns the original name of the n-th (0-based) parameter of
+        the bank of the device class.
+        '''
+        return self._params.get((class_name, bank, index))
+
+    @classmethod
+    def build(cls):
+        # type: () -> BankTable
+        '''Builds the table from Live's Instant Mapping definitions.'''
+        from _Generic.Devices import DEVICE_DICT, DEVICE_BOB_DICT, BANK_NAME_DICT
+
+        devices = dict()
+        for class_name, banks in DEVICE_DICT.items():
+            bank_names = BANK_NAME_DICT.get(class_name, ('',) * len(banks))
+            devices[class_name] = DeviceBanks(
+                DEV_NAME_TRANSLATION.get(class_name, class_name),
+                list(bank_names),
+                [list(b) for b in DEVICE_BOB_DICT[class_name] + banks],
+            )
+        return cls(devices)
+
+    @classmethod
+    def load(cls, path):
+        # type: (Text) -> BankTable
+        with open(path) as f:
+            data = json.load(f)
+        if data['format'] != CACHE_FORMAT or data['version'] != list(LIVE_VERSION):
+            raise ValueError('Outdated device banks cache')
+        return cls(dict((k, DeviceBanks(*v)) for k, v in data['devices'].items()))
+
+    def save(self, path):
+        # type: (Text) -> None
+        data = dict(format=CACHE_FORMAT,
+                    version=list(LIVE_VERSION),
+                    devices=dict((k, list(v)) for k, v in self.devices.items()))
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+
+_table = []  # type: List[BankTable]
+
+
+def get_bank_table():
+    # type: () -> BankTable
+    '''Returns the device banks table. It's built on first use and cached
+    in the user folder for the running Live version.
+    '''
+    if not _table:
+        path = get_user_clyphx_path(
+            'cache', 'device_banks_{}.json'.format('.'.join(map(str, LIVE_VERSION)))
+        )
+        try:
+            table = BankTable.load(path)
+        except Exception:
+            table = BankTable.build()
+            try:
+                if not os.path.exists(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+                table.save(path)
+            except (IOError, OSError) as e:
+                log.error('Failed to cache device banks: %r', e)
+        _table.append(table)
+    return _table[0]
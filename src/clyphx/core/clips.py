@@ -0,0 +1,174 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, range
+from typing import TYPE_CHECKING
+from bisect import bisect_left, bisect_right, insort
+import random
+
+if TYPE_CHECKING:
+    from typing import Callable, Dict, List, Optional, Text
+    from .live import Clip, ClipSlot, Track
+    from .subscriptions import Subscription, Subscriptions
+
+
+class ClipIndex(object):
+    '''Index of the clip slots of a track with clips and of their
+    (upper-cased) clip names, kept up to date by listeners.
+
+    It's built on the first lookup, and built again after the clip
+    slots of the track change (scenes added, removed or moved).
+    '''
+    def __init__(self, track, subscriptions):
+        # type: (Track, Subscriptions) -> None
+        self._track = track
+        self._subscriptions = subscriptions
+        self._built = False
+        self._occupied = []  # type: List[int]
+        self._names = dict()  # type: Dict[Text, List[int]]
+        self._slot_names = dict()  # type: Dict[int, Text]
+        self._clip_handles = dict()  # type: Dict[int, Subscription]
+        subscriptions.subscribe(track, 'clip_slots', self.invalidate, self)
+
+    def disconnect(self):
+        # type: () -> None
+        self._subscriptions.unsubscribe(self)
+
+    def invalidate(self):
+        # type: () -> None
+        self._subscriptions.unsubscribe(self, 'slots')
+        self._built = False
+
+    def _build(self):
+        # type: () -> None
+        self._occupied = []
+        self._names = dict()
+        self._slot_names = dict()
+        self._clip_handles = dict()
+        for i, slot in enumerate(self._track.clip_slots):
+            self._subscriptions.subscribe(slot, 'has_clip', self._slot_listener(i, slot),
+                                          self, 'slots')
+            if slot.has_clip:
+                self._add_clip(i, slot.clip)
+        self._built = True
+
+    def _slot_listener(self, index, slot):
+        # type: (int, ClipSlot) -> Callable[[], None]
+        def on_has_clip_changed():
+            if self._built:
+                self._remove_clip(index)
+                if slot.has_clip:
+                    self._add_clip(index, slot.clip)
+        return on_has_clip_changed
+
+    def _clip_listener(self, index, clip):
+        # type: (int, Clip) -> Callable[[], None]
+        def on_name_changed():
+            if self._built and index in self._slot_names:
+                self._unname(index)
+                self._name(index, clip.name.upper())
+        return on_name_changed
+
+    def _add_clip(self, index, clip):
+        # type: (int, Clip) -> None
+        insort(self._occupied, index)
+        self._name(index, clip.name.upper())
+        self._clip_handles[index] = self._subscriptions.subscribe(
+            clip, 'name', self._clip_listener(index, clip), self, 'slots'
+        )
+
+    def _remove_clip(self, index):
+        # type: (int) -> None
+        if index in self._slot_names:
+            self._occupied.remove(index)
+            self._unname(index)
+            # the clip may be moved to another slot instead of deleted,
+            # so its listener, bound to this slot, can't be left
+            self._subscriptions.remove(self._clip_handles.pop(index))
+
+    def _name(self, index, name):
+        # type: (int, Text) -> None
+        self._slot_names[index] = name
+        insort(self._names.setdefault(name, []), index)
+
+    def _unname(self, index):
+        # type: (int) -> None
+        name = self._slot_names.pop(index)
+        slots = self._names[name]
+        slots.remove(index)
+        if not slots:
+            del self._names[name]
+
+    @property
+    def occupied(self):
+        # type: () -> List[int]
+        '''Sorted indexes of the slots with clips.'''
+        if not self._built:
+            self._build()
+        return self._occupied
+
+    def slot_by_name(self, name):
+        # type: (Text) -> int
+        '''Returns the index of the first slot with a clip with the
+        (upper-cased) name, or -1.
+        '''
+        if not self._built:
+            self._build()
+        slots = self._names.get(name)
+        return slots[0] if slots else -1
+
+    def next_occupied(self, index, step=1, exclude=None):
+        # type: (int, int, Optional[Clip]) -> int
+        '''Returns the index of the next (or previous if `step` is -1)
+        slot with a clip other than `exclude`, wrapping around, or -1.
+        '''
+        occupied = self.occupied
+        size = len(occupied)
+        if step > 0:
+            pos = bisect_right(occupied, index)
+        else:
+            pos = bisect_left(occupied, index) - 1
+        for _ in range(size):
+            slot = occupied[pos % size]
+            if exclude is None or self._track.clip_slots[slot].clip != exclude:
+                return slot
+            pos += step
+        return -1
+
+
+def random_index(start, stop, exclude=-1):
+    # type: (int, int, int) -> int
+    '''Returns a random integer within [start, stop) other than
+    `exclude`, if there are others.
+    '''
+    if start <= exclude < stop and stop - start > 1:
+        index = random.randrange(start, stop - 1)
+        return index + 1 if index >= exclude else index
+    return random.randrange(start, stop)
+
+
+class ClipIndexes(object):
+    '''Clip indexes of the tracks operated on.'''
+
+    def __init__(self, subscriptions):
+        # type: (Subscriptions) -> None
+        self._subscriptions = subscriptions
+        self._indexes = dict()  # type: Dict[Track, ClipIndex]
+
+    def get(self, track):
+        # type: (Track) -> ClipIndex
+        try:
+            return self._indexes[track]
+        except KeyError:
+            index = self._indexes[track] = ClipIndex(track, self._subscriptions)
+            return index
+
+    def clear(self):
+        # type: () -> None
+        for index in self._indexes.values():
+            index.disconnect()
+        self._indexes = dict()
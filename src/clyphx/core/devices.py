@@ -0,0 +1,258 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict
+from typing import TYPE_CHECKING, NamedTuple, Any, Sequence, Text
+
+from .banks import get_bank_table
+from .exceptions import ClyphXception
+
+if TYPE_CHECKING:
+    from typing import (Callable, Container, Dict, Iterable, Iterator,
+                        Optional, Tuple)
+    from .live import Chain, Device, DeviceParameter
+    from .subscriptions import Subscriptions
+
+
+DeviceNode = NamedTuple('DeviceNode', [('path',       Text),
+                                       ('obj',        Any),
+                                       ('mixer',      Sequence[Any]),
+                                       ('parameters', Sequence[Any]),
+                                       ('rack',       Any)])
+
+
+class ParameterLimitExceeded(ClyphXception, ValueError):
+    pass
+
+
+def chain_path(path, index):
+    # type: (Text, int) -> Text
+    '''Returns the path of the n-th (1-based) item under `path`.'''
+    return '{}.{}'.format(path, index) if path else str(index)
+
+
+def chain_mixer_params(chain, rack):
+    # type: (Chain, Device) -> Sequence[DeviceParameter]
+    '''Returns the mixer parameters of a rack chain: volume, panning,
+    chain activator and sends. MIDI racks chains have no mixer.
+    '''
+    if rack.class_name.startswith('Midi'):
+        return ()
+    mixer = chain.mixer_device
+    params = [mixer.volume, mixer.panning, mixer.chain_activator]
+    params.extend(mixer.sends)
+    return params
+
+
+def walk_devices(devices,            # type: Iterable[Device]
+                 path='',            # type: Text
+                 first=1,            # type: int
+                 max_depth=None,     # type: Optional[int]
+                 classes=None,       # type: Optional[Container[Text]]
+                 skip=None,          # type: Optional[Callable[[Device], bool]]
+                 param_budget=None,  # type: Optional[int]
+                 chains=True,        # type: bool
+                 ):
+    # type: (...) -> Iterator[DeviceNode]
+    '''Walks depth-first through the devices and the chains and devices
+    nested in them, yielding a `DeviceNode` for each one.
+
+    Paths use the notation of nested device actions, e.g. '2' is the
+    2nd device, '2.1' its first chain and '2.1.3' the 3rd device of the
+    chain. Device nodes have no mixer, and chain nodes have no
+    parameters but the `rack` that holds them.
+
+    - `path` and `first` set the path of the first device.
+    - `max_depth` limits the number of rack levels to descend into (0
+      for top-level devices only).
+    - `classes` restricts the devices yielded to the given class names
+      (racks of other classes are walked anyway).
+    - `skip` excludes a device and everything nested in it.
+    - `param_budget` limits the number of parameters yielded, raising
+      `ParameterLimitExceeded` as soon as it is exceeded.
+    - `chains` sets whether chain nodes are yielded.
+    '''
+    remaining = param_budget
+    # (path, device or chain, depth, parent rack of chains)
+    stack = [(chain_path(path, i), d, 0, None)
+             for i, d in enumerate(devices, first)]
+    stack.reverse()
+    while stack:
+        path, obj, depth, rack = stack.pop()
+        if rack is not None:
+            mixer = chain_mixer_params(obj, rack)
+            if remaining is not None:
+                remaining -= len(mixer)
+                if remaining < 0:
+                    raise ParameterLimitExceeded(path)
+            yield DeviceNode(path, obj, mixer, (), rack)
+            continue
+
+        if skip and skip(obj):
+            continue
+        if classes is None or obj.class_name in classes:
+            params = obj.parameters
+            if remaining is not None:
+                remaining -= len(params)
+                if remaining < 0:
+                    raise ParameterLimitExceeded(path)
+            yield DeviceNode(path, obj, (), params, None)
+
+        if obj.can_have_chains and (max_depth is None or depth < max_depth):
+            nodes = []
+            for ci, chain in enumerate(obj.chains, 1):
+                c_path = chain_path(path, ci)
+                if chains:
+                    nodes.append((c_path, chain, depth, obj))
+                nodes.extend((chain_path(c_path, di), d, depth + 1, None)
+                             for di, d in enumerate(chain.devices, 1))
+            nodes.reverse()
+            stack.extend(nodes)
+
+
+class DeviceIndex(object):
+    '''Index of the devices of a track by path and by upper-cased name,
+    built on the first lookup.
+
+    The owner must call `invalidate` whenever the devices, chains or
+    device names of the track change.
+    '''
+    __slots__ = ('_track', '_paths', '_names', '_drum_rack', '_looper')
+
+    def __init__(self, track):
+        # type: (Any) -> None
+        self._track = track
+        self.invalidate()
+
+    def invalidate(self):
+        # type: () -> None
+        self._paths = None  # type: Optional[Dict[Text, Device]]
+        self._names = dict()  # type: Dict[Text, Device]
+        self._drum_rack = None  # type: Optional[Device]
+        self._looper = None  # type: Optional[Device]
+
+    def _build(self):
+        # type: () -> None
+        self._paths = dict()
+        for node in walk_devices(self._track.devices, chains=False):
+            device = node.obj
+            self._paths[node.path] = device
+            if '.' not in node.path:
+                self._names.setdefault(device.name.upper(), device)
+                if self._drum_rack is None and device.can_have_drum_pads:
+                    self._drum_rack = device
+            if self._looper is None and device.class_name == 'Looper':
+                self._looper = device
+
+    def by_path(self, path):
+        # type: (Text) -> Optional[Device]
+        '''Returns the device at the path, e.g. '2' or '2.1.3'. Paths to
+        a chain ('2.1') return its first device.
+        '''
+        if self._paths is None:
+            self._build()
+        if path.count('.') % 2:
+            path += '.1'
+        return self._paths.get(path)
+
+    def by_name(self, name):
+        # type: (Text) -> Optional[Device]
+        '''Returns the first top-level device with the (upper-cased)
+        name.
+        '''
+        if self._paths is None:
+            self._build()
+        return self._names.get(name)
+
+    @property
+    def drum_rack(self):
+        # type: () -> Optional[Device]
+        '''The first top-level Drum Rack.'''
+        if self._paths is None:
+            self._build()
+        return self._drum_rack
+
+    @property
+    def looper(self):
+        # type: () -> Optional[Device]
+        '''The first Looper, nested ones included.'''
+        if self._paths is None:
+            self._build()
+        return self._looper
+
+
+class ParameterIndex(object):
+    '''Index of the parameters of a device by original name, name and
+    bank slot, built on the first lookup.
+    '''
+    __slots__ = ('_device', '_original_names', '_names', '_banks')
+
+    def __init__(self, device):
+        # type: (Device) -> None
+        self._device = device
+        self.invalidate()
+
+    def invalidate(self):
+        # type: () -> None
+        self._original_names = None  # type: Optional[Dict[Text, DeviceParameter]]
+        self._names = dict()  # type: Dict[Text, DeviceParameter]
+        self._banks = dict()  # type: Dict[Tuple[int, int], Optional[DeviceParameter]]
+
+    def _build(self):
+        # type: () -> None
+        self._original_names = dict()
+        for param in self._device.parameters:
+            self._original_names.setdefault(param.original_name, param)
+            self._names.setdefault(param.name, param)
+
+    def by_original_name(self, name):
+        # type: (Text) -> Optional[DeviceParameter]
+        if self._original_names is None:
+            self._build()
+        return self._original_names.get(name)
+
+    def by_name(self, name):
+        # type: (Text) -> Optional[DeviceParameter]
+        if self._original_names is None:
+            self._build()
+        return self._names.get(name)
+
+    def bank_param(self, bank, index):
+        # type: (int, int) -> Optional[DeviceParameter]
+        '''Returns the n-th (0-based) parameter of the bank, being 0 the
+        best-of-bank and the banks from 1.
+        '''
+        key = (bank, index)
+        if key not in self._banks:
+            name = get_bank_table().param_name(self._device.class_name, bank, index)
+            self._banks[key] = self.by_original_name(name) if name else None
+        return self._banks[key]
+
+
+class ParameterIndexes(object):
+    '''Parameter indexes of the devices operated on, each invalidated
+    when its device parameters change. They're cleared when the devices
+    of any track change, so deleted devices are not kept.
+    '''
+    def __init__(self, subscriptions):
+        # type: (Subscriptions) -> None
+        self._subscriptions = subscriptions
+        self._indexes = dict()  # type: Dict[Device, ParameterIndex]
+
+    def get(self, device):
+        # type: (Device) -> ParameterIndex
+        try:
+            return self._indexes[device]
+        except KeyError:
+            index = self._indexes[device] = ParameterIndex(device)
+            self._subscriptions.subscribe(device, 'parameters', index.invalidate, self)
+            return index
+
+    def clear(self):
+        # type: () -> None
+        self._subscriptions.unsubscribe(self)
+        self._indexes = dict()
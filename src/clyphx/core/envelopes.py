@@ -0,0 +1,285 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, range, zip
+from typing import TYPE_CHECKING, NamedTuple, Any, Callable, Optional, Tuple
+import random
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from typing import Dict, Sequence, Text
+    from .live import AutomationEnvelope, Clip, DeviceParameter
+    Steps = Tuple[Sequence[float], Sequence[float], Sequence[float]]
+    Samples = Tuple[Sequence[float], Sequence[float]]
+
+#: Default length in beats of the steps of sampled shapes.
+RESOLUTION = 0.25
+
+#: Length in beats of the cycle of the Euclidean gates.
+BAR = 4.0
+
+#: Default number of pulses per bar of the Euclidean gates.
+PULSES = 5
+
+#: Steepness of the exponential ramps.
+EXP = 4.0
+
+
+# Envelope shape: a function of the phase (0 to 1) within its cycle and
+# the math module (`math` or `numpy`) returning values from 0 to 1, the
+# length in beats of the cycle (None for the whole loop), whether values
+# are held (steps) or ramp to the next one (points), and the phases to
+# insert values at, or None to sample the shape at the resolution.
+Shape = NamedTuple('Shape', [('func',   Callable[[Any, Any], Any]),
+                             ('cycle',  Optional[float]),
+                             ('steps',  bool),
+                             ('phases', Optional[Tuple[float, ...]])])
+
+SHAPES = dict(
+    IRAMP = Shape(lambda p, m: p,                    None, False, (0.0,)),
+    DRAMP = Shape(lambda p, m: 1.0 - p,              None, False, (0.0,)),
+    IPYR  = Shape(lambda p, m: 1.0 - abs(2 * p - 1), None, False, (0.0, 0.5)),
+    DPYR  = Shape(lambda p, m: abs(2 * p - 1),       None, False, (0.0, 0.5)),
+    SAW   = Shape(lambda p, m: abs(2 * p - 1),       1.0,  False, (0.0, 0.5)),
+    SQR   = Shape(lambda p, m: 1.0 - m.floor(2 * p), 2.0,  True,  (0.0, 0.5)),
+    TRI   = Shape(lambda p, m: 1.0 - abs(2 * p - 1), 1.0,  False, (0.0, 0.5)),
+    SIN   = Shape(lambda p, m: 0.5 - 0.5 * m.cos(2 * math.pi * p), 1.0, False, None),
+    EXPI  = Shape(lambda p, m: (m.exp(EXP * p) - 1) / (math.exp(EXP) - 1),
+                  None, False, None),
+    EXPD  = Shape(lambda p, m: (m.exp(-EXP * p) - math.exp(-EXP)) / (1 - math.exp(-EXP)),
+                  None, False, None),
+    # random sample and hold
+    RND   = Shape(None, None, True, None),
+    # Euclidean gates, with the number of pulses per bar as argument
+    EUC   = Shape(None, BAR,  True, None),
+)  # type: Dict[Text, Shape]
+
+
+def parse_shape(string):
+    # type: (Text) -> Optional[Tuple[Text, Optional[int]]]
+    '''Returns the name and the argument of a shape, e.g. 'SIN' or
+    'EUC5', or None if it's not a shape.
+    '''
+    if string in SHAPES:
+        return string, None
+    name, arg = string[:3], string[3:]
+    if name == 'EUC' and arg.isdigit():
+        return name, int(arg)
+    return None
+
+
+def generate(shape, start, end, value_range=(0.0, 1.0), resolution=RESOLUTION,
+             arg=None, seed=None):
+    # type: (Text, float, float, Tuple[float, float], float, Optional[int], Optional[int]) -> Steps
+    '''Returns the times, lengths and values of the steps of a shape
+    between `start` and `end`, with values scaled to `value_range`.
+    Steps of point shapes have no length, so the envelope ramps between
+    them, and end with a point at `end`.
+    '''
+    spec = SHAPES[shape]
+    cycle = spec.cycle or (end - start)
+    lo, hi = value_range
+    if np is not None:
+        if spec.phases is None:
+            times = start + np.arange(int(math.ceil((end - start) / resolution))) * resolution
+        else:
+            cycles = np.arange(int(math.ceil((end - start) / cycle)))
+            times = (start + (cycles[:, None] + np.array(spec.phases)) * cycle).ravel()
+            times = times[times < end]
+        if shape == 'RND':
+            values = np.random.RandomState(seed).random_sample(len(times))
+        elif shape == 'EUC':
+            values = _euclid(len(times), cycle, resolution, arg)
+        else:
+            phase = (times - start) / cycle
+            values = spec.func(phase - np.floor(phase), np)
+        values = lo + values * (hi - lo)
+        if spec.steps:
+            lengths = np.diff(np.append(times, end))
+        else:
+            last = lo + _end_value(spec.func, (end - start) / cycle) * (hi - lo)
+            times = np.append(times, end)
+            values = np.append(values, last)
+            lengths = np.zeros(len(times))
+        return times, lengths, values
+
+    if spec.phases is None:
+        times = [start + i * resolution
+                 for i in range(int(math.ceil((end - start) / resolution)))]
+    else:
+        times = [t for t in (start + (c + p) * cycle
+                             for c in range(int(math.ceil((end - start) / cycle)))
+                             for p in spec.phases) if t < end]
+    if shape == 'RND':
+        rnd = random.Random(seed)
+        values = [rnd.random() for _ in times]
+    elif shape == 'EUC':
+        values = _euclid(len(times), cycle, resolution, arg)
+    else:
+        values = []
+        for t in times:
+            phase = (t - start) / cycle
+            values.append(spec.func(phase - math.floor(phase), math))
+    values = [lo + v * (hi - lo) for v in values]
+    if spec.steps:
+        lengths = [b - a for a, b in zip(times, times[1:] + [end])]
+    else:
+        times.append(end)
+        values.append(lo + _end_value(spec.func, (end - start) / cycle) * (hi - lo))
+        lengths = [0.0] * len(times)
+    return times, lengths, values
+
+
+def _end_value(func, phase):
+    # type: (Callable[[Any, Any], Any], float) -> float
+    # the end of a whole cycle is its last phase instead of the first
+    # one of the next cycle
+    frac = phase - math.floor(phase)
+    return func(frac if frac or not phase else 1.0, math)
+
+
+def _euclid(size, cycle, resolution, pulses):
+    # type: (int, float, float, Optional[int]) -> Any
+    # gates of `pulses` spread as evenly as possible over the steps of
+    # each cycle (Bresenham's line, which matches Bjorklund's algorithm
+    # up to rotation)
+    steps = max(1, int(round(cycle / resolution)))
+    pulses = min(steps, PULSES if pulses is None else pulses)
+    if np is not None:
+        index = np.arange(size) % steps
+        return ((index * pulses) % steps < pulses).astype(float)
+    return [float((i % steps) * pulses % steps < pulses) for i in range(size)]
+
+
+def compact(times, lengths, values):
+    # type: (Sequence[float], Sequence[float], Sequence[float]) -> Steps
+    '''Removes steps that don't change the envelope: held steps with the
+    value of the previous one, which is extended over them, and points
+    with the value of both the previous and the next ones.
+    '''
+    size = len(times)
+    if size < 2:
+        return times, lengths, values
+    held = bool(lengths[0])
+    if np is not None:
+        times = np.asarray(times, dtype=float)
+        lengths = np.asarray(lengths, dtype=float)
+        values = np.asarray(values, dtype=float)
+        changed = np.ones(size, dtype=bool)
+        if held:
+            changed[1:] = values[1:] != values[:-1]
+            end = times[-1] + lengths[-1]
+            times = times[changed]
+            return times, np.diff(np.append(times, end)), values[changed]
+        changed[1:-1] = (values[1:-1] != values[:-2]) | (values[1:-1] != values[2:])
+        return times[changed], lengths[changed], values[changed]
+
+    if held:
+        end = times[-1] + lengths[-1]
+        keep = [0] + [i for i in range(1, size) if values[i] != values[i - 1]]
+        times = [times[i] for i in keep]
+        return (times, [b - a for a, b in zip(times, times[1:] + [end])],
+                [values[i] for i in keep])
+    keep = [0] + [i for i in range(1, size - 1)
+                  if values[i] != values[i - 1] or values[i] != values[i + 1]] + [size - 1]
+    return ([times[i] for i in keep], [lengths[i] for i in keep],
+            [values[i] for i in keep])
+
+
+def insert_steps(env, times, lengths, values):
+    # type: (AutomationEnvelope, Sequence[float], Sequence[float], Sequence[float]) -> None
+    '''Inserts the steps into the envelope.'''
+    if np is not None:
+        times, lengths, values = (np.asarray(x, dtype=float).tolist()
+                                  for x in (times, lengths, values))
+    insert = env.insert_step
+    for step in zip(times, lengths, values):
+        insert(*step)
+
+
+def get_envelope(clip, param):
+    # type: (Clip, DeviceParameter) -> Optional[AutomationEnvelope]
+    '''Returns the envelope of the parameter in the clip, creating it if
+    needed (and supported).
+    '''
+    env = clip.automation_envelope(param)
+    if env is None and hasattr(clip, 'create_automation_envelope'):
+        env = clip.create_automation_envelope(param)
+    return env
+
+
+def sample(env, start, end, resolution=RESOLUTION):
+    # type: (AutomationEnvelope, float, float, float) -> Samples
+    '''Returns the times and values of the envelope every `resolution`
+    beats from `start` to `end` (included).
+    '''
+    size = int(math.floor((end - start) / resolution)) + 1
+    value_at_time = env.value_at_time
+    if np is not None:
+        times = start + np.arange(size) * resolution
+        values = np.fromiter((value_at_time(t) for t in times.tolist()), float, size)
+        return times, values
+    times = [start + i * resolution for i in range(size)]
+    return times, [value_at_time(t) for t in times]
+
+
+def transform(times,              # type: Sequence[float]
+              values,             # type: Sequence[float]
+              start,              # type: float
+              end,                # type: float
+              value_range,        # type: Tuple[float, float]
+              source_range=None,  # type: Optional[Tuple[float, float]]
+              invert=False,       # type: bool
+              reverse=False,      # type: bool
+              scale=1.0,          # type: float
+              stretch=1.0,        # type: float
+              ):
+    # type: (...) -> Samples
+    '''Returns the times and values of a sampled envelope moved to start
+    at `start`, mapped from `source_range` to `value_range` if given,
+    and inverted, reversed, scaled (from the minimum value) and
+    time-stretched as given. Values are clipped to `value_range` and
+    times after `end` dropped.
+    '''
+    lo, hi = value_range
+    origin = times[0] if len(times) else start
+    mapped = source_range is not None and source_range[1] != source_range[0]
+    if mapped:
+        base = source_range[0]
+        factor = (hi - lo) / (source_range[1] - base)
+    if np is not None:
+        times = start + (np.asarray(times, dtype=float) - origin) * stretch
+        values = np.asarray(values, dtype=float)
+        if mapped:
+            values = lo + (values - base) * factor
+        if reverse:
+            values = values[::-1]
+        if invert:
+            values = lo + hi - values
+        if scale != 1.0:
+            values = lo + (values - lo) * scale
+        keep = times <= end
+        return times[keep], np.clip(values[keep], lo, hi)
+
+    times = [start + (t - origin) * stretch for t in times]
+    values = list(values)
+    if mapped:
+        values = [lo + (v - base) * factor for v in values]
+    if reverse:
+        values.reverse()
+    if invert:
+        values = [lo + hi - v for v in values]
+    if scale != 1.0:
+        values = [lo + (v - lo) * scale for v in values]
+    keep = [i for i, t in enumerate(times) if t <= end]
+    return ([times[i] for i in keep],
+            [min(hi, max(lo, values[i])) for i in keep])
@@ -0,0 +1,86 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import dict, zip
+from typing import TYPE_CHECKING, NamedTuple, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from typing import Dict, Optional, Sequence, Text
+    from .notes import NoteBuffer
+
+#: Grid sizes in beats.
+GRIDS = dict((
+    ('1/4',   1.0),
+    ('1/8',   0.5),
+    ('1/8T',  1 / 3.0),
+    ('1/16',  0.25),
+    ('1/16T', 1 / 6.0),
+    ('1/32',  0.125),
+))  # type: Dict[Text, float]
+
+#: Length in beats of the cycle of grid slots of extracted grooves.
+CYCLE = 4.0
+
+
+# Timing template: a cycle of grid slots, each with the offset (in
+# beats) notes are moved to from the slot and the factor their velocity
+# is multiplied by.
+Groove = NamedTuple('Groove', [('grid',       float),
+                               ('offsets',    List[float]),
+                               ('velocities', List[float])])
+
+
+def swing_groove(grid, swing=0.0):
+    # type: (float, float) -> Groove
+    '''Returns a straight grid groove, with every other slot delayed by
+    `swing` (0 to 1, being 1 a triplet feel).
+    '''
+    return Groove(grid, [0.0, swing * grid / 3.0], [1.0, 1.0])
+
+
+def extract_groove(notes, indices, grid, cycle=CYCLE):
+    # type: (NoteBuffer, Sequence[int], float, float) -> Groove
+    '''Returns the groove of the notes: the mean offset of the notes
+    nearest to each slot of the grid cycle, and their mean velocity
+    relative to the overall one. Slots without notes stay straight.
+    '''
+    slots = max(1, int(round(cycle / grid)))
+    if np is not None:
+        ids = np.asarray(indices, dtype=np.intp)
+        start = notes.start[ids]
+        velocity = notes.velocity[ids]
+        steps = np.round(start / grid)
+        slot = steps.astype(np.intp) % slots
+        count = np.bincount(slot, minlength=slots)
+        offset_sum = np.bincount(slot, start - steps * grid, minlength=slots)
+        velo_sum = np.bincount(slot, velocity, minlength=slots)
+        mean_velo = velocity.mean() if len(ids) else 1.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            offsets = np.where(count, offset_sum / count, 0.0)
+            velocities = np.where(count, velo_sum / count / mean_velo, 1.0)
+        return Groove(grid, offsets.tolist(), velocities.tolist())
+
+    count = [0] * slots
+    offsets = [0.0] * slots
+    velocities = [0.0] * slots
+    start, velocity = notes.start, notes.velocity
+    for i in indices:
+        steps = round(start[i] / grid)
+        slot = int(steps) % slots
+        count[slot] += 1
+        offsets[slot] += start[i] - steps * grid
+        velocities[slot] += velocity[i]
+    total = sum(count)
+    mean_velo = sum(velocities) / total if total else 1.0
+    return Groove(grid,
+                  [o / c if c else 0.0 for o, c in zip(offsets, count)],
+                  [v / c / mean_velo if c else 1.0 for v, c in zip(velocities, count)])
@@ -0,0 +1,58 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+
+class MeterFollower(object):
+    '''Follows a meter level sampled once every `rate` ticks, with the
+    attack and release times (in ticks) smoothing its rises and falls,
+    and quantizes it to a 0-127 value.
+    '''
+    def __init__(self, rate=1, attack=0, release=0):
+        # type: (int, int, int) -> None
+        self.rate = max(1, rate)
+        # one-pole coefficients, 1 for an instant response
+        self._attack = float(self.rate) / (max(0, attack) + self.rate)
+        self._release = float(self.rate) / (max(0, release) + self.rate)
+        self._ticks = 0
+        self.level = 0.0
+        self.value = 0
+
+    def tick(self):
+        # type: () -> bool
+        '''Returns whether the meter is to be sampled on this tick. The
+        first tick after being idle always is.
+        '''
+        due = not self._ticks
+        self._ticks = (self._ticks + 1) % self.rate
+        return due
+
+    def sample(self, meter):
+        # type: (float) -> Optional[int]
+        '''Follows the meter level and returns the new value if it
+        changed, otherwise None.
+        '''
+        coef = self._attack if meter > self.level else self._release
+        self.level += (meter - self.level) * coef
+        if meter == 0.0 and self.level < 1.0 / 127:
+            self.level = 0.0
+            self._ticks = 0
+        value = int(self.level * 127)
+        if value == self.value:
+            return None
+        self.value = value
+        return value
+
+    @property
+    def is_idle(self):
+        # type: () -> bool
+        return self.level == 0.0
@@ -6,7 +6,7 @@
 
 from __future__ import absolute_import, unicode_literals
 from typing import TYPE_CHECKING, NamedTuple, List, Text, Optional, Any
-from builtins import object, tuple
+from builtins import object, tuple, range
 
 from ..consts import MIDI_STATUS
 from .utils import repr_slots
@@ -41,21 +41,20 @@ class Pitch(int):
     '''Converts either a numeric value or a note + octave string into a
     constrained integer [0,127] with `note` and `octave` properties.
 
-    `note` and `octave`, if not provided, are lazy evaluated.
+    There is only one instance for each pitch, so conversions are table
+    lookups.
     '''
     def __new__(cls, value):
         # type: (Union[Text, Integral]) -> 'Pitch'
         try:                    # numeric value
-            self = super().__new__(cls, value)
-            name, octave = None, None
+            pitch = int(value)
         except ValueError:      # note + octave
-            name, octave, val = parse_pitch(value)
-            self = super().__new__(cls, val)
-        self._name = name
-        self._octave = octave
-        if 0 <= self < 128:
-            return self
-        raise ValueError(int(self))
+            pitch = parse_pitch(value)
+        if not 0 <= pitch < 128:
+            raise ValueError(pitch)
+        if _pitches:
+            return _pitches[pitch]
+        return int.__new__(cls, pitch)
 
     @classmethod
     def first_note(cls, string):
@@ -65,16 +64,12 @@ def first_note(cls, string):
     @property
     def name(self):
         # type: () -> str
-        if self._name is None:
-            self._name, self._octave = pitch_note(self)
-        return self._name
+        return pitch_note(self)[0]
 
     @property
     def octave(self):
         # type: () -> int
-        if self._octave is None:
-            self._name, self._octave = pitch_note(self)
-        return self._octave
+        return pitch_note(self)[1]
 
     def __add__(self, other):
         return self.__class__(int(self) + other)
@@ -112,9 +107,15 @@ def __str__(self):
         return '{}{}'.format(self.name, self.octave)
 
 
+_pitches = ()  # type: Tuple[Pitch, ...]
+_pitches = tuple(Pitch(i) for i in range(128))
+
+
 def pitch_range(string):
     # type: (Text) -> Tuple[Pitch, Pitch]
-    return tuple(Pitch[n] for n in parse_range(string))
+    '''Returns the first and last pitches of a range, e.g. 'C3-G3'.'''
+    first, last = parse_range(string)
+    return _pitches[first], _pitches[last]
 
 
 Note = NamedTuple('Note', [('pitch',  int),  # TODO: Pitch
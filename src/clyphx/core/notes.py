@@ -0,0 +1,741 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, range, zip
+from typing import TYPE_CHECKING
+from array import array
+from bisect import bisect_left, bisect_right
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from typing import (Any, Dict, Iterable, List, Optional, Sequence, Set,
+                        Text, Tuple)
+    from .live import Clip
+    from .groove import Groove
+    from .subscriptions import Subscriptions
+    Note = Tuple[int, float, float, float, bool]
+    Indices = Sequence[int]
+
+#: Shortest note length and nudge/gate step (1/32 beat).
+MIN_LENGTH = 0.03125
+
+NOTE_COLUMNS = ('pitch', 'start', 'length', 'velocity', 'mute')
+
+#: Note columns plus the note ids, -1 for notes not yet in the clip.
+COLUMNS = NOTE_COLUMNS + ('ids',)
+
+_TYPECODES = dict(pitch='i', start='d', length='d', velocity='d', mute='b', ids='l')
+
+
+def _column(name, values=()):
+    # type: (Text, Iterable[Any]) -> Any
+    if np is not None:
+        return np.array(values, dtype=_TYPECODES[name])
+    return array(str(_TYPECODES[name]), values)
+
+
+def _column_property(index):
+    # type: (int) -> Any
+    return property(lambda self: self._to_columns()[index])
+
+
+class NoteBuffer(object):
+    '''Notes of a clip, as Live note tuples or as parallel columns:
+    pitch, start, length, velocity and mute.
+
+    Notes are read and written as tuples, so transforms of each note on
+    its own (pitch, position, velocity...) just rebuild the tuples of
+    the notes they change. Transforms that relate the notes to each
+    other (combine, dedupe, legato...) and the interval index run over
+    whole columns, ``array`` buffers or NumPy arrays if available,
+    which are only built for them (by accessing a column). Transforms
+    take the indices of the notes to operate on, as returned by
+    `select`. Those that can fail (out of range results) return False
+    and leave the notes unchanged.
+
+    Notes read by id keep it in `ids`, along with the ids of the notes
+    deleted in `removed`. `region` is the (note range, position range)
+    the notes were read from, if not the whole clip, and `source` is
+    any data the reader needs to write them back.
+    '''
+    __slots__ = ('_rows', '_row_ids', '_cols', 'removed', 'region', 'source', '_index',
+                 '_queries')
+
+    def __init__(self, notes=(), ids=None):
+        # type: (Iterable[Note], Optional[Iterable[int]]) -> None
+        self._rows = list(notes)  # type: Optional[List[Note]]
+        self._row_ids = ([-1] * len(self._rows) if ids is None
+                         else list(ids))  # type: Optional[List[int]]
+        self._cols = None  # type: Optional[List[Any]]
+        self.removed = []  # type: List[int]
+        self.region = None  # type: Optional[Tuple[Tuple[int, int], Tuple[float, float]]]
+        self.source = None  # type: Any
+        self._index = None  # type: Optional[IntervalIndex]
+        self._queries = 0
+
+    @classmethod
+    def from_notes(cls, notes, ids=None):
+        # type: (Iterable[Note], Optional[Iterable[int]]) -> NoteBuffer
+        '''Creates a buffer from Live note tuples.'''
+        return cls(notes, ids)
+
+    def _to_rows(self):
+        # type: () -> List[Note]
+        if self._rows is None:
+            ids = self._cols[-1]
+            self._rows = list(self.to_notes())
+            self._row_ids = ids.tolist() if np is not None else list(ids)
+            self._cols = None
+        return self._rows
+
+    def _to_columns(self):
+        # type: () -> List[Any]
+        if self._cols is None:
+            values = list(zip(*self._rows)) if self._rows else [()] * len(NOTE_COLUMNS)
+            values.append(self._row_ids)
+            self._cols = [_column(name, v) for name, v in zip(COLUMNS, values)]
+            self._rows = self._row_ids = None
+        return self._cols
+
+    pitch = _column_property(0)
+    start = _column_property(1)
+    length = _column_property(2)
+    velocity = _column_property(3)
+    mute = _column_property(4)
+
+    @property
+    def ids(self):
+        # type: () -> Sequence[int]
+        '''Ids of the notes, -1 for notes not yet in the clip.'''
+        return self._row_ids if self._rows is not None else self._cols[-1]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._rows if self._rows is not None else self._cols[0])
+
+    def covers(self, note_range, pos_range):
+        # type: (Tuple[int, int], Tuple[float, float]) -> bool
+        '''Whether the notes were read from a region including the
+        given one.
+        '''
+        if self.region is None:
+            return True
+        (lo, hi), (start, end) = self.region
+        return (lo <= note_range[0] and note_range[1] <= hi
+                and start <= pos_range[0] and pos_range[1] <= end)
+
+    def in_region(self):
+        # type: () -> bool
+        '''Whether all the notes are still within the region they were
+        read from.
+        '''
+        if self.region is None:
+            return True
+        (lo, hi), (start, end) = self.region
+        if self._rows is not None:
+            return all(lo <= n[0] < hi and start <= n[1] < end for n in self._rows)
+        pitch, starts = self._cols[:2]
+        if np is not None:
+            return bool(((pitch >= lo) & (pitch < hi)
+                         & (starts >= start) & (starts < end)).all())
+        return all(lo <= p < hi and start <= s < end for p, s in zip(pitch, starts))
+
+    def to_notes(self, indices=None):
+        # type: (Optional[Indices]) -> Tuple[Note, ...]
+        '''Returns the notes (all by default) as Live note tuples.'''
+        if self._rows is not None:
+            if indices is None:
+                return tuple(self._rows)
+            return tuple(self._rows[i] for i in indices)
+        cols = self._cols[:len(NOTE_COLUMNS)]
+        if indices is not None:
+            if np is not None:
+                cols = [c[indices] for c in cols]
+            else:
+                cols = [[c[i] for i in indices] for c in cols]
+        pitch, start, length, velocity, mute = cols
+        if np is not None:
+            return tuple(zip(pitch.tolist(), start.tolist(), length.tolist(),
+                             velocity.tolist(), mute.astype(bool).tolist()))
+        return tuple(zip(pitch, start, length, velocity, [m != 0 for m in mute]))
+
+    @property
+    def index(self):
+        # type: () -> IntervalIndex
+        '''Interval index of the notes, built on first use and dropped
+        whenever the notes are moved, resized, added or deleted.
+        '''
+        if self._index is None:
+            if self._rows is not None:
+                start = _column('start', [n[1] for n in self._rows])
+                length = _column('length', [n[2] for n in self._rows])
+            else:
+                start, length = self._cols[1:3]
+            self._index = IntervalIndex(start, length)
+        return self._index
+
+    def select(self, note_range=(0, 128), pos_range=None):
+        # type: (Tuple[int, int], Optional[Tuple[float, float]]) -> Indices
+        '''Returns the indices of the notes within the pitch range and,
+        if given, the position range (both as [start, end)).
+
+        From the second position query on the same notes, the interval
+        index is used instead of scanning them all (a single scan is
+        faster than building the index).
+        '''
+        lo, hi = note_range
+        if pos_range is not None:
+            self._queries += 1
+            if self._index is not None or self._queries > 1:
+                return self._in_pitch_range(self.index.starting(*pos_range), lo, hi)
+        if self._rows is not None:
+            rows = self._rows
+            if pos_range is None:
+                return [i for i, n in enumerate(rows) if lo <= n[0] < hi]
+            start, end = pos_range
+            return [i for i, n in enumerate(rows) if lo <= n[0] < hi and start <= n[1] < end]
+        pitch, starts = self._cols[:2]
+        if np is not None:
+            mask = (pitch >= lo) & (pitch < hi)
+            if pos_range is not None:
+                mask &= (starts >= pos_range[0]) & (starts < pos_range[1])
+            return np.flatnonzero(mask)
+        if pos_range is None:
+            return [i for i, p in enumerate(pitch) if lo <= p < hi]
+        start, end = pos_range
+        return [i for i, (p, s) in enumerate(zip(pitch, starts))
+                if lo <= p < hi and start <= s < end]
+
+    def sounding(self, position, note_range=(0, 128)):
+        # type: (float, Tuple[int, int]) -> Indices
+        '''Returns the indices of the notes within the pitch range that
+        are sounding at the position.
+        '''
+        return self._in_pitch_range(self.index.sounding(position), *note_range)
+
+    def _in_pitch_range(self, indices, lo, hi):
+        # type: (Indices, int, int) -> Indices
+        if self._rows is not None:
+            rows = self._rows
+            return [i for i in indices if lo <= rows[i][0] < hi]
+        pitch = self._cols[0]
+        if np is not None:
+            values = pitch[indices]
+            return indices[(values >= lo) & (values < hi)]
+        return [i for i in indices if lo <= pitch[i] < hi]
+
+    def _ids(self, indices):
+        # type: (Indices) -> Any
+        if np is not None:
+            return np.asarray(indices, dtype=np.intp)
+        return indices
+
+    def _add(self, column, indices, delta, lo, hi):
+        # type: (int, Indices, float, float, float) -> bool
+        '''Adds `delta` to the column (by position in the note tuples)
+        of the notes if all the results are within [lo, hi].
+        '''
+        rows = self._to_rows()
+        values = [rows[i][column] + delta for i in indices]
+        if any(v < lo or v > hi for v in values):
+            return False
+        self._set(column, indices, values)
+        return True
+
+    def _set(self, column, indices, values):
+        # type: (int, Indices, Sequence[Any]) -> None
+        '''Sets the column (by position in the note tuples, but mute) of
+        the notes to the values.
+        '''
+        rows = self._to_rows()
+        # unpacking the tuples is way faster than slicing them
+        if column == 0:
+            for i, x in zip(indices, values):
+                p, s, l, v, m = rows[i]
+                rows[i] = (x, s, l, v, m)
+        elif column == 1:
+            for i, x in zip(indices, values):
+                p, s, l, v, m = rows[i]
+                rows[i] = (p, x, l, v, m)
+        elif column == 2:
+            for i, x in zip(indices, values):
+                p, s, l, v, m = rows[i]
+                rows[i] = (p, s, x, v, m)
+        else:
+            for i, x in zip(indices, values):
+                p, s, l, v, m = rows[i]
+                rows[i] = (p, s, l, x, m)
+
+# region TRANSFORMS
+    def set_mute(self, indices, mute=None):
+        # type: (Indices, Optional[bool]) -> None
+        '''Mutes or unmutes the notes, or toggles them if `mute` is
+        None.
+        '''
+        rows = self._to_rows()
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            rows[i] = (p, s, l, v, not m if mute is None else mute)
+
+    def transpose(self, indices, semitones):
+        # type: (Indices, int) -> bool
+        return self._add(0, indices, semitones, 0, 127)
+
+    def invert(self, indices):
+        # type: (Indices) -> None
+        '''Inverts the pitch of the notes around the middle of the MIDI
+        range.
+        '''
+        rows = self._to_rows()
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            rows[i] = (127 - p, s, l, v, m)
+
+    def reverse(self, indices, loop_start, loop_end):
+        # type: (Indices, float, float) -> None
+        '''Mirrors the position of the notes within the loop.'''
+        self._index = None
+        rows = self._to_rows()
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            rows[i] = (p, abs(loop_end + loop_start - (s + l)), l, v, m)
+
+    def scale(self, indices, factor):
+        # type: (Indices, float) -> None
+        '''Multiplies the position and length of the notes (e.g. 0.5 to
+        compress or 2 to expand).
+        '''
+        self._index = None
+        rows = self._to_rows()
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            rows[i] = (p, s * factor, l * factor, v, m)
+
+    def gate(self, indices, delta, loop_end):
+        # type: (Indices, float, float) -> bool
+        '''Adds `delta` to the length of the notes, unless any of them
+        gets shorter than `MIN_LENGTH` or ends after the loop end.
+        '''
+        rows = self._to_rows()
+        length = [rows[i][2] + delta for i in indices]
+        if any(l < MIN_LENGTH or rows[i][1] + l > loop_end
+               for i, l in zip(indices, length)):
+            return False
+        self._index = None
+        self._set(2, indices, length)
+        return True
+
+    def nudge(self, indices, delta, loop_end):
+        # type: (Indices, float, float) -> bool
+        '''Adds `delta` to the position of the notes, unless any of them
+        gets before 0 or ends after the loop end.
+        '''
+        rows = self._to_rows()
+        start = [rows[i][1] + delta for i in indices]
+        if any(s < 0 or s + rows[i][2] > loop_end for i, s in zip(indices, start)):
+            return False
+        self._index = None
+        self._set(1, indices, start)
+        return True
+
+    def shuffle(self, indices, column):
+        # type: (Indices, Text) -> None
+        '''Shuffles the values of a column among the notes.'''
+        self._index = None
+        rows = self._to_rows()
+        column = NOTE_COLUMNS.index(column)
+        values = [rows[i][column] for i in indices]
+        random.shuffle(values)
+        self._set(column, indices, values)
+
+    def set_velocity(self, indices, velocity):
+        # type: (Indices, float) -> None
+        self._set(3, indices, [velocity] * len(indices))
+
+    def offset_velocity(self, indices, delta):
+        # type: (Indices, float) -> bool
+        return self._add(3, indices, delta, 0, 127)
+
+    def randomize_velocity(self, indices, lo=1, hi=127):
+        # type: (Indices, int, int) -> None
+        '''Sets random velocities within [lo, hi].'''
+        self._set(3, indices, [random.randint(lo, hi) for _ in indices])
+
+    def ramp_velocity(self, indices, descending=False):
+        # type: (Indices, bool) -> None
+        '''Applies a crescendo (or decrescendo) to the notes. Notes at
+        the same position get the same velocity.
+        '''
+        start, velocity = self.start, self.velocity
+        if np is not None:
+            ids = self._ids(indices)
+            if not len(ids):
+                return
+            positions, rank = np.unique(start[ids], return_inverse=True)
+            steps = len(positions)
+            rank = steps - rank if descending else rank + 1
+            velocity[ids] = 128.0 / steps * rank - 1
+            return
+        positions = sorted(set(start[i] for i in indices), reverse=descending)
+        if not positions:
+            return
+        step = 128.0 / len(positions)
+        rank = dict((p, r) for r, p in enumerate(positions, 1))
+        for i in indices:
+            velocity[i] = step * rank[start[i]] - 1
+
+    def quantize(self, indices, groove, strength=1.0):
+        # type: (Indices, Groove, float) -> None
+        '''Moves the notes towards the nearest slot of the groove grid
+        (plus the slot offset) by `strength` (0 to 1), and scales their
+        velocity by the slot factor, also by `strength`.
+        '''
+        self._index = None
+        grid = groove.grid
+        slots = len(groove.offsets)
+        if np is not None:
+            starts, velocity = self.start, self.velocity
+            ids = self._ids(indices)
+            start = starts[ids]
+            steps = np.round(start / grid)
+            slot = steps.astype(np.intp) % slots
+            target = steps * grid + np.asarray(groove.offsets)[slot]
+            starts[ids] = np.maximum(start + (target - start) * strength, 0.0)
+            factor = 1.0 + (np.asarray(groove.velocities)[slot] - 1.0) * strength
+            velocity[ids] = np.clip(velocity[ids] * factor, 1, 127)
+            return
+        rows = self._to_rows()
+        offsets, velocities = groove.offsets, groove.velocities
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            steps = round(s / grid)
+            slot = int(steps) % slots
+            target = steps * grid + offsets[slot]
+            factor = 1.0 + (velocities[slot] - 1.0) * strength
+            rows[i] = (p, max(s + (target - s) * strength, 0.0), l,
+                       min(max(v * factor, 1), 127), m)
+
+    def humanize(self, indices, timing, velocity, seed=None):
+        # type: (Indices, float, float, Optional[int]) -> None
+        '''Moves the notes randomly up to `timing` beats and changes their
+        velocity up to `velocity`, either way. The same `seed` gives the
+        same result (with the same NumPy availability).
+        '''
+        self._index = None
+        if np is not None:
+            start, velocities = self.start, self.velocity
+            ids = self._ids(indices)
+            rnd = np.random.RandomState(seed)
+            start[ids] = np.maximum(start[ids] + rnd.uniform(-timing, timing, len(ids)), 0.0)
+            velocities[ids] = np.clip(
+                velocities[ids] + rnd.uniform(-velocity, velocity, len(ids)), 1, 127)
+            return
+        rows = self._to_rows()
+        uniform = random.Random(seed).uniform
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            rows[i] = (p, max(s + uniform(-timing, timing), 0.0), l,
+                       min(max(v + uniform(-velocity, velocity), 1), 127), m)
+# endregion
+
+# region STRUCTURAL TRANSFORMS
+    def append(self, notes):
+        # type: (Iterable[Note]) -> None
+        '''Appends new notes, as Live note tuples.'''
+        self._index = None
+        rows = self._to_rows()
+        size = len(rows)
+        rows.extend(notes)
+        self._row_ids.extend([-1] * (len(rows) - size))
+
+    def delete(self, indices):
+        # type: (Indices) -> None
+        '''Removes the notes.'''
+        self._index = None
+        if self._rows is None and np is not None:
+            ids = self._ids(indices)
+            self.removed.extend(i for i in self._cols[-1][ids].tolist() if i >= 0)
+            self._cols = [np.delete(c, ids) for c in self._cols]
+            return
+        removed = set(indices)
+        if not removed:
+            return
+        note_ids = self.ids
+        self.removed.extend(note_ids[i] for i in sorted(removed) if note_ids[i] >= 0)
+        keep = [i for i in range(len(self)) if i not in removed]
+        if self._rows is not None:
+            rows = self._rows
+            self._rows = [rows[i] for i in keep]
+            self._row_ids = [note_ids[i] for i in keep]
+        else:
+            self._cols = [_column(name, [c[i] for i in keep])
+                          for name, c in zip(COLUMNS, self._cols)]
+
+    def split(self, indices):
+        # type: (Indices) -> bool
+        '''Splits the notes into 2 equal parts, unless any part would be
+        shorter than `MIN_LENGTH`.
+        '''
+        rows = self._to_rows()
+        if any(rows[i][2] / 2 < MIN_LENGTH for i in indices):
+            return False
+        added = []
+        for i in indices:
+            p, s, l, v, m = rows[i]
+            half = l / 2
+            rows[i] = (p, s, half, v, m)
+            added.append((p, s + half, half, v, m))
+        self.append(added)
+        return True
+
+    def sort_by_pitch(self, indices):
+        # type: (Indices) -> Indices
+        '''Returns the indices sorted by pitch and position (and index,
+        for notes at the same pitch and position).
+        '''
+        pitch, start = self.pitch, self.start
+        if np is not None:
+            ids = self._ids(indices)
+            return ids[np.lexsort((ids, start[ids], pitch[ids]))]
+        return sorted(indices, key=lambda i: (pitch[i], start[i], i))
+
+    def combine(self, indices):
+        # type: (Indices) -> None
+        '''Combines each pair of consecutive notes of the same pitch
+        where the second starts at the end of the first.
+        '''
+        self._index = None
+        ids = self.sort_by_pitch(indices)
+        if len(ids) < 2:
+            return
+        pitch, start, length = self.pitch, self.start, self.length
+        if np is not None:
+            first, second = ids[:-1], ids[1:]
+            joined = ((pitch[first] == pitch[second])
+                      & (start[first] + length[first] == start[second]))
+            # in a run of joinable notes, only every other note is
+            # joined with the next one, as pairs don't overlap
+            pos = np.arange(len(joined))
+            run_start = np.maximum.accumulate(np.where(joined, 0, pos + 1))
+            joined &= (pos - run_start) % 2 == 0
+            length[first[joined]] += length[second[joined]]
+            self.delete(second[joined])
+            return
+        removed = []
+        prev = None
+        for i in ids:
+            if (prev is not None and pitch[prev] == pitch[i]
+                    and start[prev] + length[prev] == start[i]):
+                length[prev] += length[i]
+                removed.append(i)
+                prev = None
+            else:
+                prev = i
+        self.delete(removed)
+
+    def dedupe(self, indices):
+        # type: (Indices) -> None
+        '''Removes the notes with the same pitch and position as a
+        previous one.
+        '''
+        ids = self.sort_by_pitch(indices)
+        if len(ids) < 2:
+            return
+        pitch, start = self.pitch, self.start
+        if np is not None:
+            first, second = ids[:-1], ids[1:]
+            dupes = (pitch[first] == pitch[second]) & (start[first] == start[second])
+            self.delete(second[dupes])
+            return
+        self.delete([i for prev, i in zip(ids, ids[1:])
+                     if pitch[prev] == pitch[i] and start[prev] == start[i]])
+
+    def legato(self, indices, loop_end):
+        # type: (Indices, float) -> None
+        '''Extends each note up to the start of the next position with
+        notes, and those at the last position up to the loop end.
+        '''
+        self._index = None
+        starts, lengths = self.start, self.length
+        if np is not None:
+            ids = self._ids(indices)
+            if not len(ids):
+                return
+            start = starts[ids]
+            positions = np.unique(start)
+            following = np.append(positions, max(loop_end, positions[-1]))
+            length = following[np.searchsorted(positions, start, 'right')] - start
+            lengths[ids] = np.where(length > 0, length, lengths[ids])
+            return
+        positions = sorted(set(starts[i] for i in indices))
+        following = dict(zip(positions, positions[1:] + [loop_end]))
+        for i in indices:
+            length = following[starts[i]] - starts[i]
+            if length > 0:
+                lengths[i] = length
+# endregion
+
+
+class IntervalIndex(object):
+    '''Notes sorted by start, along with the running maximum of their
+    ends, to get the notes starting within a range or sounding at a
+    position with a binary search.
+    '''
+    __slots__ = ('order', 'starts', 'ends', 'max_ends')
+
+    def __init__(self, start, length):
+        # type: (Sequence[float], Sequence[float]) -> None
+        if np is not None:
+            self.order = np.argsort(start, kind='stable')
+            self.starts = start[self.order]
+            self.ends = self.starts + length[self.order]
+            self.max_ends = np.maximum.accumulate(self.ends)
+            return
+        self.order = sorted(range(len(start)), key=start.__getitem__)
+        self.starts = array(str('d'), (start[i] for i in self.order))
+        self.ends = array(str('d'), (start[i] + length[i] for i in self.order))
+        self.max_ends = array(str('d'), self.ends)
+        for k in range(1, len(self.max_ends)):
+            if self.max_ends[k] < self.max_ends[k - 1]:
+                self.max_ends[k] = self.max_ends[k - 1]
+
+    def starting(self, start, end):
+        # type: (float, float) -> Indices
+        '''Indices of the notes starting within [start, end).'''
+        if np is not None:
+            first, last = np.searchsorted(self.starts, (start, end))
+            return self.order[first:last]
+        return self.order[bisect_left(self.starts, start):bisect_left(self.starts, end)]
+
+    def sounding(self, position):
+        # type: (float) -> Indices
+        '''Indices of the notes sounding at the position.'''
+        # notes before `first` end before the position and those from
+        # `last` start after it
+        if np is not None:
+            first = np.searchsorted(self.max_ends, position, 'right')
+            last = np.searchsorted(self.starts, position, 'right')
+            return self.order[first:last][self.ends[first:last] > position]
+        first = bisect_right(self.max_ends, position)
+        last = bisect_right(self.starts, position)
+        return [self.order[k] for k in range(first, last) if self.ends[k] > position]
+
+
+class ClipNotesCache(object):
+    '''Notes read from clips, each kept (along with its interval index)
+    until the clip notes change.
+    '''
+    def __init__(self, subscriptions):
+        # type: (Subscriptions) -> None
+        self._subscriptions = subscriptions
+        self._notes = dict()  # type: Dict[Clip, NoteBuffer]
+        # clips listened to
+        self._clips = set()  # type: Set[Clip]
+
+    def get(self, clip, note_range, pos_range):
+        # type: (Clip, Tuple[int, int], Tuple[float, float]) -> Optional[NoteBuffer]
+        '''Returns the notes of the clip if read from a region including
+        the given one.
+        '''
+        notes = self._notes.get(clip)
+        if notes is not None and notes.covers(note_range, pos_range):
+            return notes
+        return None
+
+    def add(self, clip, notes):
+        # type: (Clip, NoteBuffer) -> None
+        if clip not in self._clips:
+            self._clips.add(clip)
+            self._subscriptions.subscribe(clip, 'notes', lambda: self._notes.pop(clip, None),
+                                          self)
+        self._notes[clip] = notes
+
+    def discard(self, clip):
+        # type: (Clip) -> None
+        self._notes.pop(clip, None)
+
+    def clear(self):
+        # type: () -> None
+        self._subscriptions.unsubscribe(self)
+        self._notes = dict()
+        self._clips = set()
+
+
+class SelectionNotesIO(object):
+    '''Reads and writes the notes of a clip by selecting all of them,
+    the only way before Live 11.
+    '''
+    @staticmethod
+    def read(clip, note_range=None, pos_range=None):
+        # type: (Clip, Any, Any) -> NoteBuffer
+        '''Returns all the notes of the clip, whatever the region.'''
+        clip.select_all_notes()
+        notes = NoteBuffer.from_notes(clip.get_selected_notes())
+        clip.deselect_all_notes()
+        return notes
+
+    @staticmethod
+    def write(clip, notes):
+        # type: (Clip, NoteBuffer) -> None
+        '''Replaces all the notes of the clip.'''
+        clip.select_all_notes()
+        clip.replace_selected_notes(notes.to_notes())
+        clip.deselect_all_notes()
+
+
+class ExtendedNotesIO(object):
+    '''Reads the notes of a region of the clip and writes back only
+    those, by note id, using the extended notes API of Live 11.
+    '''
+    @staticmethod
+    def read(clip, note_range=(0, 128), pos_range=None):
+        # type: (Clip, Tuple[int, int], Optional[Tuple[float, float]]) -> NoteBuffer
+        pos_range = pos_range or (clip.loop_start, clip.loop_end)
+        source = clip.get_notes_extended(note_range[0], note_range[1] - note_range[0],
+                                         pos_range[0], pos_range[1] - pos_range[0])
+        notes = NoteBuffer([(n.pitch, n.start_time, n.duration, n.velocity, n.mute)
+                            for n in source],
+                           [n.note_id for n in source])
+        notes.region = (tuple(note_range), tuple(pos_range))
+        notes.source = source
+        return notes
+
+    @staticmethod
+    def write(clip, notes):
+        # type: (Clip, NoteBuffer) -> None
+        '''Modifies the notes read, removes the deleted ones and adds
+        the new ones.
+        '''
+        from Live.Clip import MidiNoteSpecification
+
+        by_id = dict((n.note_id, n) for n in notes.source)
+        added = []
+        for (pitch, start, length, velocity, mute), id_ in zip(notes.to_notes(), notes.ids):
+            if id_ >= 0:
+                note = by_id[id_]
+                note.pitch = int(pitch)
+                note.start_time = float(start)
+                note.duration = float(length)
+                note.velocity = float(velocity)
+                note.mute = bool(mute)
+            else:
+                added.append(MidiNoteSpecification(pitch=int(pitch),
+                                                   start_time=float(start),
+                                                   duration=float(length),
+                                                   velocity=float(velocity),
+                                                   mute=bool(mute)))
+        if by_id:
+            clip.apply_note_modifications(notes.source)
+        if notes.removed:
+            clip.remove_notes_by_id(tuple(notes.removed))
+        if added:
+            clip.add_new_notes(tuple(added))
@@ -6,11 +6,11 @@
 
 from __future__ import absolute_import, unicode_literals
 from typing import TYPE_CHECKING
-from builtins import dict
+from builtins import dict, range, str
 import re
 
 if TYPE_CHECKING:
-    from typing import Text
+    from typing import Dict, Optional, Text, Tuple
 
 
 NOTE = dict([
@@ -30,30 +30,39 @@
 
 OCTAVE = ('-2', '-1', '0', '1', '2', '3', '4', '5', '6', '7', '8')
 
-NOTE_INDEX = dict((v, k) for k, v in NOTE.items())  # returns sharp notes
-VALUE_PTRN = r'(\d|[1-9]\d|1[0-1]\d|12[0-7])'
-PITCH_PTRN = '({})({})'.format('|'.join(NOTE), '|'.join(OCTAVE))
-PITCH = re.compile(PITCH_PTRN, re.I)
-RANGE = re.compile(r'{0}\-{0}'.format('({}|{})'.format(PITCH_PTRN, VALUE_PTRN)), re.I)
+#: Note name (sharp) and octave of each pitch.
+NAMES = tuple((k, int(OCTAVE[v // 12]))
+              for v in range(128)
+              for k, n in NOTE.items() if n == v % 12 and 'b' not in k)
+
+#: Pitch of each valid spelling (upper-cased), e.g. 'C#3', 'DB3' or '61'.
+PITCHES = dict(('{}{}'.format(k, o).upper(), n + i * 12)
+               for k, n in NOTE.items()
+               for i, o in enumerate(OCTAVE)
+               if n + i * 12 < 128)
+PITCHES.update((str(v), v) for v in range(128))
+
+PITCH = re.compile('({})({})'.format('|'.join(NOTE), '|'.join(OCTAVE)), re.I)
+
+_ranges = dict()  # type: Dict[Text, Optional[Tuple[int, int]]]
 
 
 def parse_pitch(string):
-    # type: (Text) -> (Text, Text)
+    # type: (Text) -> int
+    '''Returns the pitch of a note name (e.g. 'C3') or number.'''
     try:
-        name, octave = PITCH.match(string).groups()
-        name = name.upper()
-        value = NOTE[name] + OCTAVE.index(octave) * 12
-        return name, int(octave), value
-    except AttributeError:
+        return PITCHES[string.strip().upper()]
+    except KeyError:
         raise ValueError(string)
 
 
 def pitch_note(pitch):
-    # type: (int) -> (Text, int)
-    return NOTE_INDEX[pitch  % 12], int(OCTAVE[pitch // 12])
+    # type: (int) -> Tuple[Text, int]
+    return NAMES[pitch]
 
 
 def first_note(string):
+    # type: (Text) -> Text
     try:
         return PITCH.search(string).group(0)
     except AttributeError:
@@ -61,15 +70,25 @@ def first_note(string):
 
 
 def parse_range(string):
+    # type: (Text) -> Tuple[int, int]
+    '''Returns the first and last pitches of a range, e.g. 'C3-G3',
+    'C-1-C1' or '60-67'. Results are cached.
+    '''
     try:
-        _, n1, o1, v1, _, n2, o2, v2 = RANGE.match(string).groups()
-        note1 = v1 if v1 else n1 + o1
-        note2 = v2 if v2 else n2 + o2
-        return note1, note2
-    except Exception:
+        result = _ranges[string]
+    except KeyError:
+        result = None
+        key = string.strip().upper()
+        pos = key.find('-', 1)
+        while pos != -1:
+            if key[:pos] in PITCHES and key[pos + 1:] in PITCHES:
+                result = PITCHES[key[:pos]], PITCHES[key[pos + 1:]]
+                break
+            pos = key.find('-', pos + 1)
+        _ranges[string] = result
+    if result is None:
         raise ValueError("Note range not found in '{}'".format(string))
+    return result
 
 
 __all__ = ['parse_pitch', 'pitch_note', 'first_note', 'parse_range']
-
-del (NOTE, OCTAVE, NOTE_INDEX, VALUE_PTRN, PITCH_PTRN, PITCH, RANGE)
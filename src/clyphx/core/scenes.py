@@ -0,0 +1,110 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Optional, Text, Tuple
+    from .live import ClipSlot, Scene
+    from .subscriptions import Subscriptions
+
+
+class SceneIndex(object):
+    '''Index of the scenes of the song, of the selected one, of the
+    last one triggered, of their (upper-cased) names and of their slots
+    that can be fired.
+
+    It's updated by the control surface when the track list, the scene
+    list or the selected scene change, before notifying its components.
+    '''
+    def __init__(self, song, subscriptions):
+        # type: (Any, Subscriptions) -> None
+        self._song = song
+        self._subscriptions = subscriptions
+        self.scenes = ()  # type: Tuple[Scene, ...]
+        self.selected = 0
+        self.triggered = -1
+        self._indexes = dict()  # type: Dict[Scene, int]
+        self._names = None  # type: Optional[Dict[Text, int]]
+        self._slots = dict()  # type: Dict[int, Tuple[ClipSlot, ...]]
+        self.update_scenes()
+
+    def disconnect(self):
+        # type: () -> None
+        self._subscriptions.unsubscribe(self)
+        self.scenes = ()
+
+    def update_scenes(self):
+        # type: () -> None
+        self.disconnect()
+        self.scenes = tuple(self._song.scenes)
+        self._indexes = dict((s, i) for i, s in enumerate(self.scenes))
+        for i, scene in enumerate(self.scenes):
+            self._subscriptions.subscribe(scene, 'name', self._on_name_changed, self)
+            self._subscriptions.subscribe(scene, 'is_triggered', self._trigger_listener(i),
+                                          self)
+        self._names = None
+        self._slots = dict()
+        self.update_selected(rebuild=False)
+        if not 0 <= self.triggered < len(self.scenes):
+            self.triggered = self.selected
+
+    def update_tracks(self):
+        # type: () -> None
+        self._slots = dict()
+
+    def _trigger_listener(self, index):
+        # type: (int) -> Callable[[], None]
+        def on_is_triggered_changed():
+            self.triggered = index
+        return on_is_triggered_changed
+
+    def _on_name_changed(self):
+        # type: () -> None
+        self._names = None
+
+    def update_selected(self, rebuild=True):
+        # type: (bool) -> None
+        '''Updates the index of the selected scene. A scene not indexed
+        yet, e.g. inserted and selected before the scene list listener
+        is called, rebuilds the index.
+        '''
+        scene = self._song.view.selected_scene
+        if scene not in self._indexes and rebuild:
+            self.update_scenes()
+            return
+        self.selected = self._indexes.get(scene, 0)
+
+    def index(self, scene):
+        # type: (Scene) -> int
+        '''Returns the index of the scene, or -1 if not in the song.'''
+        return self._indexes.get(scene, -1)
+
+    def by_name(self, name):
+        # type: (Text) -> int
+        '''Returns the index of the first scene with the (upper-cased)
+        name, or -1.
+        '''
+        if self._names is None:
+            self._names = dict()
+            for i, scene in enumerate(self.scenes):
+                self._names.setdefault(scene.name.upper(), i)
+        return self._names.get(name, -1)
+
+    def fireable_slots(self, index):
+        # type: (int) -> Tuple[ClipSlot, ...]
+        '''Returns the clip slots of the scene in tracks that aren't
+        groups.
+        '''
+        try:
+            return self._slots[index]
+        except KeyError:
+            slots = self._slots[index] = tuple(
+                t.clip_slots[index] for t in self._song.tracks if not t.is_foldable
+            )
+            return slots
@@ -0,0 +1,126 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+from __future__ import absolute_import, unicode_literals
+from builtins import object, dict, list
+from typing import TYPE_CHECKING, NamedTuple, Any, Callable, Text
+import logging
+
+if TYPE_CHECKING:
+    from typing import Dict, Hashable, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+
+# Handle of a listener added to a Live object (or any subject with
+# `add_<event>_listener` methods).
+Subscription = NamedTuple('Subscription', [('subject',  Any),
+                                           ('event',    Text),
+                                           ('callback', Callable[[], None])])
+
+
+class Subscriptions(object):
+    '''Registry of the listeners added to subjects by their owners (the
+    components), so every listener added is removed with the same
+    callback, and all the ones of an owner, or of a group of them, can
+    be removed at once.
+
+    Listeners already added are not added again, so setting up things
+    again without removing them first doesn't pile up callbacks.
+    '''
+    def __init__(self):
+        # type: () -> None
+        # handle -> (owner, group)
+        self._owners = dict()  # type: Dict[Subscription, Tuple[Hashable, Optional[Text]]]
+        self._handles = dict()  # type: Dict[Hashable, Set[Subscription]]
+
+    def subscribe(self, subject, event, callback, owner=None, group=None):
+        # type: (Any, Text, Callable[[], None], Optional[Hashable], Optional[Text]) -> Subscription
+        '''Adds the callback as listener of the event of the subject,
+        e.g. `subscribe(param, 'value', self.on_value)`, and returns its
+        handle. Owners default to the object of bound methods.
+        '''
+        handle = Subscription(subject, event, callback)
+        if handle in self._owners:
+            return handle
+        if owner is None:
+            owner = getattr(callback, '__self__', None)
+        getattr(subject, 'add_{}_listener'.format(event))(callback)
+        self._owners[handle] = owner, group
+        self._handles.setdefault(owner, set()).add(handle)
+        return handle
+
+    def remove(self, handle):
+        # type: (Subscription) -> None
+        '''Removes the listener of the handle.'''
+        try:
+            owner, _ = self._owners.pop(handle)
+        except KeyError:
+            return
+        handles = self._handles[owner]
+        handles.discard(handle)
+        if not handles:
+            del self._handles[owner]
+        subject, event, callback = handle
+        try:
+            if getattr(subject, '{}_has_listener'.format(event))(callback):
+                getattr(subject, 'remove_{}_listener'.format(event))(callback)
+        except RuntimeError:
+            # subject deleted
+            pass
+
+    def unsubscribe(self, owner, group=None):
+        # type: (Hashable, Optional[Text]) -> int
+        '''Removes the listeners of the owner (only the ones of the group
+        if given), returning how many were removed.
+        '''
+        handles = [h for h in self._handles.get(owner, ())
+                   if group is None or self._owners[h][1] == group]
+        for handle in handles:
+            self.remove(handle)
+        return len(handles)
+
+    def clear(self):
+        # type: () -> None
+        '''Removes all the listeners, logging the owners that had any
+        left, as they should have removed them on disconnect.
+        '''
+        if self._owners:
+            log.debug('Removing leaked listeners:\n%s', self.dump())
+        for handle in list(self._owners):
+            self.remove(handle)
+
+    def count(self, owner=None, subject=None):
+        # type: (Optional[Hashable], Optional[Any]) -> int
+        '''Returns the number of listeners of the owner and/or subject,
+        or of all of them.
+        '''
+        if owner is not None:
+            handles = self._handles.get(owner, ())
+        else:
+            handles = self._owners
+        return sum(1 for h in handles if subject is None or h.subject == subject)
+
+    def counts(self):
+        # type: () -> Tuple[Dict[Text, int], Dict[Text, int]]
+        '''Returns the number of listeners by owner and by event.'''
+        owners = dict()  # type: Dict[Text, int]
+        events = dict()  # type: Dict[Text, int]
+        for handle, (owner, _) in self._owners.items():
+            name = type(owner).__name__
+            owners[name] = owners.get(name, 0) + 1
+            events[handle.event] = events.get(handle.event, 0) + 1
+        return owners, events
+
+    def dump(self):
+        # type: () -> Text
+        '''Returns a summary of the listeners by owner and by event.'''
+        owners, events = self.counts()
+        lines = ['{} listeners'.format(len(self._owners))]
+        for title, counts in (('owner', owners), ('event', events)):
+            for name in sorted(counts, key=counts.get, reverse=True):
+                lines.append('  {} {}: {}'.format(title, name, counts[name]))
+        return '\n'.join(lines)
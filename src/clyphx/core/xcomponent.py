@@ -7,8 +7,9 @@
 from _Framework.SessionComponent import SessionComponent
 
 if TYPE_CHECKING:
-    from typing import Any, Text, Union
+    from typing import Any, Callable, Optional, Text, Union
     from .live import Track
+    from .subscriptions import Subscription
 
 log = logging.getLogger(__name__)
 
@@ -31,9 +32,25 @@ def disconnect(self):
         '''
         log.debug('Disconnecting %s',
                   getattr(self, 'name', 'a {}'.format(self.__class__.name)))
+        self.unsubscribe()
         self._parent = None
         super().disconnect()
 
+    def subscribe(self, subject, event, callback, group=None):
+        # type: (Any, Text, Callable[[], None], Optional[Text]) -> Subscription
+        '''Adds a listener owned by this component, which is removed on
+        disconnect.
+        '''
+        return self._parent.subscriptions.subscribe(subject, event, callback, self, group)
+
+    def unsubscribe(self, group=None):
+        # type: (Optional[Text]) -> None
+        '''Removes the listeners of this component, or only the ones of
+        the group if given.
+        '''
+        if self._parent:
+            self._parent.subscriptions.unsubscribe(self, group)
+
     def on_enabled_changed(self):
         '''Called when this script is enabled/disabled (by calling
         set_enabled on it).
@@ -63,7 +80,7 @@ def sel_track(self, track):
     @property
     def sel_scene(self):
         # type: () -> int
-        return list(self.song().scenes).index(self.song().view.selected_scene)
+        return self._parent.scene_index.selected
 
     @staticmethod
     def do_parameter_adjustment(param, value):
@@ -1,9 +1,8 @@
 from __future__ import absolute_import, unicode_literals
 from typing import TYPE_CHECKING
 
-# TODO: get from .consts.DEVICE_BANKS
-from _Generic.Devices import DEVICE_DICT, DEVICE_BOB_DICT, BANK_NAME_DICT
-from .consts import LIVE_VERSION, DEV_NAME_TRANSLATION
+from .consts import LIVE_VERSION
+from .core.banks import get_bank_table
 
 if TYPE_CHECKING:
     from typing import Union, Optional, List, Tuple, Text
@@ -72,24 +71,21 @@ def get_device_params(format=None, tables=False):
 
     ``B0`` is _Best of Banks_.
     '''
-    devname = lambda dev: DEV_NAME_TRANSLATION.get(dev, dev)
-    devices = [((devname(d), d), b) for d, b in DEVICE_DICT.items()]
-
+    devices = get_bank_table().devices
     banks = list()
 
-    for (name, dev), bank_params in sorted(devices):
+    for dev, info in sorted(devices.items(), key=lambda x: (x[1].name, x[0])):
         if dev.endswith('GroupDevice'):
             # just "Macro n"
             continue
 
         # TODO: check if devices with unnamed banks have only one bank and B1 == B0 (BoB)
-        bank_names = ('Best of Banks',) + BANK_NAME_DICT.get(dev, ('',) * len(bank_params))
+        bank_names = ['Best of Banks'] + info.bank_names
         bank_names = [('B{}'.format(i), b) for i, b in enumerate(bank_names)]
+        bank_params = [[('P{}'.format(i), p) for i, p in enumerate(bank, 1)]
+                       for bank in info.banks]
 
-        bank_params = (DEVICE_BOB_DICT[dev][0],) + bank_params
-        bank_params = [[('P{}'.format(i), p) for i, p in enumerate(bank, 1)] for bank in bank_params]
-
-        banks.append((name, list(zip(bank_names, bank_params))))
+        banks.append((info.name, list(zip(bank_names, bank_params))))
 
     if format and format.lower() in {'md', 'markdown'}:
         return to_markdown(banks, tables=tables)
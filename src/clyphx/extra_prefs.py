@@ -81,21 +81,11 @@ def on_selected_track_changed(self):
         if self._clip_record:
             if track.can_be_armed and not clip_slot.has_clip:
                 self._clip_record_slot = clip_slot
-                if not self._clip_record_slot.has_clip_has_listener(
-                    self.clip_record_slot_changed
-                ):
-                    self._clip_record_slot.add_has_clip_listener(
-                        self.clip_record_slot_changed
-                    )
+                self.subscribe(clip_slot, 'has_clip', self.clip_record_slot_changed)
         if self._midi_clip_length:
             if track.has_midi_input and not clip_slot.has_clip and not track.is_foldable:
                 self._midi_clip_length_slot = clip_slot
-                if not self._midi_clip_length_slot.has_clip_has_listener(
-                    self.midi_clip_length_slot_changed
-                ):
-                    self._midi_clip_length_slot.add_has_clip_listener(
-                        self.midi_clip_length_slot_changed
-                    )
+                self.subscribe(clip_slot, 'has_clip', self.midi_clip_length_slot_changed)
         self._last_track = track
         log.debug('ExtraPrefs.on_selected_track_changed, last track: %r', track)
 
@@ -156,22 +146,8 @@ def do_midi_clip_set_length(self, clip_params):
 
     def remove_listeners(self):
         '''Remove parameter listeners.'''
-        if self._clip_record_slot:
-            if self._clip_record_slot.has_clip_has_listener(
-                self.clip_record_slot_changed
-            ):
-                self._clip_record_slot.remove_has_clip_listener(
-                    self.clip_record_slot_changed
-                )
+        self.unsubscribe()
         self._clip_record_slot = None
-
-        if self._midi_clip_length_slot:
-            if self._midi_clip_length_slot.has_clip_has_listener(
-                self.midi_clip_length_slot_changed
-            ):
-                self._midi_clip_length_slot.remove_has_clip_listener(
-                    self.midi_clip_length_slot_changed
-                )
         self._midi_clip_length_slot = None
 
     def on_selected_scene_changed(self):
@@ -22,8 +22,8 @@
 if TYPE_CHECKING:
     from typing import Any, List, Dict, Text
 
-from _Generic.Devices import (DEVICE_DICT, DEVICE_BOB_DICT, BANK_NAME_DICT)
-from .consts import LIVE_VERSION, DEV_NAME_TRANSLATION
+from .consts import LIVE_VERSION
+from .core.banks import get_bank_table
 from .core.utils import get_user_clyphx_path
 
 log = logging.getLogger(__name__)
@@ -63,11 +63,11 @@ def _get_devices_info(self):
         friendly name, bob parameters and bank names/bank parameters if
         applicable.
         '''
-        return dict((k, dict(name=DEV_NAME_TRANSLATION.get(k, k),
-                             bob=DEVICE_BOB_DICT[k][0],
-                             bank_names=BANK_NAME_DICT.get(k, ()) if len(v) > 1 else (),
-                             banks=v if len(v) > 1 else ()))
-                     for k, v in DEVICE_DICT.items())
+        return dict((k, dict(name=v.name,
+                             bob=v.banks[0],
+                             bank_names=v.bank_names if len(v.banks) > 2 else (),
+                             banks=v.banks[1:] if len(v.banks) > 2 else ()))
+                     for k, v in get_bank_table().devices.items())
 
     def _get_device_index(self, dev_dict):
         '''Returns a sorted device index for quickly navigating the file.
@@ -104,10 +104,9 @@ def _get_device_info(self, info):
         )
 
     def _format_devices_info(self, dev_dict):
-        ## type: (Dict[Text, Dict]) -> List[Text]
-        # FIXME: mypy doesn't like
-        ##return [self._get_device_info(info) for _, info in sorted(dev_dict.items(), key=lambda k, v: v['name'], k)]
-        pass
+        # type: (Dict[Text, Dict[Text, Any]]) -> List[Text]
+        return [self._get_device_info(info)
+                for info in sorted(dev_dict.values(), key=lambda v: v['name'])]
 
     def _create_html_file(self):
         '''Creates an HTML file in the user's home directory.
@@ -19,32 +19,45 @@
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from typing import Any, Iterable, Sequence, List
+    from typing import Any, Iterable, Sequence, List, Dict, Optional, Set, Text, Tuple
     from ..core.live import Device, RackDevice, Track
+    from ..core.subscriptions import Subscription
 
+from ..core.devices import DeviceIndex, walk_devices
 from ..core.xcomponent import XComponent
 
+# subscription group of the listeners of the devices and chains walked
+TREE = 'tree'
+
 
 class Macrobat(XComponent):
     '''Macrobat script component for ClyphX.
     '''
     __module__ = __name__
 
-    def __init__(self, parent):
-        # type: (Any) -> None
+    def __init__(self, parent, settings=None):
+        # type: (Any, Optional[Dict[Text, Any]]) -> None
         super().__init__(parent)
-        self.current_tracks = []  # type: List[Any]
+        self.settings = settings or dict()  # type: Dict[Text, Any]
+        self.current_tracks = dict()  # type: Dict[Track, MacrobatTrackComponent]
 
     def disconnect(self):
-        self.current_tracks = []
+        self.current_tracks = dict()
         super().disconnect()
 
     def setup_tracks(self, track):
         # type: (Track) -> None
         '''Setup component tracks on ini and track list changes.'''
         if track not in self.current_tracks:
-            self.current_tracks.append(track)
-            MacrobatTrackComponent(track, self._parent)
+            self.current_tracks[track] = MacrobatTrackComponent(track, self._parent)
+
+    def get_device_index(self, track):
+        # type: (Track) -> DeviceIndex
+        '''Returns the device index of the track.'''
+        try:
+            return self.current_tracks[track].device_index
+        except KeyError:
+            return DeviceIndex(track)
 
 
 class MacrobatTrackComponent(XComponent):
@@ -56,20 +69,21 @@ def __init__(self, track, parent):
         # type: (Track, Any) -> None
         super().__init__(parent)
         self._track = track
-        self._track.add_devices_listener(self.setup_devices)
-        self._current_devices = []  # type: List[Any]
+        self.subscribe(track, 'devices', self.on_devices_changed)
+        self.device_index = DeviceIndex(track)
+        # rack -> (upper-cased name, Macrobat component or None, key)
+        self._racks = dict()  # type: Dict[RackDevice, Tuple[Text, Any, Optional[Text]]]
+        # devices and chains walked in the last update, and their listeners
+        self._tree = []  # type: List[Any]
+        self._tree_listeners = set()  # type: Set[Subscription]
         self._update_in_progress = False
-        self._has_learn_rack = False
+        self._update_pending = False
         self.setup_devices()
 
     def disconnect(self):
         self.remove_listeners()
-        if self._track:
-            if self._track.devices_has_listener(self.setup_devices):
-                self._track.remove_devices_listener(self.setup_devices)
-            self.remove_devices(self._track.devices)
+        self._tree_listeners = set()
         self._track = None
-        self._current_devices = []
         super().disconnect()
 
     def update(self):
@@ -78,92 +92,133 @@ def update(self):
 
     def reallow_updates(self):
         '''Reallow device updates, used to prevent updates happening in
-        quick succession.
+        quick succession, and apply the changes made meanwhile.
         '''
         self._update_in_progress = False
+        if self._update_pending:
+            self._update_pending = False
+            self.setup_devices()
+
+    def on_devices_changed(self):
+        # type: () -> None
+        if self._track:
+            self._parent.on_track_devices_changed(self._track)
+        self.setup_devices()
 
     def setup_devices(self):
         # type: () -> None
-        '''Get devices on device/chain list and device name changes.'''
-        if self._track and not self._update_in_progress:
-            self._update_in_progress = True
-            self._has_learn_rack = False
-            self.remove_listeners()
-            self.get_devices(self._track.devices)
-            self._parent.schedule_message(5, self.reallow_updates)
+        '''Update Macrobat racks on device/chain list and device name
+        changes.
+        '''
+        self.device_index.invalidate()
+        if not self._track:
+            return
+        if self._update_in_progress:
+            self._update_pending = True
+            return
+        self._update_in_progress = True
+        self.get_devices(self._track.devices)
+        self._parent.schedule_message(5, self.reallow_updates)
 
     def remove_listeners(self):
         '''Disconnect Macrobat rack components.'''
-        for d in self._current_devices:
-            d[0].disconnect()
-        self._current_devices = []
+        for _, component, _ in self._racks.values():
+            if component is not None:
+                component.disconnect()
+        self._racks = dict()
+        self._tree = []
 
     def get_devices(self, dev_list):
         # type: (Iterable[RackDevice]) -> None
-        '''Go through device and chain lists and setup Macrobat racks.
+        '''Go through device and chain lists and reconcile Macrobat
+        racks: setup the racks added, renamed or without component and
+        disconnect the ones removed or renamed, keeping the rest.
         '''
-        for d in dev_list:
-            self.setup_macrobat_rack(d)
-            if not d.name_has_listener(self.setup_devices):
-                d.add_name_listener(self.setup_devices)
-            if self._parent._can_have_nested_devices and d.can_have_chains:
-                if not d.chains_has_listener(self.setup_devices):
-                    d.add_chains_listener(self.setup_devices)
-                for c in d.chains:
-                    if not c.devices_has_listener(self.setup_devices):
-                        c.add_devices_listener(self.setup_devices)
-                    self.get_devices(c.devices)
+        from .parameter_rack_template import MacrobatParameterRackTemplate
+
+        nested = self._parent._can_have_nested_devices
+        racks = dict()  # type: Dict[RackDevice, Tuple[Text, Any, Optional[Text]]]
+        changed = []  # type: List[RackDevice]
+        nodes = list(walk_devices(dev_list, max_depth=None if nested else 0))
+        tree = [node.obj for node in nodes]
+        tree_changed = tree != self._tree
+        listeners = set()  # type: Set[Subscription]
+        for node in nodes:
+            if node.rack is not None:
+                listeners.add(self.subscribe(node.obj, 'devices', self.on_devices_changed, TREE))
+                continue
+            d = node.obj
+            listeners.add(self.subscribe(d, 'name', self.on_devices_changed, TREE))
+            if nested and d.can_have_chains:
+                listeners.add(self.subscribe(d, 'chains', self.on_devices_changed, TREE))
+            if d.class_name.endswith('GroupDevice'):
+                name = d.name.upper()
+                current = self._racks.pop(d, None)
+                # parameter racks map parameters of other devices, so
+                # they're setup again when devices are added or moved,
+                # and racks without component are retried, as their
+                # setup may have been refused because of another rack
+                if current is not None and current[0] == name and current[1] is not None and not (
+                    tree_changed and isinstance(current[1], MacrobatParameterRackTemplate)
+                ):
+                    racks[d] = current
+                else:
+                    if current is not None and current[1] is not None:
+                        current[1].disconnect()
+                    racks[d] = (name, None, None)
+                    changed.append(d)
+
+        self._tree = tree
+        # devices and chains removed
+        for handle in self._tree_listeners - listeners:
+            self._parent.subscriptions.remove(handle)
+        self._tree_listeners = listeners
+        # racks removed
+        for _, component, _ in self._racks.values():
+            if component is not None:
+                component.disconnect()
+        self._racks = racks
+        for rack in changed:
+            self._racks[rack] = (self._racks[rack][0],) + self.setup_macrobat_rack(rack)
 
     def setup_macrobat_rack(self, rack):
-        # type: (RackDevice) -> None
-        '''Setup Macrobat rack if meets criteria.'''
+        # type: (RackDevice) -> Tuple[Any, Optional[Text]]
+        '''Setup Macrobat rack if meets criteria, returning its
+        component and key.
+        '''
         from .consts import MACROBAT_RACKS
 
-        if rack.class_name.endswith('GroupDevice'):
-            name = rack.name.upper()
-            for key, cls in MACROBAT_RACKS.items():
-                if name.startswith(key):
-                    break
-            else:
-                return None
-
-            # checks
-            if key == 'NK TRACK' and self._track.has_midi_output:
-                return None
-            elif (key in ('NK DR MULTI', 'NK CHAIN MIX', 'NK DR', 'NK LEARN')
-                    and not self._parent._can_have_nested_devices):
-                return None
-            elif key == 'NK LEARN':
-                if self._track != self.song().master_track or self._has_learn_rack:
-                    return None
-                self._has_learn_rack = True
-
-            # instances
-            if key == 'NK MIDI':
-                args = self._parent, rack, name
-            elif key in ('NK RST', 'NK RND'):
-                args = self._parent, rack, name, self._track
-            elif key == 'NK SCL':
-                args = self._parent, rack
-            else:
-                # all param racks and push rack
-                args= self._parent, rack, self._track
-
-            self._current_devices.append((cls(*args), rack))
-
-    def remove_devices(self, dev_list):
-        # type: (Iterable[RackDevice]) -> None
-        '''Remove all device listeners.'''
-        for d in dev_list:
-            if d.name_has_listener(self.setup_devices):
-                d.remove_name_listener(self.setup_devices)
-            if self._parent._can_have_nested_devices and d.can_have_chains:
-                if d.chains_has_listener(self.setup_devices):
-                    d.remove_chains_listener(self.setup_devices)
-                for c in d.chains:
-                    if c.devices_has_listener(self.setup_devices):
-                        c.remove_devices_listener(self.setup_devices)
-                    self.remove_devices(c.devices)
+        name = rack.name.upper()
+        for key, cls in MACROBAT_RACKS.items():
+            if name.startswith(key):
+                break
+        else:
+            return None, None
+
+        # checks
+        if key == 'NK TRACK' and self._track.has_midi_output:
+            return None, None
+        elif (key in ('NK DR MULTI', 'NK CHAIN MIX', 'NK DR', 'NK LEARN')
+                and not self._parent._can_have_nested_devices):
+            return None, None
+        elif key == 'NK LEARN':
+            if self._track != self.song().master_track or any(
+                k == key and c is not None for _, c, k in self._racks.values()
+            ):
+                return None, None
+
+        # instances
+        if key == 'NK MIDI':
+            args = self._parent, rack, name
+        elif key in ('NK RST', 'NK RND'):
+            args = self._parent, rack, name, self._track
+        elif key == 'NK SCL':
+            args = self._parent, rack
+        else:
+            # all param racks and push rack
+            args= self._parent, rack, self._track
+
+        return cls(*args), key
 
     def on_selected_track_changed(self):
         self.update()
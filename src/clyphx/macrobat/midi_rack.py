@@ -15,8 +15,9 @@
 # along with ClyphX.  If not, see <https://www.gnu.org/licenses/>.
 
 from __future__ import absolute_import, unicode_literals
-from builtins import super
-from typing import TYPE_CHECKING
+from builtins import super, dict, list
+from typing import TYPE_CHECKING, NamedTuple, Callable, Tuple
+from functools import partial
 import logging
 import re
 
@@ -25,7 +26,7 @@
 
 if TYPE_CHECKING:
     from typing import Optional, Any, Text, List, Dict
-    from ..core.live import Device
+    from ..core.live import Device, DeviceParameter
 
 log = logging.getLogger(__name__)
 
@@ -35,6 +36,30 @@
 RE_CH = re.compile(r'\[ch\s?(\d{1,2})\]', re.I)
 RE_CC = re.compile(r'\[cc\s?(\d{1,3})\]', re.I)
 
+# last value of a macro not sent yet (values are 0-127)
+UNSENT = 0xFF
+
+# SysEx message of an entry of the SysEx list, with the macro value
+# scaled from `low` to `high` (`low + value * scale`) at `offsets`
+SysexTemplate = NamedTuple('SysexTemplate', [('data',    bytearray),
+                                             ('offsets', Tuple[int, ...]),
+                                             ('low',     int),
+                                             ('scale',   float)])
+
+
+def channel_message(status, value):
+    # type: (Tuple[int, ...], int) -> Tuple[int, ...]
+    return status + (value,)
+
+
+def sysex_message(template, value):
+    # type: (SysexTemplate, int) -> Tuple[int, ...]
+    data = bytearray(template.data)
+    byte = int(template.low + template.scale * value)
+    for i in template.offsets:
+        data[i] = byte
+    return tuple(data)
+
 
 class MacrobatMidiRack(XComponent):
     '''Macros To Midi CCs + PCs + SysEx.
@@ -44,19 +69,17 @@ class MacrobatMidiRack(XComponent):
     def __init__(self, parent, rack, name):
         # type: (Any, Device, Text) -> None
         super().__init__(parent)
-        self._macro_to_cc = list()  # type: List[Any]
-        self._macro_to_pc = list()  # type: List[Any]
-        self._macro_to_sysex = list()  # type: List[Any]
-        self._sysex_list = list()  # type: List[Any]
+        # mapped macros and the messages they send by value
+        self._macros = list()  # type: List[DeviceParameter]
+        self._messages = list()  # type: List[Callable[[int], Tuple[int, ...]]]
+        self._last_values = bytearray()
+        self._sysex_list = dict()  # type: Dict[Text, SysexTemplate]
         self.build_sysex_list()
         self.setup_device(rack, name)
 
     def disconnect(self):
         self.remove_macro_listeners()
-        self._macro_to_cc = []
-        self._macro_to_pc = []
-        self._macro_to_sysex = []
-        self._sysex_list = []
+        self._sysex_list = dict()
         super().disconnect()
 
     def setup_device(self, rack, name):
@@ -74,91 +97,57 @@ def setup_device(self, rack, name):
         for p in rack.parameters:
             if p.is_enabled:
                 name = p.name.upper()
-                if name.startswith('[CC') and not p.value_has_listener(self.do_cc):
+                message = None  # type: Optional[Callable[[int], Tuple[int, ...]]]
+                if name.startswith('[CC'):
                     cc_num = self.check_for_cc_num(name)
                     if cc_num is not None:
-                        self._macro_to_cc.append((p, cc_num, -1, rack, channel))
-                        p.add_value_listener(self.do_cc)
-                elif name.startswith('[PC]') and not p.value_has_listener(self.do_pc):
-                    self._macro_to_pc.append((p, -1, rack, channel))
-                    p.add_value_listener(self.do_pc)
+                        message = partial(channel_message, (176 + channel, cc_num))
+                elif name.startswith('[PC]'):
+                    message = partial(channel_message, (192 + channel,))
                 else:
-                    sysex_entry = self.check_sysex_list(name)
-                    if sysex_entry and not p.value_has_listener(self.do_sysex):
-                        self._macro_to_sysex.append((p, sysex_entry, -1, rack))
-                        p.add_value_listener(self.do_sysex)
-
-    def do_cc(self):
-        '''Send out CC on macro value change.'''
-        if self._macro_to_cc:
-            for p in self._macro_to_cc:
-                if int(p[0].value) != p[2]:
-                    self._parent._send_midi((int(176 + p[4]), p[1], int(p[0].value)))
-                    self._macro_to_cc[self._macro_to_cc.index(p)] = (
-                        (p[0], p[1], int(p[0].value), p[3], p[4])
-                    )
-
-    def do_pc(self):
-        '''Send out PC on macro value change.'''
-        if self._macro_to_pc:
-            for p in self._macro_to_pc:
-                if int(p[0].value) != p[1]:
-                    self._parent._send_midi((int(192 + p[3]), int(p[0].value)))
-                    self._macro_to_pc[self._macro_to_pc.index(p)] = (
-                        (p[0], int(p[0].value), p[2], p[3])
-                    )
-
-    def do_sysex(self):
-        '''Send out SysEx on macro value change.'''
-        if self._macro_to_sysex:
-            for p in self._macro_to_sysex:
-                if int(p[0].value) != p[2]:
-                    new_string = []
-                    send_new_val = True
-                    for byte in p[1][0]:
-                        if byte == -1:
-                            if int(p[0].value) != p[2]:
-                                new_val = int((((p[1][2] - p[1][1]) / 127.0) * int(p[0].value)) + p[1][1])
-                                new_string.append(new_val)
-                            else:
-                                send_new_val = False
-                            # new_val = int((((p[1][2] - p[1][1]) / 127.0) * int(p[0].value)) + p[1][1])
-                            # if int((((p[1][2] - p[1][1]) / 127.0) * p[2]) + p[1][1]) != new_val:
-                            #     new_string.append(new_val)
-                            # else:
-                            #     send_new_val = False
-                        else:
-                            new_string.append(byte)
-                    if send_new_val:
-                        self._parent._send_midi(tuple(new_string))
-                self._macro_to_sysex[self._macro_to_sysex.index(p)] = ((p[0], p[1], int(p[0].value), p[3]))
+                    template = self.check_sysex_list(name)
+                    if template:
+                        message = partial(sysex_message, template)
+                if message:
+                    self.subscribe(p, 'value', self._macro_listener(len(self._macros)))
+                    self._macros.append(p)
+                    self._messages.append(message)
+                    self._last_values.append(UNSENT)
+
+    def _macro_listener(self, index):
+        # type: (int) -> Callable[[], None]
+        def on_value_changed():
+            '''Send out the macro message on value change.'''
+            value = int(self._macros[index].value)
+            if value != self._last_values[index]:
+                self._last_values[index] = value
+                self._parent._send_midi(self._messages[index](value))
+        return on_value_changed
 
     def build_sysex_list(self):
-        '''Build SysEx list (in decimal) based on user-defined list.'''
-        self._sysex_list = []
+        '''Build SysEx templates based on user-defined list.'''
+        self._sysex_list = dict()
         for s in SYSEX_LIST:
             if len(s) == 4:
                 bytes = s[1].split()
-                current_entry = []
                 if bytes[0] == 'F0' and bytes[-1] == 'F7' and 0 <= s[2] < 128 and 0 <= s[3] < 128:
+                    data = bytearray()
+                    offsets = list()
                     for byte in bytes:
                         if byte == 'nn':
-                            current_entry.append(-1)
-                        else:
-                            if 0 <= int(byte, 16) < 248:
-                                current_entry.append(int(byte, 16))
-                    self._sysex_list.append((s[0], current_entry, s[2], s[3]))
+                            offsets.append(len(data))
+                            data.append(0)
+                        elif 0 <= int(byte, 16) < 248:
+                            data.append(int(byte, 16))
+                    scale = (s[3] - s[2]) / 127.0
+                    self._sysex_list[s[0].upper()] = SysexTemplate(data, tuple(offsets),
+                                                                   s[2], scale)
 
     def check_sysex_list(self, name_string):
-        # type: (Text) -> Optional[Text]
-        '''Check that SysEx list exists and identifier exists in list.
+        # type: (Text) -> Optional[SysexTemplate]
+        '''Returns the SysEx template of the identifier, if in the list.
         '''
-        result = None
-        if self._sysex_list:
-            for entry in self._sysex_list:
-                if entry[0].upper() == name_string:
-                    result = entry[1:4]
-        return result
+        return self._sysex_list.get(name_string)
 
     @staticmethod
     def check_for_channel(name):
@@ -170,7 +159,7 @@ def check_for_channel(name):
             try:
                 ch = int(value.group(1))
                 if 1 <= ch < 17:
-                    return cc - 1
+                    return ch - 1
             except AttributeError:
                 pass
             except ValueError:
@@ -197,20 +186,7 @@ def check_for_cc_num(name):
 
     def remove_macro_listeners(self):
         '''Remove listeners.'''
-        if self._macro_to_cc:
-            for p in self._macro_to_cc:
-                if p[3] and p[0].value_has_listener(self.do_cc):
-                    p[0].remove_value_listener(self.do_cc)
-        self._macro_to_cc = []
-
-        if self._macro_to_pc:
-            for p in self._macro_to_pc:
-                if p[2] and p[0].value_has_listener(self.do_pc):
-                    p[0].remove_value_listener(self.do_pc)
-        self._macro_to_pc = []
-
-        if self._macro_to_sysex:
-            for p in self._macro_to_sysex:
-                if p[3] and p[0].value_has_listener(self.do_sysex):
-                    p[0].remove_value_listener(self.do_sysex)
-        self._macro_to_sysex = []
+        self.unsubscribe()
+        self._macros = []
+        self._messages = []
+        self._last_values = bytearray()
@@ -19,11 +19,15 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Callable, Dict, List, Any, Text
+    from typing import Dict, List, Any, Text
     from ..core.live import DeviceParameter, RackDevice, Track
 
 from ..core.xcomponent import XComponent
 
+#: Group of the listeners of the on/off switch, the macros and the
+#: parameters they control, which are set up again with the rack.
+MACROS = 'macros'
+
 
 class MacrobatParameterRackTemplate(XComponent):
     '''Template for Macrobat racks that control parameters.
@@ -53,9 +57,8 @@ def setup_device(self, rack):
         (used for resetting assigned params).
         '''
         self.remove_macro_listeners()
-        if not rack.parameters[0].value_has_listener(self.on_off_changed):
-            self._on_off_param = [rack.parameters[0], rack.parameters[0].value]
-            rack.parameters[0].add_value_listener(self.on_off_changed)
+        self._on_off_param = [rack.parameters[0], rack.parameters[0].value]
+        self.subscribe(rack.parameters[0], 'value', self.on_off_changed, MACROS)
 
     @staticmethod
     def scale_macro_value_to_param(macro, param):
@@ -114,28 +117,13 @@ def on_off_changed(self):
 
     def set_param_macro_listeners(self, macro, param, index):
         # type: (DeviceParameter, DeviceParameter, int) -> None
-        macro.add_value_listener(lambda i=index: self.macro_changed(i))
-        param.add_value_listener(lambda i=index: self.param_changed(i))
+        self.subscribe(macro, 'value', lambda i=index: self.macro_changed(i), MACROS)
+        self.subscribe(param, 'value', lambda i=index: self.param_changed(i), MACROS)
         self._param_macros[index] = (macro, param)
 
     def remove_macro_listeners(self):
-        for i in range(1, 9):
-            try:
-                macro = self._param_macros[i]
-            except KeyError:
-                pass
-            else:
-                m_listener = lambda index=i: self.macro_changed(index)  # type: Callable[[int], None]
-                p_listener = lambda index=i: self.param_changed(index)  # type: Callable[[int], None]
-                if macro[0] and macro[0].value_has_listener(m_listener):
-                    macro[0].remove_value_listener(m_listener)
-                if macro[1] and macro[1].value_has_listener(p_listener):
-                    macro[1].remove_value_listener(p_listener)
+        self.unsubscribe(MACROS)
         self._param_macros = dict()
-        if (self._on_off_param and
-                self._on_off_param[0] and
-                self._on_off_param[0].value_has_listener(self.on_off_changed)):
-            self._on_off_param[0].remove_value_listener(self.on_off_changed)
         self._on_off_param = []
 
     def macro_changed(self, index):
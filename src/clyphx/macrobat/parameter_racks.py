@@ -25,7 +25,6 @@
     from typing import Any, Sequence, Dict, Text, Tuple, List
     from ..core.live import RackDevice, Track, DeviceParameter
 
-from functools import partial
 from itertools import chain
 from _Generic.Devices import *
 from _Framework.SubjectSlot import Subject, SlotManager, subject_slot
@@ -43,14 +42,10 @@ def __init__(self, parent, rack, track):
         # type: (Any, RackDevice, Track) -> None
         self._rack = rack
         # XXX: delay adding listener to prevent issue with change on set load
-        parent.schedule_message(
-            8, partial(parent.song().view.add_selected_parameter_listener, self.on_selected_parameter_changed)
-        )
+        parent.schedule_message(8, self._add_selected_parameter_listener)
         super().__init__(parent, rack, track)
 
     def disconnect(self):
-        if self.song().view.selected_parameter_has_listener(self.on_selected_parameter_changed):
-            self.song().view.remove_selected_parameter_listener(self.on_selected_parameter_changed)
         self._rack = None
         super().disconnect()
 
@@ -70,6 +65,11 @@ def setup_device(self, rack):
                 self.set_param_macro_listeners(self._rack.parameters[1], param, 1)
             self._tasks.add(self.get_initial_value)
 
+    def _add_selected_parameter_listener(self):
+        if self._parent:
+            self.subscribe(self.song().view, 'selected_parameter',
+                           self.on_selected_parameter_changed)
+
     def on_selected_parameter_changed(self):
         '''Update rack on new param selected.'''
         if (self.song().view.selected_parameter and
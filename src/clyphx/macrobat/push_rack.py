@@ -58,9 +58,9 @@ def setup_device(self):
         self.remove_macro_listeners()
         if self._rack:
             if self._rack.parameters[1].is_enabled:
-                self._rack.parameters[1].add_value_listener(self._on_macro_one_value)
+                self.subscribe(self._rack.parameters[1], 'value', self._on_macro_one_value)
             if self._rack.parameters[2].is_enabled:
-                self._rack.parameters[2].add_value_listener(self._on_macro_two_value)
+                self.subscribe(self._rack.parameters[2], 'value', self._on_macro_two_value)
             self._parent.schedule_message(1, self._update_rack_name)
 
     def _connect_to_push(self):
@@ -130,8 +130,4 @@ def scale_macro_value_to_param(macro, hi_value):
 
     def remove_macro_listeners(self):
         '''Remove listeners.'''
-        if self._rack:
-            if self._rack.parameters[1].value_has_listener(self._on_macro_one_value):
-                self._rack.parameters[1].remove_value_listener(self._on_macro_one_value)
-            if self._rack.parameters[2].value_has_listener(self._on_macro_two_value):
-                self._rack.parameters[2].remove_value_listener(self._on_macro_two_value)
+        self.unsubscribe()
@@ -18,10 +18,11 @@
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from typing import Any, List, Text
+    from typing import Any, List, Optional, Text
     from ..core.live import RackDevice, Track, DeviceParameter
 
 from functools import partial
+from ..core.devices import walk_devices
 from ..core.xcomponent import XComponent
 from ..core.live import Chain, get_random_int
 
@@ -56,16 +57,12 @@ def setup_device(self, rack, name):
         '''
         self.remove_on_off_listeners()
         if rack:
-            for p in rack.parameters:
-                if p.name == 'Device On' and p.is_enabled:
-                    if not p.value_has_listener(self.on_off_changed):
-                        self._on_off_param = [p, name]
-                        # use this to get around device on/off switches
-                        #   getting turned on upon set load
-                        self._parent.schedule_message(
-                            5, partial(p.add_value_listener, self.on_off_changed)
-                        )
-                        break
+            p = self._parent.get_parameter_index(rack).by_name('Device On')
+            if p and p.is_enabled and not p.value_has_listener(self.on_off_changed):
+                self._on_off_param = [p, name]
+                # use this to get around device on/off switches
+                #   getting turned on upon set load
+                self._parent.schedule_message(5, partial(self._add_on_off_listener, p))
 
     def on_off_changed(self):
         '''On/off changed, perform assigned function.'''
@@ -114,54 +111,51 @@ def get_devices_to_operate_on(self, dev_list, devices_to_get):
         '''Get next device on track, all devices on track or all devices
         on chain.
         '''
+        from .consts import RNR_EXCLUDED
+
+        rnr_rack = self._on_off_param[0].canonical_parent
+        nested = self._parent._can_have_nested_devices
         if devices_to_get == 'all':
-            if (self._parent._can_have_nested_devices and
-                isinstance(self._on_off_param[0].canonical_parent.canonical_parent, Chain)
-            ):
-                dev_list = self._on_off_param[0].canonical_parent.canonical_parent.devices
-            for d in dev_list:
-                name = d.name.upper()
-                if d and not name.startswith(
-                    ('NK RND', 'NK RST', 'NK CHAIN MIX', 'NK DR',
-                    'NK LEARN', 'NK RECEIVER', 'NK TRACK', 'NK SIDECHAIN')
-                ):
-                    self._devices_to_operate_on.append(d)
-                    if self._parent._can_have_nested_devices and d.can_have_chains:
-                        for c in d.chains:
-                            self.get_devices_to_operate_on(c.devices, 'all')
+            if nested and isinstance(rnr_rack.canonical_parent, Chain):
+                dev_list = rnr_rack.canonical_parent.devices
         else:
-            self.get_next_device(self._on_off_param[0].canonical_parent, dev_list)
+            next_device = self.get_next_device(rnr_rack, dev_list)
+            dev_list = [next_device] if next_device else []
+            if isinstance(rnr_rack.canonical_parent, Chain):
+                nested = False
+
+        self._devices_to_operate_on = [
+            node.obj for node in walk_devices(
+                dev_list,
+                max_depth=None if nested else 0,
+                skip=lambda d: not d or d.name.upper().startswith(RNR_EXCLUDED),
+                chains=False,
+            )
+        ]
 
-    def get_next_device(self, rnr_rack, dev_list, store_next=False):
-        # type: (RackDevice, List[RackDevice], bool) -> None
+    @staticmethod
+    def get_next_device(rnr_rack, dev_list):
+        # type: (RackDevice, List[RackDevice]) -> Optional[RackDevice]
         '''Get the next non-RnR device on the track or in the chain.'''
         from .consts import RNR_EXCLUDED
 
+        store_next = False
         for d in dev_list:
-            if d and not store_next:
-                if d == rnr_rack:
-                    store_next = True
-            elif d and store_next:
-                if not self._devices_to_operate_on or (
-                    self._parent._can_have_nested_devices and
-                    isinstance(d.canonical_parent, Chain)
-                ):
-                    name = d.name.upper()
-                    if d and not name.startswith(RNR_EXCLUDED):
-                        self._devices_to_operate_on.append(d)
-                        if self._parent._can_have_nested_devices:
-                            if isinstance(rnr_rack.canonical_parent, Chain):
-                                return
-                            if d.can_have_chains:
-                                for c in d.chains:
-                                    self.get_next_device(rnr_rack, c.devices, True)
-                else:
-                    return
+            if not d:
+                continue
+            if store_next:
+                if not d.name.upper().startswith(RNR_EXCLUDED):
+                    return d
+            elif d == rnr_rack:
+                store_next = True
+        return None
+
+    def _add_on_off_listener(self, param):
+        # type: (DeviceParameter) -> None
+        if self._parent and self._on_off_param and self._on_off_param[0] == param:
+            self.subscribe(param, 'value', self.on_off_changed)
 
     def remove_on_off_listeners(self):
         '''Remove listeners.'''
-        if (self._on_off_param and
-                self._on_off_param[0] and
-                self._on_off_param[0].value_has_listener(self.on_off_changed)):
-            self._on_off_param[0].remove_value_listener(self.on_off_changed)
+        self.unsubscribe()
         self._on_off_param = []
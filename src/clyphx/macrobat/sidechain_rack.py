@@ -19,10 +19,11 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Any
-    from ..core.live import RackDevice, Track
+    from typing import Any, List, Optional
+    from ..core.live import DeviceParameter, RackDevice, Track
 
-from functools import partial
+from _Framework import Task
+from ..core.meters import MeterFollower
 from ..core.xcomponent import XComponent
 
 
@@ -34,25 +35,22 @@ class MacrobatSidechainRack(XComponent):
     def __init__(self, parent, rack, track):
         # type: (Any, RackDevice, Track) -> None
         super().__init__(parent)
-        self._last_meter_left_val = -1
-        self._last_meter_right_val = -1
-        self._last_midi_meter_val = -1
         self._track = track
         self._rack = rack
+        self._macros = None  # type: Optional[List[DeviceParameter]]
+        settings = parent.macrobat.settings
+        self._follower = MeterFollower(settings.get('sidechain_rate', 1),
+                                       settings.get('sidechain_attack', 0),
+                                       settings.get('sidechain_release', 0))
+        self._follow_task = self._tasks.add(Task.loop(Task.run(self.follow)))
+        self._follow_task.kill()
         self.setup_device()
 
     def disconnect(self):
-        if self._track:
-            if self._track.has_audio_output:
-                if self._track.output_meter_left_has_listener(self.audio_left_changed):
-                    self._track.remove_output_meter_left_listener(self.audio_left_changed)
-                if self._track.output_meter_right_has_listener(self.audio_right_changed):
-                    self._track.remove_output_meter_right_listener(self.audio_right_changed)
-            if (self._track.has_midi_output
-                    and self._track.output_meter_level_has_listener(self.midi_changed)):
-                self._track.remove_output_meter_level_listener(self.midi_changed)
+        self._follow_task.kill()
         self._track = None
         self._rack = None
+        self._macros = None
         super().disconnect()
 
     def setup_device(self):
@@ -63,51 +61,58 @@ def setup_device(self):
         - Dev On/Off turns sidechain on/off
         - IMPORTANT NOTE: This will hose undo history since each macro movement is undoable
         '''
+        self.subscribe(self._rack.parameters[0], 'value', self.on_device_on_changed)
+        for p in self._rack.parameters[1:]:
+            self.subscribe(p, 'name', self.invalidate_macros)
         if self._track.has_audio_output:
-            if not self._track.output_meter_left_has_listener(self.audio_left_changed):
-                self._track.add_output_meter_left_listener(self.audio_left_changed)
-            if not self._track.output_meter_right_has_listener(self.audio_right_changed):
-                self._track.add_output_meter_right_listener(self.audio_right_changed)
-        if (self._track.has_midi_output
-                and not self._track.output_meter_level_has_listener(self.midi_changed)):
-            self._track.add_output_meter_level_listener(self.midi_changed)
+            self.subscribe(self._track, 'output_meter_left', self.meter_changed)
+            self.subscribe(self._track, 'output_meter_right', self.meter_changed)
+        if self._track.has_midi_output:
+            self.subscribe(self._track, 'output_meter_level', self.meter_changed)
 
-    def audio_left_changed(self):
-        '''Audio left changed, update macro (1 tick delay).'''
-        val = int(self._track.output_meter_left * 127)
-        if val != self._last_meter_left_val:
-            self._last_meter_left_val = val
-            self._parent.schedule_message(1, partial(self.update_macros, val))
+    def invalidate_macros(self):
+        self._macros = None
 
-    def audio_right_changed(self):
-        '''Audio right changed, update macro (1 tick delay).'''
-        val = int(self._track.output_meter_right * 127)
-        if val != self._last_meter_right_val:
-            self._last_meter_right_val = val
-            self._parent.schedule_message(1, partial(self.update_macros, val))
+    def on_device_on_changed(self):
+        '''The follower keeps following the meter while the rack is off,
+        so its current value is written when the rack is turned on.
+        '''
+        self.update_macros(self._follower.value)
+
+    @property
+    def macros(self):
+        # type: () -> List[DeviceParameter]
+        '''The [SC] macros of the rack.'''
+        if self._macros is None:
+            self._macros = [p for p in self._rack.parameters[1:]
+                            if p.name.upper().startswith('[SC]')]
+        return self._macros
+
+    def meter(self):
+        # type: () -> float
+        if self._track.has_audio_output:
+            return max(self._track.output_meter_left, self._track.output_meter_right)
+        return self._track.output_meter_level
+
+    def meter_changed(self):
+        '''Wakes up the follower, which samples the meter every tick
+        until the output is silent and the macros are back to 0.
+        '''
+        if self._follow_task.is_killed:
+            self._follow_task.restart()
 
-    def midi_changed(self):
-        '''MIDI output changed, update macro (1 tick delay).'''
-        val = int(self._track.output_meter_level * 127)
-        if val != self._last_midi_meter_val:
-            self._last_midi_meter_val = val
-            self._parent.schedule_message(1, partial(self.update_macros, val))
+    def follow(self):
+        if self._follower.tick():
+            val = self._follower.sample(self.meter())
+            if val is not None:
+                self.update_macros(val)
+            if self._follower.is_idle:
+                self._follow_task.kill()
 
     def update_macros(self, val):
         '''Update macros based on track output as long as rack is on.
         '''
-        if self._rack:
-            for p in self._rack.parameters:
-                name = p.name.upper()
-                if name.startswith('DEVICE') and p.value == 0.0:
-                    return
-                elif name.startswith('[SC]') and p.is_enabled:
-                    if self._track.output_meter_level == 0.0 or (
-                        self._track.has_audio_output and
-                        self._track.output_meter_right == 0.0 and
-                        self._track.output_meter_left == 0.0
-                    ):
-                        val = 0.0
+        if self._rack and self._rack.parameters[0].value != 0.0:
+            for p in self.macros:
+                if p.is_enabled:
                     p.value = val
-                    if self._track.has_midi_output:
-                        self._parent.schedule_message(4, self.midi_changed)
@@ -4,7 +4,7 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import Any, Text
+    from typing import Any, Optional, Text
 
 from _Framework.SubjectSlot import subject_slot
 
@@ -20,6 +20,8 @@ class ActionList(object):
     def __init__(self, name='none'):
         # type: (Text) -> None
         self.name = name
+        # value of the MIDI message that triggered the list, if any
+        self.value = None  # type: Optional[int]
 
 
 class XTrigger(XComponent):
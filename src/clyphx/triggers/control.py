@@ -97,7 +97,8 @@ def receive_midi(self, bytes):
                 ctrl_data = self._control_list[(bytes[0], bytes[1])]
                 ctrl_data['name'].name = ctrl_data['on_action']
             if ctrl_data:
-                self.handle_action_list(self.ref_rack, ctrl_data['name'])
+                ctrl_data['name'].value = bytes[2]
+                self.handle_action_list(self.ref_track, ctrl_data['name'])
 
     def get_user_controls(self, settings, midi_map_handle):
         # type: (Dict[Text, Text], int) -> None
@@ -19,9 +19,9 @@ class XCueComponent(XTrigger):
     def __init__(self, parent):
         # type: (Any) -> None
         super().__init__(parent)
-        self.song().add_current_song_time_listener(self.arrange_time_changed)
-        self.song().add_is_playing_listener(self.arrange_time_changed)
-        self.song().add_cue_points_listener(self.cue_points_changed)
+        self.subscribe(self.song(), 'current_song_time', self.arrange_time_changed)
+        self.subscribe(self.song(), 'is_playing', self.arrange_time_changed)
+        self.subscribe(self.song(), 'cue_points', self.cue_points_changed)
         self._x_points = dict()  # type: Dict[Any, Any]
         self._x_point_time_to_watch_for = -1
         self._last_arrange_position = -1
@@ -30,9 +30,6 @@ def __init__(self, parent):
 
     def disconnect(self):
         self.remove_cue_point_listeners()
-        self.song().remove_current_song_time_listener(self.arrange_time_changed)
-        self.song().remove_is_playing_listener(self.arrange_time_changed)
-        self.song().remove_cue_points_listener(self.cue_points_changed)
         self._x_points = dict()
         super().disconnect()
 
@@ -44,10 +41,8 @@ def cue_points_changed(self):
         self.remove_cue_point_listeners()
         self._sorted_times = []
         for cp in self.song().cue_points:
-            if not cp.time_has_listener(self.cue_points_changed):
-                cp.add_time_listener(self.cue_points_changed)
-            if not cp.name_has_listener(self.cue_points_changed):
-                cp.add_name_listener(self.cue_points_changed)
+            self.subscribe(cp, 'time', self.cue_points_changed, 'cue_points')
+            self.subscribe(cp, 'name', self.cue_points_changed, 'cue_points')
             name = cp.name.upper()
             if len(name) > 2 and name[0] == '[' and name.count('[') == 1 and name.count(']') == 1:
                 cue_name = name.replace(name[name.index('['):name.index(']')+1].strip(), '')
@@ -87,10 +82,6 @@ def schedule_x_point_action_list(self, point):
         self.handle_action_list(self.ref_track, self._x_points[point])
 
     def remove_cue_point_listeners(self):
-        for cp in self.song().cue_points:
-            if cp.time_has_listener(self.cue_points_changed):
-                cp.remove_time_listener(self.cue_points_changed)
-            if cp.name_has_listener(self.cue_points_changed):
-                cp.remove_name_listener(self.cue_points_changed)
+        self.unsubscribe('cue_points')
         self._x_points = dict()
         self._x_point_time_to_watch_for = -1
@@ -22,7 +22,7 @@ def __init__(self, parent, track):
         self._track = track
         self._clip = None
         self._loop_count = 0
-        self._track.add_playing_slot_index_listener(self.play_slot_index_changed)
+        self.subscribe(track, 'playing_slot_index', self.play_slot_index_changed)
         self._register_timer_callback(self.on_timer)
         self._last_slot_index = -1
         self._triggered_clips = []  # type: List[Clip]
@@ -31,8 +31,6 @@ def __init__(self, parent, track):
     def disconnect(self):
         self.remove_loop_jump_listener()
         self._unregister_timer_callback(self.on_timer)
-        if self._track and self._track.playing_slot_index_has_listener(self.play_slot_index_changed):
-            self._track.remove_playing_slot_index_listener(self.play_slot_index_changed)
         self._track = None
         self._clip = None
         self._triggered_clips = []
@@ -53,9 +51,8 @@ def play_slot_index_changed(self):
             self._triggered_clips.append(new_clip)
         self._clip = new_clip
         # FIXME
-        if (self._clip and '(LSEQ)' in self._clip.name.upper() and
-                not self._clip.loop_jump_has_listener(self.on_loop_jump)):
-            self._clip.add_loop_jump_listener(self.on_loop_jump)
+        if self._clip and '(LSEQ)' in self._clip.name.upper():
+            self.subscribe(self._clip, 'loop_jump', self.on_loop_jump, 'loop_jump')
 
     def get_xclip(self, slot_index):
         # type: (int) -> Optional[Clip]
@@ -99,5 +96,4 @@ def on_timer(self):
 
     def remove_loop_jump_listener(self):
         self._loop_count = 0
-        if self._clip and self._clip.loop_jump_has_listener(self.on_loop_jump):
-            self._clip.remove_loop_jump_listener(self.on_loop_jump)
+        self.unsubscribe('loop_jump')
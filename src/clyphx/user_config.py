@@ -38,6 +38,11 @@
         clip_record_length_set_by_global_quantization = bool,
         default_inserted_midi_clip_length = int,
     ),
+    macrobat = dict(
+        sidechain_rate = int,
+        sidechain_attack = int,
+        sidechain_release = int,
+    ),
     cslinker = dict(
         cslinker_matched_link = bool,
         cslinker_horizontal_link = bool,
@@ -133,6 +138,7 @@ def _parse_config(self, path):
 
     xcontrols = property(lambda s: getattr(s, 'user_controls', {}))
     snapshots = property(lambda s: getattr(s, 'snapshot_settings', {}))
+    macrobat_settings = property(lambda s: getattr(s, 'macrobat', {}))
 
 
 def get_user_settings():
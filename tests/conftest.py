@@ -14,3 +14,37 @@
 def user_settings():
     here = os.path.dirname(os.path.realpath(__file__))
     return os.path.join(here, 'fixtures', 'UserSettings.txt')
+
+
+class Observable(object):
+    '''Fake Live object with listeners for any property.'''
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+        self.listeners = dict()
+        self.deleted = False
+
+    def __getattr__(self, attr):
+        if self.deleted:
+            raise RuntimeError('object deleted')
+        if attr.endswith('_has_listener'):
+            return lambda f: f in self.listeners.get(attr[:-len('_has_listener')], ())
+        action, _, name = attr.partition('_')
+        name = name[:-len('_listener')]
+        if action == 'add':
+            return self.listeners.setdefault(name, []).append
+        if action == 'remove':
+            return self.listeners[name].remove
+        raise AttributeError(attr)
+
+    def notify(self, name):
+        for listener in list(self.listeners.get(name, ())):
+            listener()
+
+    def count_listeners(self):
+        return sum(len(x) for x in self.listeners.values())
+
+
+@pytest.fixture(scope='session')
+def observable():
+    return Observable
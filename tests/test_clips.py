@@ -0,0 +1,39 @@
+from __future__ import absolute_import, unicode_literals
+
+
+def test_clip_index(observable):
+    from clyphx.core.clips import ClipIndex
+    from clyphx.core.subscriptions import Subscriptions
+
+    clips = [observable(name='Clip {}'.format(i)) for i in range(3)]
+    slots = [observable(has_clip=True, clip=c) for c in clips]
+    slots.append(observable(has_clip=False, clip=None))
+    track = observable(clip_slots=slots)
+    subscriptions = Subscriptions()
+    index = ClipIndex(track, subscriptions)
+
+    assert index.occupied == [0, 1, 2]
+    assert index.slot_by_name('CLIP 1') == 1
+    assert index.next_occupied(2) == 0
+    assert index.next_occupied(0, -1, exclude=clips[2]) == 1
+
+    # move the first clip to the last slot
+    slots[0].has_clip, slots[0].clip = False, None
+    slots[0].notify('has_clip')
+    slots[3].has_clip, slots[3].clip = True, clips[0]
+    slots[3].notify('has_clip')
+    assert index.occupied == [1, 2, 3]
+    assert clips[0].count_listeners() == 1
+
+    clips[0].name = 'Moved'
+    clips[0].notify('name')
+    assert index.slot_by_name('CLIP 0') == -1
+    assert index.slot_by_name('MOVED') == 3
+    assert index.next_occupied(3) == 1
+
+    index.invalidate()
+    assert subscriptions.count(index) == 1
+    assert index.slot_by_name('MOVED') == 3
+    index.disconnect()
+    assert subscriptions.count() == 0
+    assert not any(x.count_listeners() for x in clips + slots + [track])
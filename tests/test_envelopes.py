@@ -0,0 +1,125 @@
+from __future__ import absolute_import, unicode_literals
+
+import pytest
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def envelopes(request, monkeypatch):
+    '''The envelopes module, with NumPy or with the pure Python backend.'''
+    from clyphx.core import envelopes
+
+    if request.param == 'python':
+        monkeypatch.setattr(envelopes, 'np', None)
+    elif envelopes.np is None:
+        pytest.skip('NumPy not installed')
+    return envelopes
+
+
+def floats(*columns):
+    return tuple([float(x) for x in column] for column in columns)
+
+
+class Envelope(object):
+    def __init__(self, func=None):
+        self.func = func
+        self.steps = []
+
+    def value_at_time(self, time):
+        return self.func(time)
+
+    def insert_step(self, time, length, value):
+        self.steps.append((time, length, value))
+
+
+def test_parse_shape():
+    from clyphx.core.envelopes import parse_shape
+
+    assert parse_shape('SIN') == ('SIN', None)
+    assert parse_shape('EUC') == ('EUC', None)
+    assert parse_shape('EUC5') == ('EUC', 5)
+    assert parse_shape('SIN5') is None
+    assert parse_shape('EUCX') is None
+
+
+def test_generate(envelopes):
+    # held steps end at the start of the next one
+    assert floats(*envelopes.generate('SQR', 0.0, 4.0)) == (
+        [0.0, 1.0, 2.0, 3.0], [1.0] * 4, [1.0, 0.0, 1.0, 0.0])
+    # points end with a point at the end of the last cycle
+    assert floats(*envelopes.generate('IRAMP', 0.0, 4.0, (0.0, 10.0))) == (
+        [0.0, 4.0], [0.0, 0.0], [0.0, 10.0])
+    assert floats(*envelopes.generate('TRI', 1.0, 3.0)) == (
+        [1.0, 1.5, 2.0, 2.5, 3.0], [0.0] * 5, [0.0, 1.0, 0.0, 1.0, 0.0])
+    # sampled at the resolution, plus a point at the end
+    times, _, values = floats(*envelopes.generate('SIN', 0.0, 0.75, resolution=0.25))
+    assert times == [0.0, 0.25, 0.5, 0.75]
+    assert values == pytest.approx([0.0, 0.5, 1.0, 0.5])
+
+    assert floats(*envelopes.generate('EUC', 0.0, 4.0, resolution=1.0, arg=2)) == (
+        [0.0, 1.0, 2.0, 3.0], [1.0] * 4, [1.0, 0.0, 1.0, 0.0])
+    times, lengths, values = floats(*envelopes.generate('EUC', 0.0, 4.0, (0.0, 2.0)))
+    assert len(times) == 16 and sum(values) == 2 * envelopes.PULSES
+
+    first = floats(*envelopes.generate('RND', 0.0, 2.0, (10.0, 20.0), seed=1))
+    assert first == floats(*envelopes.generate('RND', 0.0, 2.0, (10.0, 20.0), seed=1))
+    assert len(first[0]) == 8 and all(10.0 <= v <= 20.0 for v in first[2])
+
+
+def test_compact(envelopes):
+    # held steps with the same value are merged
+    assert floats(*envelopes.compact([0.0, 1.0, 2.0, 3.0], [1.0] * 4,
+                                     [1.0, 1.0, 0.0, 0.0])) == (
+        [0.0, 2.0], [2.0, 2.0], [1.0, 0.0])
+    # points are dropped only between points of the same value
+    assert floats(*envelopes.compact([0.0, 1.0, 2.0, 3.0, 4.0], [0.0] * 5,
+                                     [0.0, 1.0, 1.0, 1.0, 1.0])) == (
+        [0.0, 1.0, 4.0], [0.0] * 3, [0.0, 1.0, 1.0])
+    assert envelopes.compact([0.0], [1.0], [0.5]) == ([0.0], [1.0], [0.5])
+
+
+def test_sample(envelopes):
+    env = Envelope(lambda t: t * 2)
+    assert floats(*envelopes.sample(env, 1.0, 2.0)) == (
+        [1.0, 1.25, 1.5, 1.75, 2.0], [2.0, 2.5, 3.0, 3.5, 4.0])
+    assert floats(*envelopes.sample(env, 0.0, 1.0, 0.4)) == ([0.0, 0.4, 0.8], [0.0, 0.8, 1.6])
+
+
+def test_transform(envelopes):
+    times, values = [0.0, 1.0, 2.0], [0.0, 1.0, 2.0]
+    assert floats(*envelopes.transform(times, values, 4.0, 8.0, (0.0, 10.0), (0.0, 2.0))) == (
+        [4.0, 5.0, 6.0], [0.0, 5.0, 10.0])
+    assert floats(*envelopes.transform(times, values, 4.0, 8.0, (0.0, 10.0), (0.0, 2.0),
+                                       invert=True, scale=0.5, stretch=2.0)) == (
+        [4.0, 6.0, 8.0], [5.0, 2.5, 0.0])
+    # times after the end are dropped and values clipped to the range
+    assert floats(*envelopes.transform(times, values, 0.0, 1.5, (0.5, 1.5),
+                                       reverse=True)) == (
+        [0.0, 1.0], [1.5, 1.0])
+    assert floats(*envelopes.transform([], [], 0.0, 1.0, (0.0, 1.0))) == ([], [])
+
+
+def test_insert_steps(envelopes):
+    env = Envelope()
+    envelopes.insert_steps(env, *envelopes.generate('SQR', 0.0, 2.0, (0.0, 127.0)))
+    assert env.steps == [(0.0, 1.0, 127.0), (1.0, 1.0, 0.0)]
+    assert all(type(x) is float for step in env.steps for x in step)
+
+
+def test_get_envelope():
+    from clyphx.core.envelopes import get_envelope
+
+    class Clip(object):
+        def __init__(self):
+            self.envelopes = dict()
+
+        def automation_envelope(self, param):
+            return self.envelopes.get(param)
+
+    class SessionClip(Clip):
+        def create_automation_envelope(self, param):
+            return self.envelopes.setdefault(param, Envelope())
+
+    assert get_envelope(Clip(), 'param') is None
+    clip = SessionClip()
+    env = get_envelope(clip, 'param')
+    assert env is not None and get_envelope(clip, 'param') is env
@@ -0,0 +1,40 @@
+from __future__ import absolute_import, unicode_literals
+
+
+def follow(follower, levels):
+    '''Returns the values by tick of the follower sampling the levels
+    while not idle, as the sidechain rack does.
+    '''
+    values = []
+    for level in levels:
+        value = None
+        if follower.tick():
+            value = follower.sample(level)
+        values.append(value)
+    return values
+
+
+def test_meter_follower_rate():
+    from clyphx.core.meters import MeterFollower
+
+    follower = MeterFollower(rate=3)
+    # sampled on the first tick from silence and then every 3 ticks
+    assert follow(follower, [0.5] * 7) == [63, None, None, None, None, None, None]
+    assert follow(follower, [1.0] * 3) == [None, None, 127]
+    assert not follower.is_idle
+
+
+def test_meter_follower_smoothing():
+    from clyphx.core.meters import MeterFollower
+
+    follower = MeterFollower(attack=1, release=3)
+    rise = follow(follower, [1.0] * 4)
+    assert rise == [63, 95, 111, 119]
+    fall = follow(follower, [0.0] * 40)
+    assert all(a > b for a, b in zip(fall, fall[1:]) if a is not None and b is not None)
+    assert fall[-1] is None and follower.value == 0 and follower.is_idle
+
+    # only changes of the quantized value are returned
+    follower = MeterFollower()
+    assert follow(follower, [0.5, 0.501, 0.2, 0.0]) == [63, None, 25, 0]
+    assert follower.is_idle
@@ -0,0 +1,266 @@
+from __future__ import absolute_import, unicode_literals
+import random
+import sys
+import types
+
+import pytest
+
+NOTES = [
+    (60, 0.0, 1.0, 100.0, False),
+    (62, 0.5, 0.5, 90.0, False),
+    (64, 1.0, 2.0, 80.0, True),
+    (60, 2.0, 1.0, 70.0, False),
+    (72, 3.0, 0.5, 60.0, False),
+]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def notes(request, monkeypatch):
+    '''The notes module, with NumPy or with the pure Python backend.'''
+    from clyphx.core import groove, notes
+
+    if request.param == 'python':
+        monkeypatch.setattr(notes, 'np', None)
+        monkeypatch.setattr(groove, 'np', None)
+    elif notes.np is None:
+        pytest.skip('NumPy not installed')
+    return notes
+
+
+def buffer(notes, items=NOTES):
+    return notes.NoteBuffer.from_notes(items)
+
+
+def test_select(notes):
+    buf = buffer(notes)
+    assert list(buf.select()) == [0, 1, 2, 3, 4]
+    assert list(buf.select((60, 61))) == [0, 3]
+    assert list(buf.select((60, 65), (0.0, 2.0))) == [0, 1, 2]
+    # from the second query on, through the interval index
+    assert sorted(buf.select((60, 65), (1.0, 3.5))) == [2, 3]
+    assert sorted(buf.select((0, 128), (0.5, 3.0))) == [1, 2, 3]
+
+    assert sorted(buf.sounding(0.5)) == [0, 1]
+    assert sorted(buf.sounding(1.25)) == [2]
+    assert sorted(buf.sounding(2.5, (60, 65))) == [2, 3]
+    assert list(buf.sounding(4.0)) == []
+
+
+def test_transforms(notes):
+    buf = buffer(notes)
+    assert buf.transpose([0, 1], 2)
+    assert not buf.transpose([4], 60)
+    assert [n[0] for n in buf.to_notes()] == [62, 64, 64, 60, 72]
+
+    buf.invert([4])
+    assert buf.to_notes()[4][0] == 55
+    buf.set_mute([1, 2])
+    assert [n[4] for n in buf.to_notes()] == [False, True, False, False, False]
+    buf.set_mute([1, 2], False)
+    assert not any(n[4] for n in buf.to_notes())
+
+    assert buf.nudge([4], 0.5, 4.0)
+    assert not buf.nudge([4], 0.5, 4.0)
+    assert not buf.gate([1], -0.5, 4.0)
+    assert buf.gate([1], 0.25, 4.0)
+    assert buf.to_notes()[1][1:3] == (0.5, 0.75)
+    assert buf.to_notes()[4][1] == 3.5
+
+    buf.reverse([0], 0.0, 4.0)
+    assert buf.to_notes()[0][1] == 3.0
+    buf.scale([3], 0.5)
+    assert buf.to_notes()[3][1:3] == (1.0, 0.5)
+
+    assert buf.offset_velocity([0], 27)
+    assert not buf.offset_velocity([0], 1)
+    buf.set_velocity([1], 64)
+    buf.randomize_velocity([2, 3], 10, 20)
+    velocity = [n[3] for n in buf.to_notes()]
+    assert velocity[:2] == [127.0, 64.0] and all(10 <= v <= 20 for v in velocity[2:4])
+
+
+def test_velocity_ramp(notes):
+    buf = buffer(notes, [(60, 0.0, 1.0, 1.0, False), (64, 0.0, 1.0, 1.0, False),
+                         (60, 1.0, 1.0, 1.0, False), (60, 2.0, 1.0, 1.0, False)])
+    buf.ramp_velocity(buf.select())
+    velocity = [n[3] for n in buf.to_notes()]
+    # notes at the same position get the same velocity
+    assert velocity == pytest.approx([128 / 3.0 - 1] * 2 + [256 / 3.0 - 1, 127.0])
+    buf.ramp_velocity(buf.select(), descending=True)
+    assert [n[3] for n in buf.to_notes()] == pytest.approx([127.0] * 2 + velocity[2:0:-1])
+
+
+def test_structural_transforms(notes):
+    buf = buffer(notes, [(60, 0.0, 1.0, 100.0, False),
+                         (60, 1.0, 1.0, 90.0, False),
+                         (60, 2.0, 1.0, 80.0, False)])
+    buf.combine(buf.select())
+    assert buf.to_notes() == ((60, 0.0, 2.0, 100.0, False), (60, 2.0, 1.0, 80.0, False))
+
+    assert buf.split([1])
+    assert buf.to_notes()[1:] == ((60, 2.0, 0.5, 80.0, False), (60, 2.5, 0.5, 80.0, False))
+    buf = buffer(notes, [(60, 0.0, notes.MIN_LENGTH, 100.0, False)])
+    assert not buf.split([0]) and len(buf) == 1
+
+    buf = buffer(notes, [(60, 0.0, 1.0, 100.0, False),
+                         (60, 0.0, 0.5, 90.0, False),
+                         (62, 0.0, 1.0, 80.0, False),
+                         (62, 1.5, 1.0, 80.0, False)])
+    buf.dedupe(buf.select())
+    assert [n[:2] for n in buf.to_notes()] == [(60, 0.0), (62, 0.0), (62, 1.5)]
+    buf.legato(buf.select(), 4.0)
+    assert [n[2] for n in buf.to_notes()] == [1.5, 1.5, 2.5]
+
+
+def test_mixed_transforms(notes):
+    buf = notes.NoteBuffer.from_notes([(60, 0.0, 1.0, 100.0, False),
+                                       (60, 1.0, 1.0, 90.0, False),
+                                       (62, 0.0, 1.0, 80.0, False)], ids=[5, 6, 7])
+    # transforms of each note on its own work on the note tuples and
+    # the others on columns
+    assert buf.transpose([2], 1)
+    buf.combine(buf.select((60, 61)))
+    buf.invert([1])
+    buf.legato(buf.select(), 4.0)
+    assert buf.to_notes() == ((60, 0.0, 4.0, 100.0, False), (64, 0.0, 4.0, 80.0, False))
+    assert list(buf.ids) == [5, 7] and buf.removed == [6]
+    assert sorted(buf.sounding(3.0, (64, 65))) == [1]
+    buf.delete([0])
+    assert buf.to_notes() == ((64, 0.0, 4.0, 80.0, False),)
+    assert list(buf.ids) == [7] and buf.removed == [6, 5]
+
+
+def test_quantize(notes):
+    from clyphx.core.groove import swing_groove, extract_groove
+
+    buf = buffer(notes, [(60, 0.3, 0.25, 100.0, False), (60, 0.6, 0.25, 100.0, False)])
+    buf.quantize(buf.select(), swing_groove(0.25), 0.5)
+    assert [n[1] for n in buf.to_notes()] == pytest.approx([0.275, 0.55])
+    buf.quantize(buf.select(), swing_groove(0.25))
+    assert [n[1] for n in buf.to_notes()] == pytest.approx([0.25, 0.5])
+
+    buf = buffer(notes, [(60, 0.26, 0.25, 100.0, False)])
+    buf.quantize(buf.select(), swing_groove(0.25, 1.0))
+    assert buf.to_notes()[0][1] == pytest.approx(0.25 + 0.25 / 3)
+
+    source = buffer(notes, [(36, 0.0, 0.25, 120.0, False), (36, 0.3, 0.25, 60.0, False)])
+    groove = extract_groove(source, source.select(), 0.25)
+    assert groove.offsets[:3] == pytest.approx([0.0, 0.05, 0.0])
+    assert groove.velocities[:3] == pytest.approx([4 / 3.0, 2 / 3.0, 1.0])
+
+
+def test_humanize(notes):
+    first = buffer(notes)
+    first.humanize(first.select(), 0.1, 10, seed=3)
+    second = buffer(notes)
+    second.humanize(second.select(), 0.1, 10, seed=3)
+    assert first.to_notes() == second.to_notes()
+    for before, after in zip(NOTES, first.to_notes()):
+        assert abs(after[1] - before[1]) <= 0.1 and abs(after[3] - before[3]) <= 10
+
+
+def test_backends_match(monkeypatch):
+    from clyphx.core import notes
+
+    if notes.np is None:
+        pytest.skip('NumPy not installed')
+    rnd = random.Random(3)
+    items = [(rnd.choice((36, 38)), rnd.randint(0, 15) * 0.25, 0.25, 100.0, False)
+             for _ in range(60)]
+
+    def run():
+        results = []
+        for method, args in (('combine', ()), ('dedupe', ()), ('legato', (4.0,))):
+            buf = buffer(notes, items)
+            getattr(buf, method)(buf.select(), *args)
+            results.append(sorted(buf.to_notes()))
+        return results
+
+    expected = run()
+    monkeypatch.setattr(notes, 'np', None)
+    assert run() == expected
+
+
+class Note(object):
+    def __init__(self, note_id, pitch, start_time, duration, velocity, mute):
+        self.note_id = note_id
+        self.pitch = pitch
+        self.start_time = start_time
+        self.duration = duration
+        self.velocity = velocity
+        self.mute = mute
+
+
+class Clip(object):
+    loop_start = 0.0
+    loop_end = 4.0
+
+    def __init__(self, items):
+        self.notes = [Note(i, *n) for i, n in enumerate(items)]
+        self.modified = None
+        self.removed = None
+        self.added = None
+
+    def get_notes_extended(self, from_pitch, pitch_span, from_time, time_span):
+        return [n for n in self.notes
+                if from_pitch <= n.pitch < from_pitch + pitch_span
+                and from_time <= n.start_time < from_time + time_span]
+
+    def apply_note_modifications(self, notes):
+        self.modified = notes
+
+    def remove_notes_by_id(self, ids):
+        self.removed = ids
+
+    def add_new_notes(self, specs):
+        self.added = specs
+
+
+def test_extended_write_back(notes, monkeypatch):
+    module = types.ModuleType(str('Live.Clip'))
+    module.MidiNoteSpecification = lambda **k: k
+    monkeypatch.setitem(sys.modules, str('Live.Clip'), module)
+
+    clip = Clip(NOTES)
+    buf = notes.ExtendedNotesIO.read(clip, (60, 65), (0.0, 2.0))
+    assert len(buf) == 3 and list(buf.ids) == [0, 1, 2]
+    assert buf.covers((60, 62), (0.0, 1.0)) and not buf.covers((60, 65), (0.0, 3.0))
+
+    assert buf.transpose([0], 1)
+    buf.delete([1])
+    buf.append([(70, 1.5, 0.5, 50.0, False)])
+    assert not buf.in_region()
+    notes.ExtendedNotesIO.write(clip, buf)
+
+    # only the notes read are modified, by id
+    assert [n.note_id for n in clip.modified] == [0, 1, 2]
+    assert clip.notes[0].pitch == 61 and clip.notes[2].pitch == 64
+    assert clip.notes[3].pitch == 60
+    assert clip.removed == (1,)
+    assert clip.added == (dict(pitch=70, start_time=1.5, duration=0.5,
+                               velocity=50.0, mute=False),)
+
+
+def test_selection_write_back(notes):
+    class SelectionClip(object):
+        def __init__(self, items):
+            self.items = tuple(items)
+
+        def select_all_notes(self):
+            pass
+
+        def deselect_all_notes(self):
+            pass
+
+        def get_selected_notes(self):
+            return self.items
+
+        def replace_selected_notes(self, items):
+            self.items = items
+
+    clip = SelectionClip(NOTES)
+    buf = notes.SelectionNotesIO.read(clip, (60, 61))
+    assert len(buf) == 5 and buf.region is None and buf.in_region()
+    buf.delete(buf.select((72, 73)))
+    notes.SelectionNotesIO.write(clip, buf)
+    assert clip.items == tuple(NOTES[:4])
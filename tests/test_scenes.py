@@ -0,0 +1,54 @@
+from __future__ import absolute_import, unicode_literals
+
+
+class SongView(object):
+    selected_scene = None
+
+
+class Song(object):
+    def __init__(self, scenes):
+        self.scenes = scenes
+        self.view = SongView()
+        self.view.selected_scene = self.scenes[0]
+        self.tracks = []
+
+
+def count_listeners(scenes):
+    return sum(scene.count_listeners() for scene in scenes)
+
+
+def test_scene_listeners(observable):
+    from clyphx.core.scenes import SceneIndex
+    from clyphx.core.subscriptions import Subscriptions
+
+    song = Song([observable(name=str(i)) for i in range(8)])
+    subscriptions = Subscriptions()
+    index = SceneIndex(song, subscriptions)
+    scenes = list(song.scenes)
+    assert count_listeners(scenes) == 16
+
+    for i in range(20):
+        song.scenes.insert(i % 5, observable(name='new'))
+        scenes.append(song.scenes[i % 5])
+        index.update_scenes()
+        del song.scenes[(i * 3) % len(song.scenes)]
+        index.update_scenes()
+        # only the scenes in the song keep listeners
+        assert count_listeners(scenes) == 2 * len(song.scenes) == 16
+        assert subscriptions.count(index) == 16
+
+    song.scenes[5].notify('is_triggered')
+    assert index.triggered == 5
+    song.view.selected_scene = song.scenes[3]
+    index.update_selected()
+    assert index.selected == 3
+    # selected before the scene list listener is called
+    song.scenes.insert(0, observable(name='new'))
+    song.view.selected_scene = song.scenes[0]
+    index.update_selected()
+    assert index.selected == 0 and index.scenes[0] is song.scenes[0]
+    scenes.append(song.scenes[0])
+
+    index.disconnect()
+    assert count_listeners(scenes) == 0
+    assert subscriptions.count() == 0
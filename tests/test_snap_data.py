@@ -0,0 +1,72 @@
+from __future__ import absolute_import, unicode_literals
+import pickle
+
+SNAP_DATA = {
+    'Bass': [[0.85, 0.5, 0.0], [0, 1, 2], 3, {
+        '1': [[1.0, 2.0], None],
+        '1.1.1': [[0.5], None],
+        '2': [[3.0], None],
+    }],
+    'Drums': [[0.5, 0.25], [], None, dict()],
+    'Keys': [[], [1, 0, 0], 0, dict()],
+}
+
+
+def test_is_snapshot():
+    from clyphx.actions.snap_data import dumps, is_snapshot
+
+    assert is_snapshot('[VERSE] || ' + dumps(SNAP_DATA))
+    assert is_snapshot('[VERSE] || (dp0\nVBass\n')
+    assert not is_snapshot('VERSE || ' + dumps(SNAP_DATA))
+    # X-Clips with several actions
+    assert not is_snapshot('[VERSE] 1/MUTE || 2/MUTE')
+
+
+def test_snapshot_data():
+    from clyphx.actions.snap_data import SnapshotData, dumps
+
+    text = dumps(SNAP_DATA)
+    assert text.startswith('2;')
+    snapshot = SnapshotData('[VERSE] || ' + text)
+
+    assert sorted(snapshot.tracks) == ['Bass', 'Drums', 'Keys']
+    assert snapshot.mix('Bass') == [0.85, 0.5, 0.0]
+    assert snapshot.mix_ext('Bass') == [0, 1, 2]
+    assert snapshot.play('Bass') == 3
+    assert snapshot.devices('Bass') == SNAP_DATA['Bass'][3]
+    # a top-level device comes with the devices in its chains
+    assert snapshot.devices('Bass', {'1'}) == {'1': [[1.0, 2.0], None],
+                                               '1.1.1': [[0.5], None]}
+    assert snapshot.devices('Bass', {'3'}) == dict()
+
+    # empty categories are not stored
+    assert snapshot.mix_ext('Drums') is None
+    assert snapshot.play('Drums') is None
+    assert snapshot.devices('Drums') == dict()
+    assert snapshot.mix('Keys') is None
+    assert snapshot.play('Keys') == 0
+
+    # slices are only decoded once
+    assert snapshot.mix('Bass') is snapshot.mix('Bass')
+
+
+def test_legacy_snapshot():
+    from clyphx.actions.snap_data import SnapshotData, is_snapshot
+
+    # previous versions stored the settings of the devices by name
+    data = {
+        'Bass': [[0.85, 0.5, 0.0], [0, 1, 2], 3, {'Operator': [[1.0, 2.0], None]}],
+        'Drums': [[0.5, 0.25], [], None, dict()],
+    }
+    name = '[VERSE] || ' + pickle.dumps(data, 0).decode('latin-1')
+    assert is_snapshot(name)
+    snapshot = SnapshotData(name)
+
+    assert sorted(snapshot.tracks) == ['Bass', 'Drums']
+    assert snapshot.mix('Bass') == [0.85, 0.5, 0.0]
+    assert snapshot.mix_ext('Bass') == [0, 1, 2]
+    assert snapshot.play('Bass') == 3
+    assert snapshot.devices('Bass') == {'Operator': [[1.0, 2.0], None]}
+    assert snapshot.mix_ext('Drums') is None
+    assert snapshot.play('Drums') is None
+    assert snapshot.devices('Drums') == dict()
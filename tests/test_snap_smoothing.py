@@ -0,0 +1,90 @@
+from __future__ import absolute_import, unicode_literals
+import math
+
+import pytest
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def smoothing(request, monkeypatch):
+    '''The smoothing module, with NumPy or with the pure Python backend.'''
+    from clyphx.actions import snap_smoothing
+
+    if request.param == 'python':
+        monkeypatch.setattr(snap_smoothing, 'np', None)
+    elif snap_smoothing.np is None:
+        pytest.skip('NumPy not installed')
+    return snap_smoothing
+
+
+class Parameter(object):
+    def __init__(self, value=0.0, min=0.0, max=1.0, is_quantized=False):
+        self._value = value
+        self.min = min
+        self.max = max
+        self.is_quantized = is_quantized
+        self.written = []
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self.written.append(value)
+
+
+def test_steps(smoothing):
+    smoother = smoothing.ParameterSmoother(steps=4)
+    param, other = Parameter(), Parameter(10.0, 0.0, 20.0)
+    smoother.add(param, 1.0)
+    smoother.add(other, 0.0, start=20.0)
+    assert len(smoother) == 2 and smoother
+
+    assert [smoother.step() for _ in range(4)] == [True, True, True, False]
+    assert param.written == [0.25, 0.5, 0.75, 1.0]
+    assert other.written == [15.0, 10.0, 5.0, 0.0]
+    assert len(smoother) == 0 and not smoother and smoother.count == 0
+
+
+def test_unchanged_values(smoothing):
+    smoother = smoothing.ParameterSmoother(steps=4)
+    still, tiny = Parameter(0.5), Parameter()
+    smoother.add(still, 0.5)
+    # below the resolution
+    smoother.add(tiny, 0.4 / smoothing.RESOLUTION)
+    while smoother.step():
+        pass
+    assert still.written == [] and tiny.written == []
+
+    smoother.add(still, 0.5)
+    smoother.apply(0.5)
+    smoother.invalidate()
+    smoother.apply(0.5)
+    assert still.written == [0.5]
+
+
+def test_quantized(smoothing):
+    smoother = smoothing.ParameterSmoother(steps=4, threshold=0.5)
+    param = Parameter(0.0, 0.0, 3.0, is_quantized=True)
+    smoother.add(param, 3.0)
+    while smoother.step():
+        pass
+    assert param.written == [3.0]
+
+
+@pytest.mark.parametrize('curve, expected', [
+    ('LIN', 0.25),
+    ('EXP', (math.exp(1.0) - 1) / (math.exp(4.0) - 1)),
+    ('SCRV', 0.15625),
+    # unknown curves are linear
+    ('NONE', 0.25),
+])
+def test_curves(smoothing, curve, expected):
+    smoother = smoothing.ParameterSmoother(curve=curve)
+    param = Parameter()
+    smoother.add(param, 1.0)
+    smoother.apply(0.25)
+    smoother.apply(2.0)
+    assert param.written[0] == pytest.approx(expected)
+    assert param.written[1] == 1.0
@@ -0,0 +1,40 @@
+from __future__ import absolute_import, unicode_literals
+
+
+class Owner(object):
+    def on_value(self):
+        pass
+
+    def on_name(self):
+        pass
+
+
+def test_subscriptions(observable):
+    from clyphx.core.subscriptions import Subscriptions
+
+    subs = Subscriptions()
+    subject, owner = observable(), Owner()
+
+    handle = subs.subscribe(subject, 'value', owner.on_value)
+    # subscribing again doesn't pile up listeners
+    assert subs.subscribe(subject, 'value', owner.on_value) == handle
+    assert subject.listeners['value'] == [owner.on_value]
+
+    subs.subscribe(subject, 'name', owner.on_name, group='names')
+    for i in range(3):
+        subs.subscribe(subject, 'value', lambda: None, owner, 'params')
+    assert subs.count(owner) == 5
+    assert subs.count(subject=subject) == 5
+    assert subs.counts() == (dict(Owner=5), dict(value=4, name=1))
+
+    assert subs.unsubscribe(owner, 'params') == 3
+    assert subject.listeners['value'] == [owner.on_value]
+    subs.remove(handle)
+    assert subject.listeners['value'] == []
+    assert subs.unsubscribe(owner) == 1
+    assert subs.count() == 0
+
+    subs.subscribe(subject, 'value', owner.on_value)
+    subject.deleted = True
+    subs.clear()
+    assert subs.count() == 0
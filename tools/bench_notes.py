@@ -0,0 +1,153 @@
+# coding: utf-8
+#
+# Copyright (c) 2020-2021 Nuno André Novo
+# Some rights reserved. See COPYING, COPYING.LESSER
+# SPDX-License-Identifier: LGPL-2.1-or-later
+'''Benchmarks NOTES actions on clips of 1k, 10k and 50k notes, with
+note tuples (as done before `NoteBuffer`) and with `NoteBuffer`, with
+and without NumPy. Times include reading the notes from and writing
+them back to tuples, which is all the 'io' transform does.
+
+Then, combines dense drum clips (16 lanes of back-to-back 1/16 notes)
+with the previous quadratic algorithm (up to 10k notes) and with the
+sort and sweep of `NoteBuffer`, along with other transforms that have
+no tuple counterpart.
+
+    python tools/bench_notes.py [repeat]
+'''
+from __future__ import absolute_import, print_function, unicode_literals
+import random
+import sys
+import os
+import timeit
+
+# import the module without the package, which needs Live
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'clyphx'))
+from core import notes as notes_module  # noqa: E402
+from core.groove import swing_groove  # noqa: E402
+
+SIZES = (1000, 10000, 50000)
+NOTE_RANGE = (36, 72)
+POS_RANGE = (0.0, 64.0)
+WHOLE_CLIP = ((0, 128), (0.0, 1024.0))
+
+
+def make_notes(size):
+    rnd = random.Random(size)
+    return [(rnd.randint(0, 127), rnd.randint(0, 511) * 0.25, 0.25,
+             rnd.randint(1, 127), False) for _ in range(size)]
+
+
+def make_drum_notes(size):
+    lanes = 16
+    return [(36 + i % lanes, (i // lanes) * 0.25, 0.25, 100, False)
+            for i in range(size)]
+
+
+def quadratic_combine(notes):
+    edited = []
+    current_note = []
+    check_next_instance = False
+    for n in notes:
+        edited.append(n)
+        if current_note and check_next_instance:
+            if current_note[0] == n[0] and current_note[1] + current_note[2] == n[1]:
+                edited[edited.index(current_note)] = (
+                    current_note[0], current_note[1], current_note[2] + n[2],
+                    current_note[3], current_note[4])
+                edited.remove(n)
+                current_note = []
+                check_next_instance = False
+            else:
+                current_note = n
+        else:
+            current_note = n
+            check_next_instance = True
+    return edited
+
+
+def tuples(notes, transform, note_range=NOTE_RANGE, pos_range=POS_RANGE):
+    edit, other = [], []
+    for n in notes:
+        if (note_range[0] <= n[0] < note_range[1]
+                and pos_range[0] <= n[1] < pos_range[1]):
+            edit.append(n)
+        else:
+            other.append(n)
+    edited = transform(edit)
+    edited.extend(other)
+    return tuple(edited)
+
+
+TUPLE_TRANSFORMS = dict(
+    io=lambda ns: list(ns),
+    invert=lambda ns: [(127 - n[0], n[1], n[2], n[3], n[4]) for n in ns],
+    reverse=lambda ns: [(n[0], abs(128.0 - (n[1] + n[2])), n[2], n[3], n[4])
+                        for n in ns],
+    compress=lambda ns: [(n[0], n[1] / 2, n[2] / 2, n[3], n[4]) for n in ns],
+    velocity=lambda ns: [(n[0], n[1], n[2], n[3] * 0.5, n[4]) for n in ns],
+)
+
+BUFFER_TRANSFORMS = dict(
+    io=lambda b, i: None,
+    invert=lambda b, i: b.invert(i),
+    reverse=lambda b, i: b.reverse(i, 0.0, 128.0),
+    compress=lambda b, i: b.scale(i, 0.5),
+    velocity=lambda b, i: b.offset_velocity(i, -1),
+)
+
+
+def buffer(notes, transform, note_range=NOTE_RANGE, pos_range=POS_RANGE):
+    buf = notes_module.NoteBuffer.from_notes(notes)
+    indices = buf.select(note_range, pos_range)
+    transform(buf, indices)
+    return buf.to_notes()
+
+
+def main(repeat=5):
+    numpy = notes_module.np
+    bench = lambda f: min(timeit.repeat(f, number=1, repeat=repeat))
+    print('{:>6} {:>9} {:>10} {:>10} {:>10}'.format(
+        'notes', 'transform', 'tuples', 'array', 'numpy'))
+    for size in SIZES:
+        notes = make_notes(size)
+        for name in sorted(TUPLE_TRANSFORMS):
+            results = [bench(lambda: tuples(notes, TUPLE_TRANSFORMS[name]))]
+            for np in (None, numpy):
+                notes_module.np = np
+                results.append(bench(lambda: buffer(notes, BUFFER_TRANSFORMS[name]))
+                               if np is not None or not results[1:] else None)
+            notes_module.np = numpy
+            print('{:>6} {:>9} {}'.format(size, name, ' '.join(
+                '{:>8.2f}ms'.format(r * 1000) if r is not None else '{:>10}'.format('-')
+                for r in results)))
+
+    print()
+    print('{:>6} {:>9} {:>10} {:>10} {:>10}'.format(
+        'notes', 'transform', 'quadratic', 'array', 'numpy'))
+    for size in SIZES:
+        # sorted by pitch, so the previous algorithm can combine them
+        notes = sorted(make_drum_notes(size))
+        for name in ('combine', 'dedupe', 'legato', 'quantize', 'humanize'):
+            transform = dict(
+                combine=lambda b, i: b.combine(i),
+                dedupe=lambda b, i: b.dedupe(i),
+                legato=lambda b, i: b.legato(i, 128.0),
+                quantize=lambda b, i: b.quantize(i, swing_groove(0.25, 0.5), 0.75),
+                humanize=lambda b, i: b.humanize(i, 0.01, 10, seed=1),
+            )[name]
+            results = [None]
+            if name == 'combine' and size <= 10000:
+                results[0] = bench(lambda: tuples(notes, quadratic_combine, *WHOLE_CLIP))
+            for np in (None, numpy):
+                notes_module.np = np
+                results.append(bench(lambda: buffer(notes, transform, *WHOLE_CLIP))
+                               if np is not None or not results[1:] else None)
+            notes_module.np = numpy
+            print('{:>6} {:>9} {}'.format(size, name, ' '.join(
+                '{:>8.2f}ms'.format(r * 1000) if r is not None else '{:>10}'.format('-')
+                for r in results)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))